@@ -1,15 +1,28 @@
-import asyncio
 from functools import cache
-from typing import Annotated, cast
+from typing import Annotated
 
 from fastapi import Depends, HTTPException
-from qualibrate.runnables.runnable_collection import RunnableCollection
-from qualibrate_config.models import CalibrationLibraryConfig
 
-from qualibrate_runner.config import State, get_cl_settings
-from qualibrate_runner.core.types import QGraphType, QLibraryType, QNodeType
-
-library_rescan_lock = asyncio.Lock()
+from qualibrate_runner.config import (
+    State,
+    get_cl_settings,
+    get_config_path,
+    get_runner_settings,
+)
+from qualibrate_runner.config.resolvers import get_settings
+from qualibrate_runner.core.app.state_changes import StateChanges
+from qualibrate_runner.core.app.status_computer import StatusComputer
+from qualibrate_runner.core.copy_pool import RunnableCopyPool
+from qualibrate_runner.core.job_queue import JobQueue
+from qualibrate_runner.core.library_manager import LibraryManager
+from qualibrate_runner.core.logs_stream import LogStream
+from qualibrate_runner.core.models.enums import ExecutionMode, RunnableType
+from qualibrate_runner.core.models.library import LibraryChanges
+from qualibrate_runner.core.payload_cache import PayloadCache
+from qualibrate_runner.core.run_history import RunHistoryStore
+from qualibrate_runner.core.statuses import get_run_progress_key
+from qualibrate_runner.core.types import QGraphType, QNodeType
+from qualibrate_runner.core.worker_pool import WorkerPool
 
 
 @cache
@@ -18,49 +31,134 @@ def get_state() -> State:
 
 
 @cache
-def get_cached_library(
-    config: Annotated[CalibrationLibraryConfig, Depends(get_cl_settings)],
-) -> QLibraryType:
-    return cast(QLibraryType, config.resolver(config.folder))
+def get_state_changes() -> StateChanges:
+    settings = get_runner_settings()
+    return StateChanges(
+        get_state(),
+        get_run_progress_key,
+        min_interval=settings.status_push_interval,
+        heartbeat_interval=settings.status_heartbeat_interval,
+    )
 
 
-async def get_library(
-    library: Annotated[QLibraryType, Depends(get_cached_library)],
-    rescan: bool = False,
-) -> QLibraryType:
-    async with library_rescan_lock:
-        if rescan:
-            library.rescan()
-    return library
+@cache
+def get_status_computer() -> StatusComputer:
+    return StatusComputer(get_state())
 
 
-def get_nodes(
-    library: Annotated[QLibraryType, Depends(get_library)],
-) -> RunnableCollection[str, QNodeType]:
-    return library.get_nodes()
+@cache
+def get_job_queue() -> JobQueue:
+    job_queue = JobQueue()
+    job_queue.start()
+    return job_queue
 
 
-def get_graphs(
-    library: Annotated[QLibraryType, Depends(get_library)],
-) -> RunnableCollection[str, QGraphType]:
-    return library.get_graphs()
+def _current_runnable(
+    kind: RunnableType, name: str
+) -> QNodeType | QGraphType | None:
+    manager = get_library_manager()
+    if kind == RunnableType.GRAPH:
+        # Don't load the whole library to resolve a graph: the submitted
+        # instance is used while only the index is available
+        return manager.generation.graphs.get(name)
+    return manager.get_node(name)
 
 
-def get_node_copy(
-    name: str,
-    nodes: Annotated[RunnableCollection[str, QNodeType], Depends(get_nodes)],
-) -> QNodeType:
-    node = nodes.get(name)
-    if node is None:
-        raise HTTPException(status_code=422, detail=f"Unknown node name {name}")
-    return node
+@cache
+def get_copy_pool() -> RunnableCopyPool:
+    """
+    Pool of runnable copies refilled by the job queue between jobs. Copies
+    are made of runnables of the current library generation.
+    """
+    return RunnableCopyPool(
+        get_runner_settings().copy_pool_size,
+        get_job_queue().run_when_idle,
+        _current_runnable,
+    )
+
+
+@cache
+def get_log_stream() -> LogStream:
+    return LogStream(lambda: get_settings(get_config_path()).log_folder)
+
+
+@cache
+def get_run_history_store() -> RunHistoryStore | None:
+    """Store of completed runs. None if run history is disabled."""
+    settings = get_runner_settings()
+    if not settings.run_history_enabled:
+        return None
+    db_path = settings.run_history_path or (
+        get_config_path().parent / "run_history.sqlite"
+    )
+    store = RunHistoryStore(db_path)
+    store.start()
+    store.attach(get_state())
+    return store
+
+
+@cache
+def get_worker_pool() -> WorkerPool | None:
+    """Worker pool executing nodes. None if nodes are run in-thread."""
+    settings = get_runner_settings()
+    if settings.execution_mode != ExecutionMode.PROCESS:
+        return None
+    config = get_cl_settings(get_config_path())
+    pool = WorkerPool(
+        config.folder,
+        size=settings.worker_pool_size,
+        progress_interval=settings.worker_progress_interval,
+    )
+    pool.start()
+    return pool
+
+
+@cache
+def get_payload_cache() -> PayloadCache:
+    return PayloadCache()
+
+
+def _on_library_change(_: LibraryChanges) -> None:
+    get_payload_cache().invalidate()
+    worker_pool = get_worker_pool()
+    if worker_pool is not None:
+        worker_pool.restart()
+
+
+@cache
+def get_library_manager() -> LibraryManager:
+    settings = get_runner_settings()
+    index_path = None
+    if settings.library_index_enabled:
+        index_path = settings.library_index_path or (
+            get_config_path().parent / "library_index.json"
+        )
+    return LibraryManager(
+        get_cl_settings(get_config_path()),
+        index_path,
+        on_change=_on_library_change,
+        scan_workers=settings.library_scan_workers,
+    )
+
+
+def get_rescanned_library_manager(
+    manager: Annotated[LibraryManager, Depends(get_library_manager)],
+    rescan: bool = False,
+) -> LibraryManager:
+    """
+    Library manager. Changed library files are reloaded in background if
+    `rescan` is requested, current runnables are served meanwhile.
+    """
+    if rescan:
+        manager.revalidate()
+    return manager
 
 
 def get_node_nocopy(
     name: str,
-    nodes: Annotated[RunnableCollection[str, QNodeType], Depends(get_nodes)],
+    manager: Annotated[LibraryManager, Depends(get_rescanned_library_manager)],
 ) -> QNodeType:
-    node = nodes.get_nocopy(name)
+    node = manager.get_node(name)
     if node is None:
         raise HTTPException(status_code=422, detail=f"Unknown node name {name}")
     return node
@@ -68,9 +166,9 @@ def get_node_nocopy(
 
 def get_graph_nocopy(
     name: str,
-    graphs: Annotated[RunnableCollection[str, QGraphType], Depends(get_graphs)],
+    manager: Annotated[LibraryManager, Depends(get_rescanned_library_manager)],
 ) -> QGraphType:
-    graph = graphs.get_nocopy(name)
+    graph = manager.get_graph(name)
     if graph is None:
         raise HTTPException(
             status_code=422, detail=f"Unknown graph name {name}"
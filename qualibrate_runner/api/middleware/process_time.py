@@ -1,19 +1,170 @@
+"""
+Request timing middleware.
+
+`ProcessTimeMiddleware` is a pure ASGI middleware: it doesn't wrap requests
+and responses into Starlette objects and doesn't run the application in a
+separate task, so the timing adds almost no overhead to each request.
+
+The time until the response is started is reported by the `X-Process-Time`
+header (in seconds) and split into phases by the `Server-Timing` header (in
+milliseconds):
+
+- `deps`: routing, request parsing and dependency resolution;
+- `handler`: the endpoint itself;
+- `serialize`: validation and serialization of the returned value;
+- `total`: the whole time until the response is started.
+
+Endpoint start and end are recorded by routes of the `TimedRoute` class.
+Requests not reaching the endpoint of a `TimedRoute` (unmatched routes,
+invalid requests, streaming endpoints) report only the total time.
+"""
+
+import functools
+import inspect
 import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from qualibrate_runner.core.metrics import http_request_duration
+
+__all__ = [
+    "ProcessTimeMiddleware",
+    "RequestTimings",
+    "TimedRoute",
+    "get_route_template",
+]
 
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    RequestResponseEndpoint,
+
+class RequestTimings:
+    """`time.perf_counter` values of the request phase boundaries."""
+
+    __slots__ = ("started", "handler_started", "handler_ended")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.handler_started: float | None = None
+        self.handler_ended: float | None = None
+
+    def server_timing(self, response_started: float) -> str:
+        """Value of the `Server-Timing` header."""
+        metrics: list[tuple[str, float]] = []
+        if self.handler_started is not None and self.handler_ended is not None:
+            metrics.extend(
+                (
+                    ("deps", self.handler_started - self.started),
+                    ("handler", self.handler_ended - self.handler_started),
+                    ("serialize", response_started - self.handler_ended),
+                )
+            )
+        metrics.append(("total", response_started - self.started))
+        return ", ".join(
+            f"{name};dur={duration * 1000:.3f}" for name, duration in metrics
+        )
+
+
+# Context is copied to the threadpool running sync endpoints, so they record
+# phase boundaries into the same object.
+_request_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
 )
-from starlette.requests import Request
-from starlette.responses import Response
-
-
-class ProcessTimeMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        start_time = time.perf_counter()
-        response = await call_next(request)
-        process_time = time.perf_counter() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+
+
+def get_route_template(scope: Scope) -> str:
+    """
+    Path template of the matched route. Requests not matching any route
+    share a single label value, so metrics cardinality stays bounded.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap endpoint to record its start and end. FastAPI resolves signature
+    of the wrapped endpoint, so dependencies and the response model stay
+    the same.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            timings = _request_timings.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            timings.handler_started = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timings.handler_ended = time.perf_counter()
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        timings = _request_timings.get()
+        if timings is None:
+            return endpoint(*args, **kwargs)
+        timings.handler_started = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            timings.handler_ended = time.perf_counter()
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """Route recording phase boundaries reported by `Server-Timing`."""
+
+    def __init__(
+        self, path: str, endpoint: Callable[..., Any], **kwargs: Any
+    ) -> None:
+        if inspect.isgeneratorfunction(endpoint) or inspect.isasyncgenfunction(
+            endpoint
+        ):
+            # Streaming endpoints aren't wrapped, they report the total only
+            super().__init__(path, endpoint, **kwargs)
+        else:
+            super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+
+class ProcessTimeMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response_started = time.perf_counter()
+                process_time = response_started - timings.started
+                message.setdefault("headers", [])
+                headers = MutableHeaders(scope=message)
+                headers["X-Process-Time"] = str(process_time)
+                headers.append(
+                    "Server-Timing", timings.server_timing(response_started)
+                )
+                http_request_duration.observe(
+                    process_time,
+                    scope["method"],
+                    get_route_template(scope),
+                    str(message["status"]),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
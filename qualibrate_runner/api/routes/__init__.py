@@ -1,13 +1,19 @@
 from fastapi import APIRouter
 
 from .get_runnables import get_runnables_router
+from .jobs import jobs_router
 from .last_run import last_run_router
+from .library import library_router
 from .others import others_router
+from .runs import runs_router
 from .submit import submit_router
 
 base_router = APIRouter()
 
 base_router.include_router(submit_router)
 base_router.include_router(get_runnables_router)
+base_router.include_router(jobs_router)
 base_router.include_router(last_run_router)
+base_router.include_router(library_router)
+base_router.include_router(runs_router)
 base_router.include_router(others_router)
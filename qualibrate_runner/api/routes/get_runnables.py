@@ -1,62 +1,93 @@
 from collections.abc import Mapping
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends
-from qualibrate.runnables.runnable_collection import RunnableCollection
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
 from qualibrate_runner.api.dependencies import get_graph_nocopy as get_qgraph
-from qualibrate_runner.api.dependencies import get_graphs as get_qgraphs
 from qualibrate_runner.api.dependencies import (
-    get_node_nocopy as get_qnode,
+    get_payload_cache,
+    get_rescanned_library_manager,
 )
-from qualibrate_runner.api.dependencies import (
-    get_nodes as get_qnodes,
-)
-from qualibrate_runner.core.types import QGraphType, QNodeType
+from qualibrate_runner.api.middleware.process_time import TimedRoute
+from qualibrate_runner.core.library_manager import LibraryManager
+from qualibrate_runner.core.payload_cache import PayloadCache
+from qualibrate_runner.core.types import QGraphType
 
-get_runnables_router = APIRouter()
+get_runnables_router = APIRouter(route_class=TimedRoute)
 
 
-@get_runnables_router.get("/get_nodes")
+@get_runnables_router.get("/get_nodes", response_model=Mapping[str, Any])
 def get_nodes(
-    nodes: Annotated[RunnableCollection[str, QNodeType], Depends(get_qnodes)],
-) -> Mapping[str, Any]:
-    return {
-        node_name: node.serialize(exclude_targets=False)
-        for node_name, node in nodes.items_nocopy()
-    }
+    request: Request,
+    manager: Annotated[LibraryManager, Depends(get_rescanned_library_manager)],
+    payload_cache: Annotated[PayloadCache, Depends(get_payload_cache)],
+) -> Response:
+    payload = payload_cache.get(("nodes",), manager.nodes_payload)
+    return payload.response(request)
 
 
-@get_runnables_router.get("/get_graphs")
+@get_runnables_router.get("/get_graphs", response_model=Mapping[str, Any])
 def get_graphs(
-    graphs: Annotated[RunnableCollection[str, QNodeType], Depends(get_qgraphs)],
+    request: Request,
+    manager: Annotated[LibraryManager, Depends(get_rescanned_library_manager)],
+    payload_cache: Annotated[PayloadCache, Depends(get_payload_cache)],
     cytoscape: bool = False,
-) -> Mapping[str, Any]:
-    return {
-        graph_name: graph.serialize(
-            cytoscape=cytoscape,
-        )
-        for graph_name, graph in graphs.items_nocopy()
-    }
+) -> Response:
+    payload = payload_cache.get(
+        ("graphs", cytoscape),
+        lambda: manager.graphs_payload(cytoscape=cytoscape),
+    )
+    return payload.response(request)
 
 
-@get_runnables_router.get("/get_node")
+@get_runnables_router.get("/get_node", response_model=Mapping[str, Any])
 def get_node(
-    node: Annotated[QNodeType, Depends(get_qnode)],
-) -> Mapping[str, Any]:
-    return node.serialize(exclude_targets=True)
+    request: Request,
+    name: str,
+    manager: Annotated[LibraryManager, Depends(get_rescanned_library_manager)],
+    payload_cache: Annotated[PayloadCache, Depends(get_payload_cache)],
+) -> Response:
+    def node_payload() -> Mapping[str, Any]:
+        payload = manager.node_payload(name)
+        if payload is None:
+            raise HTTPException(
+                status_code=422, detail=f"Unknown node name {name}"
+            )
+        return payload
+
+    return payload_cache.get(("node", name), node_payload).response(request)
 
 
-@get_runnables_router.get("/get_graph")
+@get_runnables_router.get("/get_graph", response_model=Mapping[str, Any])
 def get_graph(
-    graph: Annotated[QGraphType, Depends(get_qgraph)],
+    request: Request,
+    name: str,
+    manager: Annotated[LibraryManager, Depends(get_rescanned_library_manager)],
+    payload_cache: Annotated[PayloadCache, Depends(get_payload_cache)],
     cytoscape: bool = False,
-) -> Mapping[str, Any]:
-    return graph.serialize(cytoscape=cytoscape)
+) -> Response:
+    def graph_payload() -> Mapping[str, Any]:
+        payload = manager.graph_payload(name, cytoscape=cytoscape)
+        if payload is None:
+            raise HTTPException(
+                status_code=422, detail=f"Unknown graph name {name}"
+            )
+        return payload
+
+    return payload_cache.get(
+        ("graph", name, cytoscape), graph_payload
+    ).response(request)
 
 
-@get_runnables_router.get("/get_graph/cytoscape")
+@get_runnables_router.get(
+    "/get_graph/cytoscape", response_model=Mapping[str, Any]
+)
 def get_graph_cytoscape(
+    request: Request,
     graph: Annotated[QGraphType, Depends(get_qgraph)],
-) -> Mapping[str, Any]:
-    return graph.serialize_graph_representation()
+    payload_cache: Annotated[PayloadCache, Depends(get_payload_cache)],
+) -> Response:
+    return payload_cache.get(
+        ("graph_representation", graph.name),
+        graph.serialize_graph_representation,
+    ).response(request)
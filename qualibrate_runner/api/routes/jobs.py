@@ -0,0 +1,71 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from qualibrate_runner.api.dependencies import get_job_queue
+from qualibrate_runner.api.middleware.process_time import TimedRoute
+from qualibrate_runner.api.utils import get_model_docstring
+from qualibrate_runner.core.job_queue import JobQueue
+from qualibrate_runner.core.models.enums import JobStatusEnum
+from qualibrate_runner.core.models.job import Job
+
+jobs_router = APIRouter(prefix="/jobs", route_class=TimedRoute)
+
+
+def _get_job_or_error(job_queue: JobQueue, job_id: str) -> Job:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Unknown job id {job_id}",
+        )
+    return job
+
+
+@jobs_router.get(
+    "/",
+    description="List of active, queued and recently completed jobs.",
+    response_description=f"""
+Jobs in submission order.
+
+{get_model_docstring(Job)}
+""",
+)
+def list_jobs(
+    job_queue: Annotated[JobQueue, Depends(get_job_queue)],
+    job_status: JobStatusEnum | None = None,
+) -> list[Job]:
+    return job_queue.list_jobs(job_status)
+
+
+@jobs_router.get("/{job_id}", description="Get job by id.")
+def get_job(
+    job_id: str,
+    job_queue: Annotated[JobQueue, Depends(get_job_queue)],
+) -> Job:
+    return _get_job_or_error(job_queue, job_id)
+
+
+@jobs_router.post(
+    "/{job_id}/cancel",
+    description=(
+        "Cancel a queued job. Running job can't be cancelled, use `/stop` "
+        "instead."
+    ),
+)
+def cancel_job(
+    job_id: str,
+    job_queue: Annotated[JobQueue, Depends(get_job_queue)],
+) -> Job:
+    try:
+        return job_queue.cancel(job_id)
+    except KeyError as ex:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Unknown job id {job_id}",
+        ) from ex
+    except ValueError as ex:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=str(ex),
+        ) from ex
@@ -1,23 +1,23 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
 from qualibrate import QualibrationGraph
 from qualibrate.models.execution_history import ExecutionHistory
 
-from qualibrate_runner.api.dependencies import get_state
+from qualibrate_runner.api.dependencies import get_state, get_status_computer
+from qualibrate_runner.api.middleware.process_time import TimedRoute
 from qualibrate_runner.api.utils import get_model_docstring
 from qualibrate_runner.config import State
+from qualibrate_runner.core.app.status_computer import StatusComputer
 from qualibrate_runner.core.models.active_run import RunStatus
 from qualibrate_runner.core.models.enums import RunStatusEnum
 from qualibrate_runner.core.models.last_run import LastRun
 from qualibrate_runner.core.models.workflow import WorkflowStatus
-from qualibrate_runner.core.statuses import (
-    get_graph_execution_history,
-    get_run_status,
-)
+from qualibrate_runner.core.statuses import get_graph_execution_history
 from qualibrate_runner.core.types import QGraphType
 
-last_run_router = APIRouter(prefix="/last_run")
+last_run_router = APIRouter(prefix="/last_run", route_class=TimedRoute)
 
 
 @last_run_router.get(
@@ -52,11 +52,13 @@ Node and workflow status if active/last run item is available, `None` otherwise.
 
 {get_model_docstring(RunStatus)}
 """,
+    response_model=RunStatus,
 )
-def get_status(
-    state: Annotated[State, Depends(get_state)],
-) -> RunStatus:
-    return get_run_status(state)
+async def get_status(
+    status_computer: Annotated[StatusComputer, Depends(get_status_computer)],
+) -> JSONResponse:
+    snapshot = await status_computer.run_status()
+    return JSONResponse(snapshot.data)
 
 
 @last_run_router.get(
@@ -94,5 +96,16 @@ def get_workflow_status(
 def get_execution_history(
     state: Annotated[State, Depends(get_state)],
     reverse: bool = False,
+    since: Annotated[
+        int | None,
+        Query(
+            ge=0,
+            description=(
+                "Number of already received items. Only items executed "
+                "after them are returned. All items are returned if there "
+                "are fewer items (e.g. another workflow was started)."
+            ),
+        ),
+    ] = None,
 ) -> ExecutionHistory | None:
-    return get_graph_execution_history(state, reverse)
+    return get_graph_execution_history(state, reverse, since)
@@ -0,0 +1,23 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+
+from qualibrate_runner.api.dependencies import get_library_manager
+from qualibrate_runner.api.middleware.process_time import TimedRoute
+from qualibrate_runner.core.library_manager import LibraryManager
+from qualibrate_runner.core.models.library import LibraryChanges
+
+library_router = APIRouter(prefix="/library", route_class=TimedRoute)
+
+
+@library_router.get(
+    "/changes",
+    description=(
+        "Recent incremental reloads of the calibration library, newest first."
+    ),
+)
+def get_library_changes(
+    manager: Annotated[LibraryManager, Depends(get_library_manager)],
+    limit: Annotated[int, Query(ge=1)] = 20,
+) -> list[LibraryChanges]:
+    return manager.changes[:limit]
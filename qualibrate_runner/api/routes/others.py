@@ -2,20 +2,40 @@ from datetime import datetime
 from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
 from qualibrate_config.models import QualibrateConfig
 
-from qualibrate_runner.api.dependencies import get_state
+from qualibrate_runner.api.dependencies import (
+    get_copy_pool,
+    get_library_manager,
+    get_payload_cache,
+    get_state,
+    get_worker_pool,
+)
+from qualibrate_runner.api.middleware.process_time import TimedRoute
 from qualibrate_runner.config import State
-from qualibrate_runner.config.resolvers import get_cl_settings, get_settings
+from qualibrate_runner.config.resolvers import (
+    get_cl_settings,
+    get_config_path,
+    get_runner_settings,
+    get_settings,
+)
+from qualibrate_runner.core.app.ws_managers import get_socket_stats
+from qualibrate_runner.core.metrics import CONTENT_TYPE as METRICS_TYPE
+from qualibrate_runner.core.metrics import registry as metrics_registry
+from qualibrate_runner.core.models.copy_pool import CopyPoolStats
 from qualibrate_runner.core.models.enums import RunStatusEnum
 from qualibrate_runner.core.models.last_run import LastRun
 from qualibrate_runner.core.models.runner_meta import RunnerMeta
+from qualibrate_runner.core.models.ws_stats import SocketStats
+from qualibrate_runner.core.statuses import clear_status_cache
+from qualibrate_runner.core.worker_pool import WorkerPool
 from qualibrate_runner.utils.logs_parser import (
     get_logs_from_qualibrate_files,
     get_logs_from_qualibrate_in_memory_storage,
 )
 
-others_router = APIRouter()
+others_router = APIRouter(route_class=TimedRoute)
 
 
 @others_router.get("/meta")
@@ -31,6 +51,35 @@ def check_running(
     return state.is_running
 
 
+@others_router.get(
+    "/ws_stats",
+    description="Delivery statistics of websocket subscriptions.",
+    response_description="Statistics keyed by websocket endpoint name.",
+)
+def get_ws_stats() -> dict[str, SocketStats]:
+    return get_socket_stats()
+
+
+@others_router.get(
+    "/metrics",
+    description=(
+        "Request latencies, websocket deliveries, run durations, queue wait "
+        "and library scan times in the Prometheus text format."
+    ),
+    response_class=PlainTextResponse,
+)
+def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(metrics_registry.render(), media_type=METRICS_TYPE)
+
+
+@others_router.get(
+    "/copy_pool_stats",
+    description="Hit rate and copy times of pre-built runnable copies.",
+)
+def get_copy_pool_stats() -> CopyPoolStats:
+    return get_copy_pool().stats
+
+
 @others_router.get("/output_logs")
 def get_output_logs(
     after: datetime | None = None,
@@ -70,11 +119,14 @@ def get_output_logs(
 )
 def stop_running(
     state: Annotated[State, Depends(get_state)],
+    worker_pool: Annotated[WorkerPool | None, Depends(get_worker_pool)],
     stop_graph_node: Annotated[
         bool,
         Query(description="Whether to stop the entire graph node execution."),
     ] = False,
 ) -> bool:
+    if worker_pool is not None and worker_pool.is_busy:
+        return worker_pool.stop_active(stop_graph_node=stop_graph_node)
     run_item = state.run_item
     if run_item is None:
         return False
@@ -108,13 +160,23 @@ def state_updated(
             detail="Unknown state update key.",
         )
     state_updates[key].updated = True
+    state.mark_changed()
     return state.last_run
 
 
 @others_router.post("/refresh_settings")
 def refresh_settings(
     state: Annotated[State, Depends(get_state)],
+    worker_pool: Annotated[WorkerPool | None, Depends(get_worker_pool)],
 ) -> None:
     state.clear()
     get_settings.cache_clear()
     get_cl_settings.cache_clear()
+    get_runner_settings.cache_clear()
+    clear_status_cache()
+    get_library_manager.cache_clear()
+    get_copy_pool.cache_clear()
+    get_payload_cache().invalidate()
+    if worker_pool is not None:
+        # Library is loaded again, possibly from another folder
+        worker_pool.restart(get_cl_settings(get_config_path()).folder)
@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from qualibrate_runner.api.dependencies import get_run_history_store
+from qualibrate_runner.api.middleware.process_time import TimedRoute
+from qualibrate_runner.api.utils import get_model_docstring
+from qualibrate_runner.core.models.enums import RunnableType, RunStatusEnum
+from qualibrate_runner.core.models.run_history import (
+    RunHistoryPage,
+    RunHistoryStats,
+    RunRecord,
+)
+from qualibrate_runner.core.run_history import RunHistoryStore
+
+runs_router = APIRouter(prefix="/runs", route_class=TimedRoute)
+
+
+def get_run_history_store_or_error(
+    store: Annotated[RunHistoryStore | None, Depends(get_run_history_store)],
+) -> RunHistoryStore:
+    if store is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Run history is disabled.",
+        )
+    return store
+
+
+@runs_router.get(
+    "/",
+    description=(
+        "Completed runs from the newest to the oldest. Use `next_cursor` of "
+        "the response as `cursor` to get the next page."
+    ),
+    response_description=f"""
+Page of run records.
+
+{get_model_docstring(RunRecord)}
+""",
+)
+def list_runs(
+    store: Annotated[RunHistoryStore, Depends(get_run_history_store_or_error)],
+    name: str | None = None,
+    run_status: RunStatusEnum | None = None,
+    runnable_type: RunnableType | None = None,
+    started_after: datetime | None = None,
+    started_before: datetime | None = None,
+    cursor: int | None = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+) -> RunHistoryPage:
+    return store.query(
+        name=name,
+        status=run_status,
+        runnable_type=runnable_type,
+        started_after=started_after,
+        started_before=started_before,
+        cursor=cursor,
+        limit=limit,
+    )
+
+
+@runs_router.get(
+    "/stats",
+    description="Count, status counts and durations of completed runs.",
+)
+def get_runs_stats(
+    store: Annotated[RunHistoryStore, Depends(get_run_history_store_or_error)],
+    name: str | None = None,
+    runnable_type: RunnableType | None = None,
+    started_after: datetime | None = None,
+    started_before: datetime | None = None,
+) -> RunHistoryStats:
+    return store.stats(
+        name=name,
+        runnable_type=runnable_type,
+        started_after=started_after,
+        started_before=started_before,
+    )
+
+
+@runs_router.get(
+    "/{run_id}",
+    description="Full record of the completed run (same as `/last_run`).",
+)
+def get_run(
+    run_id: int,
+    store: Annotated[RunHistoryStore, Depends(get_run_history_store_or_error)],
+) -> dict[str, Any]:
+    run = store.get(run_id)
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Unknown run id {run_id}",
+        )
+    return run
@@ -1,25 +1,39 @@
 from collections.abc import Mapping
 from typing import Annotated, Any, cast
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Response
 from pydantic import BaseModel
+from qualibrate.parameters import ExecutionParameters
 
-from qualibrate_runner.api.dependencies import get_graph_nocopy as get_qgraph
-from qualibrate_runner.api.dependencies import get_node_copy as get_qnode_copy
 from qualibrate_runner.api.dependencies import (
+    get_copy_pool,
+    get_job_queue,
     get_state,
+    get_worker_pool,
 )
+from qualibrate_runner.api.dependencies import get_graph_nocopy as get_qgraph
+from qualibrate_runner.api.dependencies import get_node_nocopy as get_qnode
+from qualibrate_runner.api.middleware.process_time import TimedRoute
 from qualibrate_runner.config import (
     State,
 )
+from qualibrate_runner.core.copy_pool import RunnableCopyPool
+from qualibrate_runner.core.job_queue import JobQueue
+from qualibrate_runner.core.models.enums import RunnableType
 from qualibrate_runner.core.run_job import (
     run_node,
+    run_node_in_worker,
     run_workflow,
+    run_workflow_in_worker,
     validate_input_parameters,
 )
 from qualibrate_runner.core.types import QGraphType, QNodeType
+from qualibrate_runner.core.worker_pool import WorkerPool
 
-submit_router = APIRouter(prefix="/submit")
+submit_router = APIRouter(prefix="/submit", route_class=TimedRoute)
+
+# Response header with the id of the queued job (see `/jobs/{job_id}`)
+JOB_ID_HEADER = "X-Job-Id"
 
 
 def _recursive_clear_node_parameters(
@@ -75,41 +89,95 @@ def clear_input_parameters(
     return _recursive_clear_node_parameters(input_parameters)
 
 
-@submit_router.post("/node")
+@submit_router.post(
+    "/node",
+    description=(
+        "Validate parameters and append the node run to the execution queue. "
+        "The node is executed as soon as all previously submitted jobs are "
+        "completed. The id of the queued job is returned in the "
+        f"`{JOB_ID_HEADER}` header."
+    ),
+)
 def submit_node_run(
     input_parameters: Annotated[
         Mapping[str, Any], Depends(clear_input_parameters)
     ],
     state: Annotated[State, Depends(get_state)],
-    node: Annotated[QNodeType, Depends(get_qnode_copy)],
-    background_tasks: BackgroundTasks,
+    node: Annotated[QNodeType, Depends(get_qnode)],
+    job_queue: Annotated[JobQueue, Depends(get_job_queue)],
+    worker_pool: Annotated[WorkerPool | None, Depends(get_worker_pool)],
+    copy_pool: Annotated[RunnableCopyPool, Depends(get_copy_pool)],
+    response: Response,
 ) -> str:
-    if state.is_running:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
-            detail="Already running",
-        )
-    validate_input_parameters(
+    parameters = validate_input_parameters(
         cast(type[BaseModel], node.parameters_class), input_parameters
     )
-    background_tasks.add_task(run_node, node, input_parameters, state)
+
+    def target() -> None:
+        # Node copy is taken by the job executor, copying must not overlap
+        # with a running node.
+        node_copy = copy_pool.acquire(RunnableType.NODE, node)
+        if worker_pool is None:
+            run_node(node_copy, input_parameters, state, parameters)
+        else:
+            run_node_in_worker(node_copy, input_parameters, state, worker_pool)
+
+    job = job_queue.submit(
+        node.name, RunnableType.NODE, input_parameters, target
+    )
+    response.headers[JOB_ID_HEADER] = job.id
     return f"Node job {node.name} is submitted"
 
 
-@submit_router.post("/workflow")
+@submit_router.post(
+    "/workflow",
+    description=(
+        "Validate parameters and append the workflow run to the execution "
+        "queue. The workflow is executed as soon as all previously submitted "
+        "jobs are completed. The id of the queued job is returned in the "
+        f"`{JOB_ID_HEADER}` header."
+    ),
+)
 def submit_workflow_run(
     input_parameters: Annotated[
         Mapping[str, Any], Depends(clear_input_parameters)
     ],
     state: Annotated[State, Depends(get_state)],
     graph: Annotated[QGraphType, Depends(get_qgraph)],
-    background_tasks: BackgroundTasks,
+    job_queue: Annotated[JobQueue, Depends(get_job_queue)],
+    worker_pool: Annotated[WorkerPool | None, Depends(get_worker_pool)],
+    copy_pool: Annotated[RunnableCopyPool, Depends(get_copy_pool)],
+    response: Response,
 ) -> str:
-    if state.is_running:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
-            detail="Already running",
+    parameters = cast(
+        ExecutionParameters,
+        validate_input_parameters(
+            graph.full_parameters_class, input_parameters
+        ),
+    )
+
+    def target() -> None:
+        if worker_pool is None:
+            run_workflow(
+                graph,
+                input_parameters,
+                state,
+                copy_pool=copy_pool,
+                validated_parameters=parameters,
+            )
+            return
+        # Graph copy is taken by the job executor, like node copies
+        graph_copy = copy_pool.acquire(RunnableType.GRAPH, graph)
+        run_workflow_in_worker(
+            graph_copy,
+            input_parameters,
+            state,
+            worker_pool,
+            validated_parameters=parameters,
         )
-    validate_input_parameters(graph.full_parameters_class, input_parameters)
-    background_tasks.add_task(run_workflow, graph, input_parameters, state)
+
+    job = job_queue.submit(
+        graph.name, RunnableType.GRAPH, input_parameters, target
+    )
+    response.headers[JOB_ID_HEADER] = job.id
     return f"Workflow job {graph.name} is submitted"
@@ -1,16 +1,27 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
+from qualibrate_runner.api.dependencies import (
+    get_log_stream,
+    get_state_changes,
+)
 from qualibrate_runner.core.app.ws_manager import (
+    AppendSocketConnectionManagerList,
+    DeltaSocketConnectionManagerList,
+    FilteredSocketConnectionManagerMapping,
     SocketConnectionManagerList,
     SocketConnectionManagerMapping,
 )
 from qualibrate_runner.core.app.ws_managers import (
+    get_execution_history_append_socket_manager,
     get_execution_history_socket_manager,
+    get_logs_socket_manager,
+    get_run_status_delta_socket_manager,
     get_run_status_socket_manager,
 )
+from qualibrate_runner.core.logs_stream import LogFilter
 
 common_ws_router = APIRouter()
 
@@ -19,11 +30,30 @@ common_ws_router = APIRouter()
 async def run_status_subscribe(
     websocket: WebSocket,
     *,
+    delta: Annotated[
+        bool,
+        Query(
+            description=(
+                "Send full snapshot on connect and then only JSON patches "
+                "(RFC 6902) of changes. Send `resync` text to get a new "
+                "snapshot."
+            )
+        ),
+    ] = False,
     manager: Annotated[
         SocketConnectionManagerList, Depends(get_run_status_socket_manager)
     ],
+    delta_manager: Annotated[
+        DeltaSocketConnectionManagerList,
+        Depends(get_run_status_delta_socket_manager),
+    ],
 ) -> None:
+    if delta:
+        await delta_run_status_subscribe(websocket, delta_manager)
+        return
     await manager.connect(websocket)
+    # Wake up status task to send current status to the new subscriber
+    get_state_changes().notify()
     try:
         while True:
             await websocket.receive_text()
@@ -31,19 +61,114 @@ async def run_status_subscribe(
         manager.disconnect(websocket)
 
 
+async def delta_run_status_subscribe(
+    websocket: WebSocket, manager: DeltaSocketConnectionManagerList
+) -> None:
+    await manager.connect(websocket)
+    get_state_changes().notify()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            if message.strip() == "resync":
+                await manager.send_snapshot(websocket)
+    except WebSocketDisconnect:
+        manager.disconnect(websocket)
+
+
 @common_ws_router.websocket("/workflow_execution_history")
 async def workflow_execution_history_subscribe(
     websocket: WebSocket,
     *,
     reverse: bool = True,
+    incremental: Annotated[
+        bool,
+        Query(
+            description=(
+                "Send all items in execution order on connect and then only "
+                "newly executed items. `reverse` is ignored. Send `resync` "
+                "text to get all items again."
+            )
+        ),
+    ] = False,
     manager: Annotated[
         SocketConnectionManagerMapping[bool],
         Depends(get_execution_history_socket_manager),
     ],
+    append_manager: Annotated[
+        AppendSocketConnectionManagerList,
+        Depends(get_execution_history_append_socket_manager),
+    ],
 ) -> None:
+    if incremental:
+        await incremental_execution_history_subscribe(websocket, append_manager)
+        return
     await manager.connect(reverse, websocket)
+    get_state_changes().notify()
     try:
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
         manager.disconnect(reverse, websocket)
+
+
+async def incremental_execution_history_subscribe(
+    websocket: WebSocket, manager: AppendSocketConnectionManagerList
+) -> None:
+    await manager.connect(websocket)
+    get_state_changes().notify()
+    try:
+        while True:
+            message = await websocket.receive_text()
+            if message.strip() == "resync":
+                await manager.send_snapshot(websocket)
+    except WebSocketDisconnect:
+        manager.disconnect(websocket)
+
+
+@common_ws_router.websocket("/logs")
+async def logs_subscribe(
+    websocket: WebSocket,
+    *,
+    parse_files: Annotated[
+        bool,
+        Query(
+            description=(
+                "Follow the qualibrate log file instead of the runner "
+                "logger. Includes records of other processes."
+            )
+        ),
+    ] = False,
+    levelname: Annotated[
+        list[str] | None,
+        Query(description="Send only records of these levels."),
+    ] = None,
+    name: Annotated[
+        str | None,
+        Query(description="Send only records of the logger and its children."),
+    ] = None,
+    contains: Annotated[
+        str | None,
+        Query(description="Send only records with message containing text."),
+    ] = None,
+    manager: Annotated[
+        FilteredSocketConnectionManagerMapping[bool],
+        Depends(get_logs_socket_manager),
+    ],
+) -> None:
+    log_filter = LogFilter(
+        levelnames=(
+            frozenset(level.upper() for level in levelname)
+            if levelname
+            else None
+        ),
+        name=name,
+        contains=contains,
+    )
+    await manager.connect(parse_files, websocket, log_filter)
+    # Wake up logs task to start capturing records for the new subscriber
+    get_log_stream().notify()
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        manager.disconnect(parse_files, websocket)
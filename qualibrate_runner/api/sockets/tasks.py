@@ -1,17 +1,28 @@
+import asyncio
 import logging
 
-from qualibrate_runner.api.dependencies import get_state
-from qualibrate_runner.core.app.periodic_tasks import repeat_every
+from fastapi.concurrency import run_in_threadpool
+
+from qualibrate_runner.api.dependencies import (
+    get_log_stream,
+    get_state_changes,
+    get_status_computer,
+)
+from qualibrate_runner.config import get_runner_settings
+from qualibrate_runner.core.app.periodic_tasks import (
+    repeat_on_change,
+    run_in_background,
+)
 from qualibrate_runner.core.app.ws_managers import (
+    get_execution_history_append_socket_manager,
     get_execution_history_socket_manager,
+    get_logs_socket_manager,
+    get_run_status_delta_socket_manager,
     get_run_status_socket_manager,
 )
-from qualibrate_runner.core.statuses import (
-    get_graph_execution_history,
-    get_run_status,
-)
+from qualibrate_runner.core.metrics import ws_broadcast_duration
 
-__all__ = ["run_status", "execution_history"]
+__all__ = ["run_status", "execution_history", "logs"]
 
 
 def _on_exc(exc: Exception) -> None:
@@ -20,26 +31,66 @@ def _on_exc(exc: Exception) -> None:
     )
 
 
-@repeat_every(seconds=1, on_exception=_on_exc)
+@repeat_on_change(changes=get_state_changes, on_exception=_on_exc)
 async def run_status() -> None:
     manager = get_run_status_socket_manager()
-    if not manager.any_subscriber:
+    delta_manager = get_run_status_delta_socket_manager()
+    if not manager.any_subscriber and not delta_manager.any_subscriber:
         return
-    status = get_run_status(get_state())
-    await manager.broadcast(status.model_dump(mode="json"))
+    with ws_broadcast_duration.time("run_status"):
+        status = (await get_status_computer().run_status()).data
+        await manager.broadcast(status)
+        await delta_manager.broadcast(status)
 
 
-@repeat_every(seconds=1, on_exception=_on_exc)
+@repeat_on_change(changes=get_state_changes, on_exception=_on_exc)
 async def execution_history() -> None:
     manager = get_execution_history_socket_manager()
-    if not manager.any_subscriber:
+    append_manager = get_execution_history_append_socket_manager()
+    if not manager.any_subscriber and not append_manager.any_subscriber:
         return
-    history = get_graph_execution_history(get_state())
-    if history is None:
-        await manager.broadcast(True, None)
-        await manager.broadcast(False, None)
+    with ws_broadcast_duration.time("workflow_execution_history"):
+        snapshot = await get_status_computer().execution_history()
+        for reverse in (False, True):
+            if manager.any_subscriber_for(reverse):
+                await manager.broadcast_encoded(
+                    reverse, snapshot.frame(reverse)
+                )
+        if append_manager.any_subscriber:
+            await append_manager.broadcast(snapshot.items)
+
+
+async def _push_logs() -> None:
+    stream = get_log_stream()
+    manager = get_logs_socket_manager()
+    stream.handler.enabled = manager.any_subscriber_for(False)
+    await manager.broadcast(False, stream.handler.drain())
+    if not manager.any_subscriber_for(True):
+        stream.tailer.reset()
         return
-    await manager.broadcast(False, history.model_dump(mode="json"))
-    reversed_items = list(reversed(history.items))
-    history_reversed = history.model_copy(update={"items": reversed_items})
-    await manager.broadcast(True, history_reversed.model_dump(mode="json"))
+    await manager.broadcast(
+        True, await run_in_threadpool(stream.tailer.read_new)
+    )
+
+
+async def logs() -> None:
+    """
+    Start pushing new log records to `/ws/logs` subscribers.
+
+    Records of the runner logger are pushed as soon as they are emitted,
+    the log file is polled every `logs_stream_interval` seconds.
+    """
+    stream = get_log_stream()
+    stream.bind(asyncio.get_running_loop())
+    interval = get_runner_settings().logs_stream_interval
+
+    async def loop() -> None:
+        while True:
+            await stream.wait(interval)
+            try:
+                with ws_broadcast_duration.time("logs"):
+                    await _push_logs()
+            except Exception as exc:
+                _on_exc(exc)
+
+    run_in_background(loop())
@@ -1,5 +1,6 @@
 from .models import State
-from .resolvers import get_cl_settings, get_config_path
+from .resolvers import get_cl_settings, get_config_path, get_runner_settings
+from .settings import RunnerSettings
 from .vars import (
     CONFIG_KEY,
     CONFIG_PATH_ENV_NAME,
@@ -10,7 +11,9 @@ __all__ = [
     "CONFIG_KEY",
     "DEFAULT_QUALIBRATE_RUNNER_CONFIG_FILENAME",
     "CONFIG_PATH_ENV_NAME",
+    "RunnerSettings",
     "State",
     "get_config_path",
     "get_cl_settings",
+    "get_runner_settings",
 ]
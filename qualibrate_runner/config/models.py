@@ -11,7 +11,10 @@ The State is a singleton-like object (one per runner instance) that is
 continuously updated as jobs execute.
 """
 
-from pydantic import BaseModel, ConfigDict
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
 from qualibrate_runner.core.models.enums import RunStatusEnum
 from qualibrate_runner.core.models.last_run import LastRun
@@ -38,6 +41,11 @@ class State(BaseModel):
         run_item: Reference to the actual QualibrationNode or Graph being
             executed. This allows access to the live object during execution.
             None when no job is running.
+
+    Every assignment of a field bumps `version` and notifies registered
+    listeners, so status consumers can react to changes instead of polling.
+    In-place changes (e.g. of `last_run.state_updates`) have to be reported
+    explicitly with `mark_changed()`.
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -45,6 +53,38 @@ class State(BaseModel):
     last_run: LastRun | None = None
     run_item: QNodeType | QGraphType | None = None
 
+    _version: int = PrivateAttr(default=0)
+    _listeners: list[Callable[[], None]] = PrivateAttr(default_factory=list)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self.mark_changed()
+
+    @property
+    def version(self) -> int:
+        """Counter incremented on every state change."""
+        return self._version
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Register callable called on every state change.
+
+        Listener is called in the thread that changed the state, so it
+        should be cheap and thread-safe.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def mark_changed(self) -> None:
+        """Bump state version and notify listeners."""
+        self._version += 1
+        for listener in list(self._listeners):
+            listener()
+
     @property
     def is_running(self) -> bool:
         return (
@@ -9,8 +9,14 @@ from qualibrate_config.models import CalibrationLibraryConfig, QualibrateConfig
 from qualibrate_config.resolvers import get_qualibrate_config
 
 from qualibrate_runner.config import vars as config_vars
+from qualibrate_runner.config.settings import RunnerSettings
 
-__all__ = ["get_config_path", "get_settings", "get_cl_settings"]
+__all__ = [
+    "get_config_path",
+    "get_settings",
+    "get_cl_settings",
+    "get_runner_settings",
+]
 
 
 @lru_cache
@@ -40,3 +46,8 @@ def get_cl_settings(
     if q_lib is None:
         raise ValueError("Calibration library is not specified in config")
     return q_lib
+
+
+@lru_cache
+def get_runner_settings() -> RunnerSettings:
+    return RunnerSettings()
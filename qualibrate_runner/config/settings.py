@@ -0,0 +1,184 @@
+"""
+Runner specific settings.
+
+Unlike the shared qualibrate configuration file, these settings only tune
+the runner process itself. They are read from environment variables with
+the `QUALIBRATE_RUNNER_` prefix, e.g. `QUALIBRATE_RUNNER_EXECUTION_MODE`.
+"""
+
+import os
+from pathlib import Path
+from typing import Annotated
+
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+from qualibrate_runner.core.models.enums import ExecutionMode
+
+__all__ = ["RunnerSettings"]
+
+
+class RunnerSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="QUALIBRATE_RUNNER_")
+
+    execution_mode: Annotated[
+        ExecutionMode,
+        Field(
+            description=(
+                "Where submitted nodes and workflows are executed. `thread` "
+                "runs them in the API process, `process` runs them in a "
+                "pre-spawned worker process."
+            ),
+        ),
+    ] = ExecutionMode.THREAD
+    worker_pool_size: Annotated[
+        int,
+        Field(ge=1, description="Number of pre-spawned worker processes."),
+    ] = 1
+    worker_progress_interval: Annotated[
+        float,
+        Field(
+            gt=0,
+            description=(
+                "Interval in seconds between node and workflow progress "
+                "updates sent by a worker process."
+            ),
+        ),
+    ] = 0.2
+    ws_send_queue_size: Annotated[
+        int,
+        Field(
+            ge=1,
+            description=(
+                "Maximal number of outgoing websocket frames queued per "
+                "subscriber. Oldest frames are dropped when the queue is full."
+            ),
+        ),
+    ] = 2
+    ws_send_timeout: Annotated[
+        float,
+        Field(
+            gt=0,
+            description=(
+                "Timeout in seconds for sending a websocket frame. Subscriber "
+                "is disconnected if the frame isn't sent in time."
+            ),
+        ),
+    ] = 5.0
+    ws_max_dropped_frames: Annotated[
+        int,
+        Field(
+            ge=1,
+            description=(
+                "Number of frames dropped in a row after which the subscriber "
+                "is considered too slow and disconnected."
+            ),
+        ),
+    ] = 10
+    status_push_interval: Annotated[
+        float,
+        Field(
+            gt=0,
+            description=(
+                "Minimal interval in seconds between status pushes to "
+                "websocket subscribers. Changes made in between are "
+                "coalesced into a single push."
+            ),
+        ),
+    ] = 0.1
+    status_heartbeat_interval: Annotated[
+        float,
+        Field(
+            gt=0,
+            description=(
+                "Interval in seconds between status pushes while an item is "
+                "running even if no change was detected."
+            ),
+        ),
+    ] = 1.0
+    logs_stream_interval: Annotated[
+        float,
+        Field(
+            gt=0,
+            description=(
+                "Interval in seconds between reads of the log file for "
+                "`/ws/logs` subscribers following log files."
+            ),
+        ),
+    ] = 0.25
+    logs_stream_queue_size: Annotated[
+        int,
+        Field(
+            ge=1,
+            description=(
+                "Maximal number of outgoing log batches queued per `/ws/logs` "
+                "subscriber. Log batches are never dropped, a subscriber with "
+                "a full queue is disconnected."
+            ),
+        ),
+    ] = 100
+    run_history_enabled: Annotated[
+        bool,
+        Field(description="Whether completed runs are stored on disk."),
+    ] = True
+    run_history_path: Annotated[
+        Path | None,
+        Field(
+            description=(
+                "Path to the run history database. Defaults to "
+                "`run_history.sqlite` next to the config file."
+            ),
+        ),
+    ] = None
+    library_index_enabled: Annotated[
+        bool,
+        Field(
+            description=(
+                "Whether metadata of library nodes and graphs is persisted, "
+                "so they can be listed without importing library scripts."
+            )
+        ),
+    ] = True
+    library_index_path: Annotated[
+        Path | None,
+        Field(
+            description=(
+                "Path to the library index file. Defaults to "
+                "`library_index.json` next to the config file."
+            ),
+        ),
+    ] = None
+    library_watch_interval: Annotated[
+        float | None,
+        Field(
+            description=(
+                "Interval in seconds between polls of library files. Added, "
+                "modified and removed node and graph files are reloaded. "
+                "Polling is disabled if None."
+            ),
+        ),
+    ] = 2.0
+    library_scan_workers: Annotated[
+        int,
+        Field(
+            ge=0,
+            description=(
+                "Number of worker processes importing node files in parallel "
+                "when the library index is built or updated while the whole "
+                "library isn't loaded. Workers are used only if at least 4 "
+                "node files have to be scanned. Node files are imported one "
+                "by one in the runner process if less than 2."
+            ),
+        ),
+    ] = min(4, os.cpu_count() or 1)
+    copy_pool_size: Annotated[
+        int,
+        Field(
+            ge=0,
+            description=(
+                "Number of ready copies of every submitted node and graph "
+                "prepared between runs, so the next submission doesn't wait "
+                "for copying. Copies are made on demand if 0."
+            ),
+        ),
+    ] = 1
@@ -0,0 +1,50 @@
+import asyncio
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+
+from qualibrate_runner.api.dependencies import get_library_manager
+from qualibrate_runner.config import get_runner_settings
+from qualibrate_runner.core.app.periodic_tasks import run_in_background
+
+__all__ = ["watch_library"]
+
+logger = logging.getLogger(__name__)
+
+
+async def _reload_library() -> None:
+    manager = get_library_manager()
+    # Nothing to compare with until the library is requested
+    if not manager.is_indexed:
+        return
+    changes = await run_in_threadpool(manager.reload_changed)
+    if changes is not None:
+        logger.info(
+            f"Library reloaded in {changes.duration:.3f}s. "
+            f"Nodes: {changes.nodes}, graphs: {changes.graphs}, "
+            f"removed: {changes.removed}"
+        )
+
+
+async def watch_library() -> None:
+    """
+    Start polling library files every `library_watch_interval` seconds.
+
+    Only added, modified and removed node and graph files are reloaded, so
+    requests aren't blocked by a rescan of the whole library.
+    """
+    interval = get_runner_settings().library_watch_interval
+    if interval is None:
+        return
+
+    async def loop() -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await _reload_library()
+            except Exception as exc:
+                logger.exception(
+                    "Exception occurred while reloading library", exc_info=exc
+                )
+
+    run_in_background(loop())
@@ -4,12 +4,40 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from qualibrate_runner.api.sockets.tasks import execution_history, run_status
+from qualibrate_runner.api.dependencies import (
+    get_job_queue,
+    get_log_stream,
+    get_run_history_store,
+    get_status_computer,
+    get_worker_pool,
+)
+from qualibrate_runner.api.sockets.tasks import (
+    execution_history,
+    logs,
+    run_status,
+)
+from qualibrate_runner.core.app.library_watcher import watch_library
+from qualibrate_runner.core.app.periodic_tasks import cancel_background_tasks
 
 __all__ = ["app_lifespan"]
 
 
 @asynccontextmanager
 async def app_lifespan(app: FastAPI) -> AsyncIterator[None]:
-    await asyncio.gather(run_status(), execution_history())
+    await asyncio.gather(
+        run_status(), execution_history(), logs(), watch_library()
+    )
+    # Pre-spawn worker processes so the library import cost isn't paid by
+    # the first submitted node
+    worker_pool = get_worker_pool()
+    run_history = get_run_history_store()
     yield
+    await cancel_background_tasks()
+    get_job_queue().stop(timeout=1)
+    get_log_stream().close()
+    get_status_computer().shutdown()
+    get_status_computer.cache_clear()
+    if worker_pool is not None:
+        worker_pool.stop(timeout=1)
+    if run_history is not None:
+        run_history.stop(timeout=1)
@@ -5,6 +5,8 @@ from typing import Any
 
 from fastapi.concurrency import run_in_threadpool
 
+from qualibrate_runner.core.app.state_changes import StateChanges
+
 NoArgsNoReturnFuncT = Callable[[], None]
 NoArgsNoReturnAsyncFuncT = Callable[[], Coroutine[Any, Any, None]]
 ExcArgNoReturnFuncT = Callable[[Exception], None]
@@ -12,7 +14,37 @@ ExcArgNoReturnAsyncFuncT = Callable[[Exception], Coroutine[Any, Any, None]]
 NoArgsNoReturnAnyFuncT = NoArgsNoReturnFuncT | NoArgsNoReturnAsyncFuncT
 ExcArgNoReturnAnyFuncT = ExcArgNoReturnFuncT | ExcArgNoReturnAsyncFuncT
 
-__all__ = ["repeat_every"]
+__all__ = [
+    "cancel_background_tasks",
+    "repeat_every",
+    "repeat_on_change",
+    "run_in_background",
+]
+
+# Strong references to running background tasks: the event loop keeps only
+# weak ones, so a task without other references may be garbage collected
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+def run_in_background(coro: Coroutine[Any, Any, None]) -> asyncio.Task[None]:
+    """
+    Schedule a coroutine as a background task of the running event loop.
+
+    The task is referenced until it's done and is cancelled by
+    `cancel_background_tasks`.
+    """
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def cancel_background_tasks() -> None:
+    """Cancel all background tasks and wait until they're finished."""
+    tasks = list(_background_tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def _handle_func(func: NoArgsNoReturnAnyFuncT) -> None:
@@ -68,7 +100,56 @@ def repeat_every(
                         await _handle_exc(exc, on_exception)
                     await asyncio.sleep(seconds)
 
-            asyncio.ensure_future(loop())
+            run_in_background(loop())
+
+        return wrapped
+
+    return decorator
+
+
+def repeat_on_change(
+    *,
+    changes: Callable[[], StateChanges],
+    on_exception: Callable[[Exception], None] | None = None,
+) -> Callable[[NoArgsNoReturnAnyFuncT], NoArgsNoReturnAsyncFuncT]:
+    """
+    This function returns a decorator that modifies a function so it is
+    re-executed every time the State is changed after its first call.
+    The function it decorates should accept no arguments and return nothing.
+
+    Changes are coalesced: the function isn't called more often than once
+    per `StateChanges.min_interval` seconds.
+
+    Parameters
+    ----------
+    changes: Callable[[], StateChanges]
+        A function returning the source of State change notifications
+    on_exception: Optional[Callable[[Exception], None]] (default None)
+        A function to call when an exception is raised by the decorated
+        function.
+    """
+
+    def decorator(func: NoArgsNoReturnAnyFuncT) -> NoArgsNoReturnAsyncFuncT:
+        """
+        Converts the decorated function into a version of itself called on
+        every State change.
+        """
+
+        @wraps(func)
+        async def wrapped() -> None:
+            source = changes()
+            waiter = source.waiter()
+
+            async def loop() -> None:
+                while True:
+                    await waiter.wait()
+                    try:
+                        await _handle_func(func)
+                    except Exception as exc:
+                        await _handle_exc(exc, on_exception)
+                    await asyncio.sleep(source.min_interval)
+
+            run_in_background(loop())
 
         return wrapped
 
@@ -0,0 +1,118 @@
+"""
+Asyncio notifications about State changes.
+
+State listeners are called in the thread which changed the state (usually
+the job executor thread). StateChanges forwards these notifications into the
+event loop, so websocket tasks can push status as soon as it's changed and
+sleep while nothing happens.
+"""
+
+import asyncio
+from collections.abc import Callable, Hashable
+from time import monotonic
+
+from qualibrate_runner.config import State
+
+__all__ = ["StateChangeWaiter", "StateChanges"]
+
+ProgressProbe = Callable[[State], Hashable]
+
+
+class StateChanges:
+    """
+    Thread-safe bridge between State listeners and asyncio waiters.
+
+    Args:
+        state: Observed state.
+        probe: Function returning cheap fingerprint of the running item
+            progress. It's called every `min_interval` seconds while an
+            item is running to detect changes that are not reported to
+            the State.
+        min_interval: Minimal interval in seconds between two wake-ups of a
+            waiter.
+        heartbeat_interval: Maximal interval in seconds between two wake-ups
+            of a waiter while an item is running.
+    """
+
+    def __init__(
+        self,
+        state: State,
+        probe: ProgressProbe,
+        min_interval: float = 0.1,
+        heartbeat_interval: float = 1.0,
+    ) -> None:
+        self.state = state
+        self.probe = probe
+        self.min_interval = min_interval
+        self.heartbeat_interval = heartbeat_interval
+        self._generation = 0
+        self._event = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        state.add_listener(self.notify)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def bind(self) -> None:
+        """Bind to the running event loop. Must be called inside the loop."""
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        """Wake up all waiters. Can be called from any thread."""
+        self._generation += 1
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._set_event)
+
+    def _set_event(self) -> None:
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+    async def wait_notification(self, timeout: float | None) -> bool:
+        """Wait for the next notification. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def waiter(self) -> "StateChangeWaiter":
+        self.bind()
+        return StateChangeWaiter(self)
+
+
+class StateChangeWaiter:
+    """Tracks which changes were already seen by a single consumer."""
+
+    def __init__(self, changes: StateChanges) -> None:
+        self._changes = changes
+        self._seen_generation = -1
+        self._seen_progress: Hashable = None
+        self._last_wakeup = 0.0
+
+    async def wait(self) -> None:
+        """
+        Wait until the state is changed.
+
+        Returns immediately on the first call. While an item is running, the
+        progress is probed every `min_interval` seconds and the waiter is
+        woken up at least every `heartbeat_interval` seconds (run duration
+        is changing). When idle, the waiter sleeps until notified.
+        """
+        changes = self._changes
+        while self._seen_generation == changes.generation:
+            running = changes.state.is_running
+            timeout = changes.min_interval if running else None
+            if await changes.wait_notification(timeout) or not running:
+                continue
+            if (
+                changes.probe(changes.state) != self._seen_progress
+                or monotonic() - self._last_wakeup >= changes.heartbeat_interval
+            ):
+                break
+        self._seen_generation = changes.generation
+        self._seen_progress = changes.probe(changes.state)
+        self._last_wakeup = monotonic()
@@ -0,0 +1,220 @@
+"""
+Status snapshots computed outside the event loop.
+
+Building the run status and dumping the graph execution history takes tens
+of milliseconds for big graphs. Websocket push tasks and the status HTTP
+route await these computations, so they are executed by a dedicated thread
+and the event loop keeps serving requests meanwhile.
+
+Execution history items don't change once executed, so every item is dumped
+and encoded only once, and the history of an unchanged version is reused.
+
+Only a single computation of every kind is in flight at a time. Consumers
+requesting a status while it's being computed for the current State version
+share the result of that computation. If the State was changed since the
+computation started, the next one is started once it's completed.
+"""
+
+import asyncio
+from collections.abc import Callable, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from qualibrate.models.execution_history import (
+    ExecutionHistory,
+    ExecutionHistoryItem,
+)
+
+from qualibrate_runner.config import State
+from qualibrate_runner.core.models.active_run import RunStatus
+from qualibrate_runner.core.statuses import (
+    get_graph_execution_history,
+    get_run_status,
+)
+from qualibrate_runner.utils.json_encoder import encode_json
+
+__all__ = [
+    "ExecutionHistorySnapshot",
+    "RunStatusSnapshot",
+    "SharedComputation",
+    "StatusComputer",
+]
+
+_T = TypeVar("_T")
+
+
+class SharedComputation(Generic[_T]):
+    """
+    Single-flight computation executed by the executor.
+
+    Must be used from a single event loop.
+
+    Args:
+        compute: Computation executed in the executor thread.
+        version: Returns version of the computation input. In-flight
+            computation is shared only by consumers of the same version.
+        executor: Executor running the computation.
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[], _T],
+        version: Callable[[], Hashable],
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        self._compute = compute
+        self._version = version
+        self._executor = executor
+        self._inflight: asyncio.Future[_T] | None = None
+        self._inflight_version: Hashable = None
+
+    async def get(self) -> _T:
+        """Result of the computation started for the current version."""
+        while True:
+            version = self._version()
+            inflight = self._inflight
+            if inflight is None or inflight.done():
+                inflight = self._start(version)
+            elif self._inflight_version != version:
+                await asyncio.wait({inflight})
+                continue
+            return await asyncio.shield(inflight)
+
+    def _start(self, version: Hashable) -> "asyncio.Future[_T]":
+        loop = asyncio.get_running_loop()
+        self._inflight = loop.run_in_executor(self._executor, self._compute)
+        self._inflight_version = version
+        return self._inflight
+
+
+@dataclass(frozen=True)
+class RunStatusSnapshot:
+    """Run status and its JSON-compatible dump."""
+
+    status: RunStatus
+    data: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class _HistoryItemDump:
+    item: ExecutionHistoryItem
+    data: dict[str, Any]
+    encoded: str
+
+
+class ExecutionHistorySnapshot:
+    """
+    Graph execution history items dumped and encoded once per version.
+
+    Frames with the whole history are joined from encoded items when they
+    are requested for the first time, so an ordering nobody subscribed to
+    is never built.
+
+    Args:
+        items: Dumps of history items in execution order. None if the
+            running item isn't a graph.
+        encoded_items: JSON encoded `items`.
+    """
+
+    def __init__(
+        self,
+        items: list[dict[str, Any]] | None,
+        encoded_items: list[str] | None,
+    ) -> None:
+        self.items = items
+        self._encoded_items = encoded_items
+        self._frames: dict[bool, str] = {}
+
+    def frame(self, reverse: bool) -> str:
+        """JSON encoded history, `null` if the running item isn't a graph."""
+        frame = self._frames.get(reverse)
+        if frame is None:
+            if self._encoded_items is None:
+                frame = "null"
+            else:
+                encoded_items = (
+                    reversed(self._encoded_items)
+                    if reverse
+                    else self._encoded_items
+                )
+                frame = '{"items":[' + ",".join(encoded_items) + "]}"
+            self._frames[reverse] = frame
+        return frame
+
+
+_no_history = ExecutionHistorySnapshot(None, None)
+
+
+class StatusComputer:
+    """
+    Computes status snapshots of the State in a dedicated thread.
+
+    Args:
+        state: State to compute snapshots of.
+    """
+
+    def __init__(self, state: State) -> None:
+        self._state = state
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="qualibrate-runner-status"
+        )
+        self._run_status = SharedComputation(
+            self._compute_run_status, self._state_version, self._executor
+        )
+        self._execution_history = SharedComputation(
+            self._compute_execution_history,
+            self._state_version,
+            self._executor,
+        )
+        # Executed items aren't changed, so each one is dumped only once
+        self._item_dumps: list[_HistoryItemDump] = []
+        self._history = _no_history
+
+    def _state_version(self) -> Hashable:
+        return self._state.version
+
+    def _compute_run_status(self) -> RunStatusSnapshot:
+        status = get_run_status(self._state)
+        return RunStatusSnapshot(status, status.model_dump(mode="json"))
+
+    def _compute_execution_history(self) -> ExecutionHistorySnapshot:
+        history: ExecutionHistory | None = get_graph_execution_history(
+            self._state
+        )
+        if history is None:
+            self._item_dumps = []
+            self._history = _no_history
+            return self._history
+        cached = self._item_dumps
+        if len(cached) == len(history.items) and all(
+            dump.item is item
+            for dump, item in zip(cached, history.items, strict=True)
+        ):
+            return self._history
+        item_dumps = [
+            cached[idx]
+            if idx < len(cached) and cached[idx].item is item
+            else self._dump_item(item)
+            for idx, item in enumerate(history.items)
+        ]
+        self._item_dumps = item_dumps
+        self._history = ExecutionHistorySnapshot(
+            [dump.data for dump in item_dumps],
+            [dump.encoded for dump in item_dumps],
+        )
+        return self._history
+
+    @staticmethod
+    def _dump_item(item: ExecutionHistoryItem) -> _HistoryItemDump:
+        data = item.model_dump(mode="json")
+        return _HistoryItemDump(item, data, encode_json(data))
+
+    async def run_status(self) -> RunStatusSnapshot:
+        return await self._run_status.get()
+
+    async def execution_history(self) -> ExecutionHistorySnapshot:
+        return await self._execution_history.get()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,59 +1,468 @@
+import asyncio
+import logging
 from collections import defaultdict
-from collections.abc import Hashable
-from typing import Any, Generic, TypeVar
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any, Generic, TypeVar, cast
 
+import jsonpatch
 from fastapi import WebSocket
 
+from qualibrate_runner.core.models.ws_stats import SocketStats
+from qualibrate_runner.utils.json_encoder import encode_json
 
-class SocketConnectionManagerList:
-    def __init__(self) -> None:
-        self.active_connections: list[WebSocket] = []
+logger = logging.getLogger(__name__)
+
+
+class SocketSubscriber:
+    """
+    Connected websocket with its own bounded outgoing queue.
+
+    Frames are sent by a dedicated writer task, so a slow client never
+    blocks the broadcasting task or other subscribers. If the queue is full
+    the oldest frame is dropped in favour of the new one. The subscriber is
+    evicted (disconnected) if a send times out, fails or too many frames were
+    dropped in a row.
+
+    Lossless subscribers (e.g. of log records, which aren't repeated by later
+    frames) never drop frames. They are evicted once their queue is full.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        stats: SocketStats,
+        on_evict: Callable[["SocketSubscriber"], None],
+        queue_size: int = 2,
+        send_timeout: float = 5.0,
+        max_dropped_frames: int = 10,
+        lossless: bool = False,
+    ) -> None:
+        self.websocket = websocket
+        self._stats = stats
+        self._on_evict = on_evict
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self._send_timeout = send_timeout
+        self._max_dropped_frames = max_dropped_frames
+        self._lossless = lossless
+        self._dropped_in_row = 0
+        self._writer: asyncio.Task[None] | None = None
+        # Referenced, so the task isn't garbage collected before it's done
+        self._close_task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._write_forever())
+
+    def stop(self) -> None:
+        self._closed = True
+        if (
+            self._writer is not None
+            and self._writer is not asyncio.current_task()
+        ):
+            self._writer.cancel()
+
+    def push(self, text: str) -> None:
+        if self._closed:
+            return
+        if self._queue.full():
+            if self._lossless:
+                self._evict("outgoing queue is full")
+                return
+            self._queue.get_nowait()
+            self._stats.frames_dropped += 1
+            self._dropped_in_row += 1
+            if self._dropped_in_row >= self._max_dropped_frames:
+                self._evict("too many frames dropped")
+                return
+        self._queue.put_nowait(text)
+
+    async def _write_forever(self) -> None:
+        while True:
+            text = await self._queue.get()
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_text(text), self._send_timeout
+                )
+            except asyncio.TimeoutError:
+                self._stats.send_timeouts += 1
+                self._evict("send timeout")
+                return
+            except Exception as ex:
+                self._stats.send_errors += 1
+                self._evict(f"send failed: {ex!r}")
+                return
+            self._stats.frames_sent += 1
+            self._dropped_in_row = 0
+
+    def _evict(self, reason: str) -> None:
+        logger.warning(f"Disconnecting websocket subscriber: {reason}")
+        self._stats.clients_evicted += 1
+        self.stop()
+        self._on_evict(self)
+        self._close_task = asyncio.create_task(self._close())
+
+    async def _close(self) -> None:
+        try:
+            await asyncio.wait_for(self.websocket.close(), self._send_timeout)
+        except Exception as ex:
+            logger.debug(f"Failed to close evicted websocket: {ex!r}")
+
+
+class _SocketConnectionManagerBase:
+    def __init__(
+        self,
+        queue_size: int = 2,
+        send_timeout: float = 5.0,
+        max_dropped_frames: int = 10,
+        lossless: bool = False,
+    ) -> None:
+        self._queue_size = queue_size
+        self._send_timeout = send_timeout
+        self._max_dropped_frames = max_dropped_frames
+        self._lossless = lossless
+        self._stats = SocketStats()
+
+    def _create_subscriber(
+        self,
+        websocket: WebSocket,
+        on_evict: Callable[[SocketSubscriber], None],
+    ) -> SocketSubscriber:
+        subscriber = SocketSubscriber(
+            websocket,
+            self._stats,
+            on_evict,
+            queue_size=self._queue_size,
+            send_timeout=self._send_timeout,
+            max_dropped_frames=self._max_dropped_frames,
+            lossless=self._lossless,
+        )
+        subscriber.start()
+        return subscriber
+
+    @staticmethod
+    def _remove(
+        subscribers: list[SocketSubscriber], websocket: WebSocket
+    ) -> None:
+        for subscriber in subscribers:
+            if subscriber.websocket is websocket:
+                subscriber.stop()
+                subscribers.remove(subscriber)
+                return
+
+    @classmethod
+    def _push_all(
+        cls, subscribers: list[SocketSubscriber], message: Any
+    ) -> None:
+        cls._push_all_encoded(subscribers, encode_json(message))
+
+    @staticmethod
+    def _push_all_encoded(
+        subscribers: list[SocketSubscriber], text: str
+    ) -> None:
+        # Copy because slow subscriber can be evicted while pushing
+        for subscriber in list(subscribers):
+            subscriber.push(text)
+
+
+class SocketConnectionManagerList(_SocketConnectionManagerBase):
+    def __init__(
+        self,
+        queue_size: int = 2,
+        send_timeout: float = 5.0,
+        max_dropped_frames: int = 10,
+    ) -> None:
+        super().__init__(queue_size, send_timeout, max_dropped_frames)
+        self.subscribers: list[SocketSubscriber] = []
+
+    @property
+    def active_connections(self) -> list[WebSocket]:
+        return [subscriber.websocket for subscriber in self.subscribers]
 
     async def connect(self, websocket: WebSocket) -> None:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.subscribers.append(
+            self._create_subscriber(
+                websocket, lambda s: self.disconnect(s.websocket)
+            )
+        )
 
     def disconnect(self, websocket: WebSocket) -> None:
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self._remove(self.subscribers, websocket)
 
     async def broadcast(self, message: Any) -> None:
-        for connection in self.active_connections:
-            await connection.send_json(message)
+        if not self.any_subscriber:
+            return
+        self._push_all(self.subscribers, message)
+
+    async def send(self, websocket: WebSocket, message: Any) -> None:
+        """Send message to a single connected subscriber."""
+        for subscriber in self.subscribers:
+            if subscriber.websocket is websocket:
+                subscriber.push(encode_json(message))
+                return
 
     @property
     def any_subscriber(self) -> bool:
-        return len(self.active_connections) > 0
+        return len(self.subscribers) > 0
+
+    @property
+    def stats(self) -> SocketStats:
+        return self._stats.model_copy(
+            update={"connections": len(self.subscribers)}
+        )
+
+
+class DeltaSocketConnectionManagerList(SocketConnectionManagerList):
+    """
+    Connection manager sending RFC 6902 JSON patches instead of full data.
+
+    Every subscriber gets a full snapshot on connect (or on resync request)
+    and then only patches against the previous broadcast data. Nothing is
+    sent if data wasn't changed. Data broadcast while nobody is subscribed
+    is only stored, it isn't diffed. Frames are numbered with a sequence number,
+    patch with `seq=N` has to be applied to data of frame `seq=N-1`, so
+    client can detect a gap (e.g. frame dropped for a slow client) and
+    request a resync.
+
+    Frames:
+    - `{"type": "snapshot", "seq": N, "data": {...}}`
+    - `{"type": "patch", "seq": N, "patch": [...]}`
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 2,
+        send_timeout: float = 5.0,
+        max_dropped_frames: int = 10,
+    ) -> None:
+        super().__init__(queue_size, send_timeout, max_dropped_frames)
+        self._data: Any = None
+        self._seq = 0
+
+    def _snapshot_frame(self) -> dict[str, Any]:
+        return {"type": "snapshot", "seq": self._seq, "data": self._data}
+
+    async def connect(self, websocket: WebSocket) -> None:
+        await super().connect(websocket)
+        if self._seq > 0:
+            await self.send_snapshot(websocket)
+
+    async def send_snapshot(self, websocket: WebSocket) -> None:
+        """Send the latest full data to a subscriber."""
+        if self._seq > 0:
+            await self.send(websocket, self._snapshot_frame())
+
+    async def broadcast(self, message: Any) -> None:
+        if not self.any_subscriber:
+            # Nothing to diff for, subscribers get a snapshot on connect
+            self._data = message
+            self._seq += 1
+            return
+        if self._seq == 0:
+            self._data = message
+            self._seq = 1
+            await super().broadcast(self._snapshot_frame())
+            return
+        patch = jsonpatch.make_patch(self._data, message).patch
+        if not patch:
+            return
+        self._data = message
+        self._seq += 1
+        await super().broadcast(
+            {"type": "patch", "seq": self._seq, "patch": patch}
+        )
+
+
+class AppendSocketConnectionManagerList(SocketConnectionManagerList):
+    """
+    Connection manager sending only items appended to a growing list.
+
+    Every subscriber gets the whole list on connect (or on resync request)
+    and then only items appended since the previous broadcast. If the list
+    was replaced instead of extended (e.g. another run started), a new
+    snapshot is broadcast. Frames are numbered like patches of
+    `DeltaSocketConnectionManagerList`, items of frame `seq=N` extend the
+    list of frame `seq=N-1`.
+
+    Frames:
+    - `{"type": "snapshot", "seq": N, "items": [...] | null}`
+    - `{"type": "append", "seq": N, "items": [...]}`
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 2,
+        send_timeout: float = 5.0,
+        max_dropped_frames: int = 10,
+    ) -> None:
+        super().__init__(queue_size, send_timeout, max_dropped_frames)
+        self._items: list[Any] | None = None
+        self._seq = 0
+
+    def _snapshot_frame(self) -> dict[str, Any]:
+        return {"type": "snapshot", "seq": self._seq, "items": self._items}
+
+    async def connect(self, websocket: WebSocket) -> None:
+        await super().connect(websocket)
+        if self._seq > 0:
+            await self.send_snapshot(websocket)
+
+    async def send_snapshot(self, websocket: WebSocket) -> None:
+        """Send the whole latest list to a subscriber."""
+        if self._seq > 0:
+            await self.send(websocket, self._snapshot_frame())
+
+    def _new_items(self, items: Sequence[Any] | None) -> list[Any] | None:
+        """Items appended to the broadcast list. None if it was replaced."""
+        previous = self._items
+        if previous is None or items is None or len(items) < len(previous):
+            return None
+        # Items are usually the same objects, so equality is rarely compared
+        if not all(
+            old is new or old == new
+            for old, new in zip(previous, items, strict=False)
+        ):
+            return None
+        return list(items[len(previous) :])
+
+    async def broadcast(self, message: Sequence[Any] | None) -> None:
+        if self._seq > 0:
+            if message is None and self._items is None:
+                return
+            new_items = self._new_items(message)
+            if new_items is not None:
+                if not new_items:
+                    return
+                cast(list[Any], self._items).extend(new_items)
+                self._seq += 1
+                await super().broadcast(
+                    {"type": "append", "seq": self._seq, "items": new_items}
+                )
+                return
+        self._items = list(message) if message is not None else None
+        self._seq += 1
+        await super().broadcast(self._snapshot_frame())
 
 
 KT = TypeVar("KT", bound=Hashable)
 
 
-class SocketConnectionManagerMapping(Generic[KT]):
-    def __init__(self) -> None:
-        self.active_connections: dict[KT, list[WebSocket]] = defaultdict(list)
+class SocketConnectionManagerMapping(_SocketConnectionManagerBase, Generic[KT]):
+    def __init__(
+        self,
+        queue_size: int = 2,
+        send_timeout: float = 5.0,
+        max_dropped_frames: int = 10,
+        lossless: bool = False,
+    ) -> None:
+        super().__init__(queue_size, send_timeout, max_dropped_frames, lossless)
+        self.subscribers: dict[KT, list[SocketSubscriber]] = defaultdict(list)
+
+    @property
+    def active_connections(self) -> dict[KT, list[WebSocket]]:
+        return {
+            key: [subscriber.websocket for subscriber in subscribers]
+            for key, subscribers in self.subscribers.items()
+        }
 
     async def connect(self, key: KT, websocket: WebSocket) -> None:
         await websocket.accept()
-        self.active_connections[key].append(websocket)
+        self.subscribers[key].append(
+            self._create_subscriber(
+                websocket, lambda s: self.disconnect(key, s.websocket)
+            )
+        )
 
     def disconnect(self, key: KT, websocket: WebSocket) -> None:
-        self.active_connections[key].remove(websocket)
+        self._remove(self.subscribers[key], websocket)
 
     async def broadcast(self, key: KT, message: Any) -> None:
         if not self.any_subscriber_for(key):
             return
-        for connection in self.active_connections[key]:
-            await connection.send_json(message)
+        self._push_all(self.subscribers[key], message)
+
+    async def broadcast_encoded(self, key: KT, text: str) -> None:
+        """Broadcast message already encoded to JSON."""
+        if not self.any_subscriber_for(key):
+            return
+        self._push_all_encoded(self.subscribers[key], text)
 
     @property
     def any_subscriber(self) -> bool:
-        return len(self.active_connections) > 0 and any(
-            map(len, self.active_connections.values())
+        return len(self.subscribers) > 0 and any(
+            map(len, self.subscribers.values())
         )
 
     def any_subscriber_for(self, key: KT) -> bool:
-        return (
-            key in self.active_connections
-            and len(self.active_connections[key]) > 0
+        return key in self.subscribers and len(self.subscribers[key]) > 0
+
+    @property
+    def stats(self) -> SocketStats:
+        return self._stats.model_copy(
+            update={"connections": sum(map(len, self.subscribers.values()))}
         )
+
+
+class FilteredSocketConnectionManagerMapping(
+    SocketConnectionManagerMapping[KT]
+):
+    """
+    Connection manager broadcasting batches of items filtered per subscriber.
+
+    Every subscriber has its own predicate, only matching items of a batch
+    are sent to it as a JSON array. Nothing is sent if no item matches.
+    Subscribers with equal predicates share the encoded frame.
+
+    Batches contain only new items, so subscribers are lossless: a batch is
+    never dropped, a subscriber which can't keep up with its queue is
+    disconnected instead.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 2,
+        send_timeout: float = 5.0,
+        max_dropped_frames: int = 10,
+    ) -> None:
+        super().__init__(
+            queue_size, send_timeout, max_dropped_frames, lossless=True
+        )
+        self._filters: dict[SocketSubscriber, Callable[[Any], bool]] = {}
+
+    async def connect(
+        self,
+        key: KT,
+        websocket: WebSocket,
+        item_filter: Callable[[Any], bool] | None = None,
+    ) -> None:
+        await websocket.accept()
+        subscriber = self._create_subscriber(
+            websocket, lambda s: self.disconnect(key, s.websocket)
+        )
+        if item_filter is not None:
+            self._filters[subscriber] = item_filter
+        self.subscribers[key].append(subscriber)
+
+    def disconnect(self, key: KT, websocket: WebSocket) -> None:
+        for subscriber in self.subscribers[key]:
+            if subscriber.websocket is websocket:
+                self._filters.pop(subscriber, None)
+                break
+        super().disconnect(key, websocket)
+
+    async def broadcast(self, key: KT, message: list[Any]) -> None:
+        if not message or not self.any_subscriber_for(key):
+            return
+        frames: dict[Callable[[Any], bool] | None, str | None] = {}
+        for subscriber in list(self.subscribers[key]):
+            item_filter = self._filters.get(subscriber)
+            if item_filter not in frames:
+                items = (
+                    message
+                    if item_filter is None
+                    else [item for item in message if item_filter(item)]
+                )
+                frames[item_filter] = encode_json(items) if items else None
+            frame = frames[item_filter]
+            if frame is not None:
+                subscriber.push(frame)
@@ -1,18 +1,93 @@
 from functools import cache
 
+from qualibrate_runner.config import get_runner_settings
 from qualibrate_runner.core.app.ws_manager import (
+    AppendSocketConnectionManagerList,
+    DeltaSocketConnectionManagerList,
+    FilteredSocketConnectionManagerMapping,
     SocketConnectionManagerList,
     SocketConnectionManagerMapping,
 )
+from qualibrate_runner.core.metrics import registry
+from qualibrate_runner.core.models.ws_stats import SocketStats
 
 
 @cache
 def get_run_status_socket_manager() -> SocketConnectionManagerList:
-    return SocketConnectionManagerList()
+    settings = get_runner_settings()
+    return SocketConnectionManagerList(
+        queue_size=settings.ws_send_queue_size,
+        send_timeout=settings.ws_send_timeout,
+        max_dropped_frames=settings.ws_max_dropped_frames,
+    )
+
+
+@cache
+def get_run_status_delta_socket_manager() -> DeltaSocketConnectionManagerList:
+    settings = get_runner_settings()
+    return DeltaSocketConnectionManagerList(
+        queue_size=settings.ws_send_queue_size,
+        send_timeout=settings.ws_send_timeout,
+        max_dropped_frames=settings.ws_max_dropped_frames,
+    )
 
 
 @cache
 def get_execution_history_socket_manager() -> SocketConnectionManagerMapping[
     bool
 ]:
-    return SocketConnectionManagerMapping[bool]()
+    settings = get_runner_settings()
+    return SocketConnectionManagerMapping[bool](
+        queue_size=settings.ws_send_queue_size,
+        send_timeout=settings.ws_send_timeout,
+        max_dropped_frames=settings.ws_max_dropped_frames,
+    )
+
+
+@cache
+def get_execution_history_append_socket_manager() -> (
+    AppendSocketConnectionManagerList
+):
+    """Subscribers receiving only newly executed graph elements."""
+    settings = get_runner_settings()
+    return AppendSocketConnectionManagerList(
+        queue_size=settings.ws_send_queue_size,
+        send_timeout=settings.ws_send_timeout,
+        max_dropped_frames=settings.ws_max_dropped_frames,
+    )
+
+
+@cache
+def get_logs_socket_manager() -> FilteredSocketConnectionManagerMapping[bool]:
+    """Log subscribers keyed by whether they follow log files."""
+    settings = get_runner_settings()
+    return FilteredSocketConnectionManagerMapping[bool](
+        queue_size=settings.logs_stream_queue_size,
+        send_timeout=settings.ws_send_timeout,
+        max_dropped_frames=settings.ws_max_dropped_frames,
+    )
+
+
+def get_socket_stats() -> dict[str, SocketStats]:
+    """Delivery statistics keyed by websocket endpoint name."""
+    return {
+        "run_status": get_run_status_socket_manager().stats,
+        "run_status_delta": get_run_status_delta_socket_manager().stats,
+        "workflow_execution_history": (
+            get_execution_history_socket_manager().stats
+        ),
+        "workflow_execution_history_incremental": (
+            get_execution_history_append_socket_manager().stats
+        ),
+        "logs": get_logs_socket_manager().stats,
+    }
+
+
+registry.gauge_callback(
+    "qualibrate_runner_ws_subscribers",
+    "Connected websocket subscribers.",
+    ("endpoint",),
+    lambda: {
+        (name,): stats.connections for name, stats in get_socket_stats().items()
+    },
+)
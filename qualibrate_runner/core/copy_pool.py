@@ -0,0 +1,161 @@
+"""
+Pool of pre-built copies of library nodes and graphs.
+
+Every run mutates the runnable it executes, so it gets its own copy of the
+library instance. Copying a node with a large parameters model and machine
+references takes noticeable time, so copies are built in advance and a
+submitted run takes a ready one. The pool is refilled after every use.
+
+Copying a node temporarily resets the class level active node, which is
+used by a running node. Refills are therefore scheduled by the caller
+(the job queue runs them between jobs) and copies are never built
+concurrently with a run.
+"""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from copy import copy
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, cast
+
+from qualibrate.q_runnnable import QRunnable
+
+from qualibrate_runner.core.models.copy_pool import CopyPoolStats
+from qualibrate_runner.core.models.enums import RunnableType
+
+__all__ = ["RunnableCopyPool"]
+
+RunnableT = TypeVar("RunnableT", bound=QRunnable[Any, Any])
+
+
+@dataclass
+class _PoolEntry:
+    source: QRunnable[Any, Any]
+    copies: deque[QRunnable[Any, Any]] = field(default_factory=deque)
+
+
+class RunnableCopyPool:
+    """
+    Ready copies of library runnables keyed by runnable type and name.
+
+    Copies are bound to the library instance they were made from. Once the
+    library is reloaded and another instance is acquired, stale copies are
+    dropped.
+
+    Args:
+        size: Number of ready copies kept per runnable. Pooling is disabled
+            if 0, every acquire copies the runnable.
+        schedule_refill: Schedules execution of the passed refill callable
+            at a time no runnable is executed.
+        resolve_current: Returns the instance of the runnable (by type and
+            name) in the current library. Runnables captured before a
+            library reload are replaced by their current instances on
+            acquire. The passed runnable is used if None is returned.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        schedule_refill: Callable[[Callable[[], None]], None],
+        resolve_current: (
+            Callable[[RunnableType, str], QRunnable[Any, Any] | None] | None
+        ) = None,
+    ) -> None:
+        self._size = size
+        self._schedule_refill = schedule_refill
+        self._resolve_current = resolve_current
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[RunnableType, str], _PoolEntry] = {}
+        self._refill_scheduled = False
+        self._hits = 0
+        self._misses = 0
+        self._copies_made = 0
+        self._copy_time_total = 0.0
+        self._copy_time_max = 0.0
+
+    def acquire(self, kind: RunnableType, source: RunnableT) -> RunnableT:
+        """
+        Copy of the library runnable, taken from the pool if it's ready.
+
+        Must be called when no runnable is executed (e.g. by the job
+        executor right before the run). If the library was reloaded since
+        `source` was captured, its current instance is copied instead.
+        """
+        if self._resolve_current is not None:
+            current = self._resolve_current(kind, source.name)
+            if current is not None:
+                source = cast(RunnableT, current)
+        key = (kind, source.name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.source is not source:
+                entry = _PoolEntry(source)
+                self._entries[key] = entry
+            ready = entry.copies.popleft() if entry.copies else None
+            if ready is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+        if ready is None:
+            ready = self._make_copy(source)
+        self._request_refill()
+        return cast(RunnableT, ready)
+
+    def refill(self) -> None:
+        """Build missing copies of every pooled runnable."""
+        with self._lock:
+            self._refill_scheduled = False
+            entries = list(self._entries.items())
+        for key, entry in entries:
+            while True:
+                with self._lock:
+                    if (
+                        self._entries.get(key) is not entry
+                        or len(entry.copies) >= self._size
+                    ):
+                        break
+                runnable_copy = self._make_copy(entry.source)
+                with self._lock:
+                    entry.copies.append(runnable_copy)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CopyPoolStats:
+        with self._lock:
+            served = self._hits + self._misses
+            return CopyPoolStats(
+                hits=self._hits,
+                misses=self._misses,
+                hit_rate=self._hits / served if served else None,
+                copies_made=self._copies_made,
+                copy_time_total=self._copy_time_total,
+                copy_time_max=self._copy_time_max,
+                pooled={
+                    f"{kind.value}:{name}": len(entry.copies)
+                    for (kind, name), entry in self._entries.items()
+                },
+            )
+
+    def _make_copy(self, source: RunnableT) -> RunnableT:
+        started = time.perf_counter()
+        runnable_copy = copy(source)
+        duration = time.perf_counter() - started
+        with self._lock:
+            self._copies_made += 1
+            self._copy_time_total += duration
+            self._copy_time_max = max(self._copy_time_max, duration)
+        return runnable_copy
+
+    def _request_refill(self) -> None:
+        if self._size == 0:
+            return
+        with self._lock:
+            if self._refill_scheduled:
+                return
+            self._refill_scheduled = True
+        self._schedule_refill(self.refill)
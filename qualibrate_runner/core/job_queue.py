@@ -0,0 +1,242 @@
+"""
+FIFO execution queue for submitted nodes and workflows.
+
+Submissions are no longer rejected while another item is running. Instead
+each submission becomes a Job that is appended to the queue and executed by
+a single executor thread. The executor drains the queue back-to-back, so the
+next job starts the instant the previous run_node()/run_workflow() returns.
+
+Only one job is executed at a time because calibrations share the same
+quantum hardware and the global State.
+
+Housekeeping tasks that must not overlap with a run (e.g. preparing copies
+of library runnables) can be scheduled with `run_when_idle`. They are
+executed by the same thread between jobs, queued jobs always go first.
+"""
+
+import logging
+import threading
+import traceback
+from collections import OrderedDict, deque
+from collections.abc import Callable, Mapping
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+from qualibrate_runner.core.metrics import job_queue_wait, run_duration
+from qualibrate_runner.core.models.common import RunError
+from qualibrate_runner.core.models.enums import JobStatusEnum, RunnableType
+from qualibrate_runner.core.models.job import Job
+
+__all__ = ["JobQueue", "JobTarget"]
+
+JobTarget = Callable[[], None]
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """
+    Thread-safe FIFO queue of jobs drained by a single executor thread.
+
+    Args:
+        max_finished_jobs: Number of completed (finished, failed or
+            cancelled) jobs kept for inspection. The oldest completed jobs
+            are forgotten first.
+    """
+
+    def __init__(self, max_finished_jobs: int = 100) -> None:
+        self._max_finished_jobs = max_finished_jobs
+        self._condition = threading.Condition()
+        self._pending: deque[str] = deque()
+        self._targets: dict[str, JobTarget] = {}
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._completed: deque[str] = deque()
+        self._active_job_id: str | None = None
+        self._idle_tasks: deque[Callable[[], None]] = deque()
+        self._executor: threading.Thread | None = None
+        self._stopping = False
+
+    def start(self) -> None:
+        """Start the executor thread if it isn't running yet."""
+        with self._condition:
+            if self._executor is not None and self._executor.is_alive():
+                return
+            self._stopping = False
+            self._executor = threading.Thread(
+                target=self._run_forever,
+                name="qualibrate-runner-job-executor",
+                daemon=True,
+            )
+            self._executor.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop the executor thread.
+
+        The currently running job isn't interrupted; the executor exits once
+        it is completed. Queued jobs are kept and will be executed if the
+        queue is started again.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            executor = self._executor
+        if executor is not None and executor is not threading.current_thread():
+            executor.join(timeout)
+
+    def submit(
+        self,
+        name: str,
+        runnable_type: RunnableType,
+        passed_parameters: Mapping[str, Any],
+        target: JobTarget,
+    ) -> Job:
+        """
+        Append a job to the end of the queue.
+
+        Args:
+            name: Name of the submitted node or workflow.
+            runnable_type: Type of the submitted runnable.
+            passed_parameters: Parameters passed by user. Stored only for
+                reporting purposes, the target should already capture them.
+            target: Callable executing the job.
+
+        Returns:
+            Copy of the created job.
+        """
+        job = Job(
+            id=uuid4().hex,
+            name=name,
+            runnable_type=runnable_type,
+            passed_parameters=passed_parameters,
+            submitted_at=datetime.now().astimezone(),
+        )
+        with self._condition:
+            self._jobs[job.id] = job
+            self._targets[job.id] = target
+            self._pending.append(job.id)
+            self._condition.notify_all()
+            return job.model_copy()
+
+    def run_when_idle(self, task: Callable[[], None]) -> None:
+        """
+        Schedule a task executed by the executor thread once no job is
+        running or queued. Exceptions raised by the task are logged.
+        """
+        with self._condition:
+            self._idle_tasks.append(task)
+            self._condition.notify_all()
+
+    def cancel(self, job_id: str) -> Job:
+        """
+        Cancel a queued job.
+
+        Raises:
+            KeyError: If there is no job with such id.
+            ValueError: If the job isn't queued anymore.
+        """
+        with self._condition:
+            job = self._jobs[job_id]
+            if job.status != JobStatusEnum.QUEUED:
+                raise ValueError(
+                    f"Can't cancel job with status {job.status.value}"
+                )
+            self._pending.remove(job_id)
+            self._targets.pop(job_id, None)
+            job.status = JobStatusEnum.CANCELLED
+            job.completed_at = datetime.now().astimezone()
+            self._mark_completed(job_id)
+            return job.model_copy()
+
+    def get(self, job_id: str) -> Job | None:
+        with self._condition:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job is not None else None
+
+    def list_jobs(self, status: JobStatusEnum | None = None) -> list[Job]:
+        """Jobs in submission order, optionally filtered by status."""
+        with self._condition:
+            return [
+                job.model_copy()
+                for job in self._jobs.values()
+                if status is None or job.status == status
+            ]
+
+    @property
+    def active_job(self) -> Job | None:
+        with self._condition:
+            if self._active_job_id is None:
+                return None
+            return self._jobs[self._active_job_id].model_copy()
+
+    @property
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def _mark_completed(self, job_id: str) -> None:
+        self._completed.append(job_id)
+        while len(self._completed) > self._max_finished_jobs:
+            self._jobs.pop(self._completed.popleft(), None)
+
+    def _next_job(self) -> tuple[Job, JobTarget] | None:
+        while True:
+            with self._condition:
+                while (
+                    not self._pending
+                    and not self._idle_tasks
+                    and not self._stopping
+                ):
+                    self._condition.wait()
+                if self._stopping:
+                    return None
+                if self._pending:
+                    job_id = self._pending.popleft()
+                    job = self._jobs[job_id]
+                    job.status = JobStatusEnum.RUNNING
+                    job.started_at = datetime.now().astimezone()
+                    self._active_job_id = job_id
+                    job_queue_wait.observe(
+                        (job.started_at - job.submitted_at).total_seconds(),
+                        job.runnable_type.value,
+                    )
+                    return job, self._targets.pop(job_id)
+                task = self._idle_tasks.popleft()
+            try:
+                task()
+            except Exception:
+                logger.exception("Idle task of job queue failed")
+
+    def _run_forever(self) -> None:
+        while (next_job := self._next_job()) is not None:
+            job, target = next_job
+            run_error = None
+            try:
+                target()
+            except Exception as ex:
+                # Run functions already store error in the State, so only
+                # keep the short summary here.
+                logger.exception(f"Job {job.name} ({job.id}) failed")
+                run_error = RunError(
+                    error_class=ex.__class__.__name__,
+                    message=str(ex),
+                    traceback=traceback.format_tb(ex.__traceback__),
+                )
+            with self._condition:
+                job.status = (
+                    JobStatusEnum.ERROR
+                    if run_error is not None
+                    else JobStatusEnum.FINISHED
+                )
+                job.error = run_error
+                job.completed_at = datetime.now().astimezone()
+                self._active_job_id = None
+                self._mark_completed(job.id)
+            if job.started_at is not None:
+                run_duration.observe(
+                    (job.completed_at - job.started_at).total_seconds(),
+                    job.runnable_type.value,
+                    job.name,
+                    job.status.value,
+                )
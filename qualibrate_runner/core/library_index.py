@@ -0,0 +1,231 @@
+"""
+Persisted metadata index of the calibration library.
+
+Loading the library imports every node and graph script of the library
+folder, which can take tens of seconds for big libraries. The index stores
+serialized payloads of every runnable (name, description, parameters schema,
+graph structure) together with the state of the file it was read from, so
+the payloads can be served without importing anything while files are
+unchanged.
+
+A file is unchanged if its modification time and size are the same as
+indexed. Otherwise its SHA-256 hash is compared, so touching or copying the
+library folder doesn't invalidate the index.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+__all__ = ["LibraryFileKind", "LibraryFileEntry", "LibraryIndex"]
+
+logger = logging.getLogger(__name__)
+
+index_version = 1
+
+
+class LibraryFileKind(Enum):
+    """Kind of a python file of the library folder."""
+
+    NODE = "node"
+    GRAPH = "graph"
+    OTHER = "other"
+
+
+@dataclass
+class LibraryFileEntry:
+    """
+    Indexed library file.
+
+    Args:
+        mtime: Modification time of the file when it was indexed.
+        size: Size of the file when it was indexed.
+        sha256: Hash of the file content.
+        kind: Whether file defines a node, a graph or nothing.
+        items: Payloads of runnables defined in the file keyed by runnable
+            name and payload variant.
+    """
+
+    mtime: float
+    size: int
+    sha256: str
+    kind: LibraryFileKind
+    items: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "kind": self.kind.value}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LibraryFileEntry":
+        return cls(
+            mtime=float(data["mtime"]),
+            size=int(data["size"]),
+            sha256=str(data["sha256"]),
+            kind=LibraryFileKind(data["kind"]),
+            items=dict(data["items"]),
+        )
+
+
+def file_sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class LibraryIndex:
+    """
+    Index of library files persisted to a JSON file.
+
+    Files are keyed by their name (the library folder isn't scanned
+    recursively). The index is only valid for the library folder it was
+    built for, index of another folder is discarded on load.
+
+    Args:
+        index_path: Path to the index file. None keeps index in memory only.
+        library_folder: Folder of the calibration library.
+    """
+
+    def __init__(self, index_path: Path | None, library_folder: Path) -> None:
+        self._index_path = index_path
+        self._library_folder = library_folder
+        self._entries: dict[str, LibraryFileEntry] = {}
+        self._graphs_fingerprint: str | None = None
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self._index_path is None or not self._index_path.is_file():
+            return
+        try:
+            data = json.loads(self._index_path.read_text())
+            if data.get("version") != index_version or data.get(
+                "library_folder"
+            ) != str(self._library_folder):
+                return
+            self._entries = {
+                name: LibraryFileEntry.from_dict(entry)
+                for name, entry in data["files"].items()
+            }
+            self._graphs_fingerprint = data.get("graphs_fingerprint")
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Can't read library index {self._index_path}")
+            self._entries = {}
+            self._graphs_fingerprint = None
+
+    def save(self) -> None:
+        """Write the index if it was changed."""
+        if self._index_path is None or not self._dirty:
+            return
+        data = {
+            "version": index_version,
+            "library_folder": str(self._library_folder),
+            "graphs_fingerprint": self._graphs_fingerprint,
+            "files": {
+                name: entry.to_dict() for name, entry in self._entries.items()
+            },
+        }
+        tmp_path = self._index_path.with_suffix(".tmp")
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data))
+            tmp_path.replace(self._index_path)
+        except OSError:
+            logger.warning(f"Can't write library index {self._index_path}")
+            return
+        self._dirty = False
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._graphs_fingerprint = None
+        self._dirty = True
+
+    def is_changed(self, path: Path, stat: os.stat_result) -> bool:
+        """Whether the file differs from the indexed one."""
+        entry = self._entries.get(path.name)
+        if entry is None:
+            return True
+        if entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+            return False
+        if entry.size != stat.st_size or entry.sha256 != file_sha256(path):
+            return True
+        # Only touched, keep entry and skip hashing next time
+        entry.mtime = stat.st_mtime
+        self._dirty = True
+        return False
+
+    def set_entry(
+        self,
+        path: Path,
+        kind: LibraryFileKind,
+        items: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        stat = path.stat()
+        self._entries[path.name] = LibraryFileEntry(
+            mtime=stat.st_mtime,
+            size=stat.st_size,
+            sha256=file_sha256(path),
+            kind=kind,
+            items=items or {},
+        )
+        self._dirty = True
+
+    def retain(self, names: set[str]) -> None:
+        """Remove entries of files missing in `names`."""
+        for name in set(self._entries) - names:
+            del self._entries[name]
+            self._dirty = True
+
+    def file_names(self, kind: LibraryFileKind | None = None) -> set[str]:
+        """Names of indexed files (of the kind if specified)."""
+        return {
+            name
+            for name, entry in self._entries.items()
+            if kind is None or entry.kind == kind
+        }
+
+    def has_kind(self, kind: LibraryFileKind) -> bool:
+        return any(entry.kind == kind for entry in self._entries.values())
+
+    def entry(self, name: str) -> LibraryFileEntry | None:
+        return self._entries.get(name)
+
+    def runnables(
+        self, kind: LibraryFileKind
+    ) -> dict[str, tuple[str, dict[str, Any]]]:
+        """
+        All indexed runnables of the kind.
+
+        Files are processed in name order, so a runnable defined in several
+        files is taken from the last one like the library scan does.
+
+        Returns:
+            Name of the defining file and payload variants keyed by runnable
+            name.
+        """
+        return {
+            name: (file_name, payloads)
+            for file_name, entry in sorted(self._entries.items())
+            if entry.kind == kind
+            for name, payloads in entry.items.items()
+        }
+
+    def nodes_fingerprint(self) -> str:
+        """Hash of contents of all node files."""
+        digest = hashlib.sha256()
+        for name, entry in sorted(self._entries.items()):
+            if entry.kind == LibraryFileKind.NODE:
+                digest.update(f"{name}:{entry.sha256};".encode())
+        return digest.hexdigest()
+
+    @property
+    def graphs_fingerprint(self) -> str | None:
+        """Nodes fingerprint at the time graphs were indexed."""
+        return self._graphs_fingerprint
+
+    @graphs_fingerprint.setter
+    def graphs_fingerprint(self, value: str | None) -> None:
+        self._graphs_fingerprint = value
+        self._dirty = True
@@ -0,0 +1,639 @@
+"""
+Calibration library loaded on demand.
+
+The library used to be loaded (every node and graph script imported) before
+the first request could be answered. `LibraryManager` serves runnables
+payloads from the persisted `LibraryIndex` instead and imports scripts only
+when they are needed:
+
+- a node file is imported alone when it's new or changed, or when its node
+  is submitted;
+- the whole library is loaded when a graph is needed (graphs reference
+  library nodes) and indexed graph payloads are outdated, or when a graph
+  is submitted.
+
+Rescan reloads only added, modified and removed files.
+
+Payloads of node files indexed while the whole library isn't loaded (cold
+start, rescan, settings refresh) are extracted in parallel worker processes.
+Node instances can't be passed between processes, so the whole library load
+and reloads of the loaded library import files in the API process.
+
+Readers never wait for a rescan. Everything they need is published as an
+immutable `LibraryGeneration`, which is replaced by a single reference
+assignment once the next generation is built. Writers (rescan, library
+load) are serialized by a lock readers don't take.
+"""
+
+import copy
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, cast
+
+from qualibrate import QualibrationGraph, QualibrationNode
+from qualibrate.q_runnnable import (
+    file_is_calibration_graph_instance,
+    file_is_calibration_node_instance,
+)
+from qualibrate.runnables.runnable_collection import RunnableCollection
+from qualibrate_config.models import CalibrationLibraryConfig
+
+from qualibrate_runner.core.library_index import LibraryFileKind, LibraryIndex
+from qualibrate_runner.core.library_scan import (
+    GRAPH_CYTOSCAPE_VARIANT,
+    GRAPH_VARIANT,
+    NODE_DETAILS_VARIANT,
+    NODE_LIST_VARIANT,
+    FileScanResult,
+    extract_node_files,
+    graph_payloads,
+    node_payloads,
+    scan_graph_file,
+    scan_node_file,
+)
+from qualibrate_runner.core.metrics import library_scan_duration
+from qualibrate_runner.core.models.library import LibraryChanges
+from qualibrate_runner.core.types import QGraphType, QLibraryType, QNodeType
+
+__all__ = ["LibraryGeneration", "LibraryManager"]
+
+logger = logging.getLogger(__name__)
+
+changes_history_size = 100
+# Fewer changed node files are imported in the API process
+min_parallel_files = 4
+
+_empty: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class LibraryGeneration:
+    """
+    Immutable snapshot of the library served to readers.
+
+    Args:
+        number: Sequence number of the generation.
+        library: Loaded library. None if only the index is available.
+        node_payloads: Payload variants of nodes keyed by node name.
+        node_files: Names of files defining nodes keyed by node name.
+        graph_payloads: Payload variants of graphs keyed by graph name.
+            None if graphs have to be loaded to get their payloads.
+        nodes: Node instances of the loaded library.
+        graphs: Graph instances of the loaded library.
+    """
+
+    number: int
+    library: QLibraryType | None
+    node_payloads: Mapping[str, Mapping[str, Any]]
+    node_files: Mapping[str, str]
+    graph_payloads: Mapping[str, Mapping[str, Any]] | None
+    nodes: Mapping[str, QNodeType]
+    graphs: Mapping[str, QGraphType]
+
+    def payloads(self, variant: str) -> dict[str, Any]:
+        return {
+            name: payloads[variant]
+            for name, payloads in self.node_payloads.items()
+        }
+
+
+@dataclass
+class _FileChanges:
+    added: list[Path] = field(default_factory=list)
+    modified: list[Path] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> list[Path]:
+        return [*self.added, *self.modified]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+
+class LibraryManager:
+    """
+    Calibration library with lazily imported runnables.
+
+    Args:
+        config: Calibration library configuration.
+        index_path: Path of the persisted library index. None keeps the
+            index in memory only.
+        on_change: Called with the report of every reload which changed
+            the library.
+        scan_workers: Number of worker processes extracting payloads of
+            node files in parallel when many files have to be indexed.
+            Files are imported in the API process if less than 2.
+    """
+
+    def __init__(
+        self,
+        config: CalibrationLibraryConfig,
+        index_path: Path | None,
+        on_change: Callable[[LibraryChanges], None] | None = None,
+        scan_workers: int = 0,
+    ) -> None:
+        self._config = config
+        self._folder = config.folder
+        self._index = LibraryIndex(index_path, config.folder)
+        self._generation: LibraryGeneration | None = None
+        # Nodes imported one by one while the library isn't loaded
+        self._nodes: dict[str, QNodeType] = {}
+        self._write_lock = threading.RLock()
+        self._import_lock = threading.Lock()
+        self._revalidate_lock = threading.Lock()
+        self._revalidate_pending = False
+        self._revalidating = False
+        self._on_change = on_change
+        self._scan_workers = scan_workers
+        self._changes: deque[LibraryChanges] = deque(
+            maxlen=changes_history_size
+        )
+
+    @property
+    def generation(self) -> LibraryGeneration:
+        """Current generation. The first one is built on the first call."""
+        generation = self._generation
+        if generation is not None:
+            return generation
+        with self._write_lock:
+            if self._generation is None:
+                self._sync()
+            return cast(LibraryGeneration, self._generation)
+
+    @property
+    def is_loaded(self) -> bool:
+        generation = self._generation
+        return generation is not None and generation.library is not None
+
+    @property
+    def is_indexed(self) -> bool:
+        """Whether library files were indexed (or loaded) at least once."""
+        return self._generation is not None or bool(self._index.file_names())
+
+    @property
+    def changes(self) -> list[LibraryChanges]:
+        """Recent reloads which changed the library, newest first."""
+        return list(reversed(self._changes))
+
+    def get_library(self) -> QLibraryType:
+        """Library with all nodes and graphs. Loaded on the first call."""
+        generation = self._generation
+        if generation is not None and generation.library is not None:
+            return generation.library
+        with self._write_lock:
+            generation = self._generation
+            library = None if generation is None else generation.library
+            if library is None:
+                with library_scan_duration.time("load"):
+                    library = cast(
+                        QLibraryType, self._config.resolver(self._folder)
+                    )
+                    self._index_library(library)
+                self._nodes.clear()
+                self._publish(library)
+            return library
+
+    def rescan(self) -> None:
+        """Reload added, modified and removed library files."""
+        self.reload_changed()
+
+    def revalidate(self) -> None:
+        """
+        Reload changed files in background.
+
+        Readers keep getting the current generation until the next one is
+        published. Requests made while reloading are coalesced into a single
+        extra reload.
+        """
+        with self._revalidate_lock:
+            self._revalidate_pending = True
+            if self._revalidating:
+                return
+            self._revalidating = True
+        threading.Thread(
+            target=self._revalidate_loop,
+            name="library-revalidate",
+            daemon=True,
+        ).start()
+
+    def _revalidate_loop(self) -> None:
+        while True:
+            with self._revalidate_lock:
+                if not self._revalidate_pending:
+                    self._revalidating = False
+                    return
+                self._revalidate_pending = False
+            try:
+                self.reload_changed()
+            except Exception as ex:
+                logger.exception("Library revalidation failed", exc_info=ex)
+
+    def reload_changed(self) -> LibraryChanges | None:
+        """
+        Reload added, modified and removed node and graph files.
+
+        If the library is loaded, the next generation gets a copy of it with
+        rebuilt node and graph collections, so runnables of unchanged files
+        aren't imported again and the published library isn't changed.
+        Graphs hold copies of library nodes, so all graphs are reloaded if
+        any node was changed. Otherwise only the index is updated and changed
+        node files are imported one by one.
+
+        Returns:
+            Report of the reload. None if nothing was changed.
+        """
+        with self._write_lock:
+            library = self.generation.library
+            if library is None:
+                return self._sync()
+            return self._reload_loaded(library)
+
+    def _publish(self, library: QLibraryType | None) -> None:
+        """Build the next generation from the index and make it current."""
+        runnables = self._index.runnables(LibraryFileKind.NODE)
+        graph_payloads = None
+        if self._graphs_indexed():
+            graph_payloads = MappingProxyType(
+                {
+                    name: payloads
+                    for name, (_, payloads) in self._index.runnables(
+                        LibraryFileKind.GRAPH
+                    ).items()
+                }
+            )
+        previous = self._generation
+        self._generation = LibraryGeneration(
+            number=0 if previous is None else previous.number + 1,
+            library=library,
+            node_payloads=MappingProxyType(
+                {name: payloads for name, (_, payloads) in runnables.items()}
+            ),
+            node_files=MappingProxyType(
+                {name: file_name for name, (file_name, _) in runnables.items()}
+            ),
+            graph_payloads=graph_payloads,
+            nodes=(
+                _empty
+                if library is None
+                else MappingProxyType(dict(library.nodes.items_nocopy()))
+            ),
+            graphs=(
+                _empty
+                if library is None
+                else MappingProxyType(dict(library.graphs.items_nocopy()))
+            ),
+        )
+
+    def _library_files(self) -> list[Path]:
+        return sorted(
+            path
+            for path in self._folder.iterdir()
+            if path.suffix == ".py" and path.is_file()
+        )
+
+    def _index_library(self, library: QLibraryType) -> None:
+        items: dict[str, tuple[LibraryFileKind, dict[str, Any]]] = {}
+        for name, node in library.nodes.items_nocopy():
+            if node.filepath is not None:
+                _, file_items = items.setdefault(
+                    node.filepath.name, (LibraryFileKind.NODE, {})
+                )
+                file_items[name] = node_payloads(node)
+        for name, graph in library.graphs.items_nocopy():
+            if graph.filepath is not None:
+                _, file_items = items.setdefault(
+                    graph.filepath.name, (LibraryFileKind.GRAPH, {})
+                )
+                file_items[name] = graph_payloads(graph)
+        files = self._library_files()
+        self._index.retain({path.name for path in files})
+        for path in files:
+            kind, file_items = items.get(path.name, (LibraryFileKind.OTHER, {}))
+            self._index.set_entry(path, kind, file_items)
+        self._index.graphs_fingerprint = self._index.nodes_fingerprint()
+        self._index.save()
+
+    @staticmethod
+    def _file_kind(path: Path) -> LibraryFileKind:
+        if file_is_calibration_graph_instance(path, QualibrationGraph.__name__):
+            return LibraryFileKind.GRAPH
+        if file_is_calibration_node_instance(path, QualibrationNode.__name__):
+            return LibraryFileKind.NODE
+        return LibraryFileKind.OTHER
+
+    def _detect_changes(self) -> _FileChanges:
+        files = self._library_files()
+        changes = _FileChanges(
+            removed=sorted(
+                self._index.file_names() - {path.name for path in files}
+            )
+        )
+        for path in files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if not self._index.is_changed(path, stat):
+                continue
+            if self._index.entry(path.name) is None:
+                changes.added.append(path)
+            else:
+                changes.modified.append(path)
+        return changes
+
+    def _indexed_names(
+        self, file_names: Iterable[str]
+    ) -> dict[LibraryFileKind, set[str]]:
+        names: dict[LibraryFileKind, set[str]] = defaultdict(set)
+        for file_name in file_names:
+            entry = self._index.entry(file_name)
+            if entry is not None:
+                names[entry.kind].update(entry.items)
+        return names
+
+    def _record(
+        self,
+        started_at: datetime,
+        started: float,
+        changes: _FileChanges,
+        nodes: Iterable[str],
+        graphs: Iterable[str],
+        removed: Iterable[str],
+        import_times: dict[str, float],
+    ) -> LibraryChanges:
+        report = LibraryChanges(
+            started_at=started_at,
+            duration=time.perf_counter() - started,
+            added_files=[path.name for path in changes.added],
+            modified_files=[path.name for path in changes.modified],
+            removed_files=changes.removed,
+            nodes=sorted(nodes),
+            graphs=sorted(graphs),
+            removed=sorted(removed),
+            import_times=import_times,
+        )
+        library_scan_duration.observe(report.duration, "reload")
+        self._changes.append(report)
+        if self._on_change is not None:
+            self._on_change(report)
+        return report
+
+    def _sync(self) -> LibraryChanges | None:
+        """Update index entries of new, changed and removed files."""
+        started_at, started = datetime.now().astimezone(), time.perf_counter()
+        changes = self._detect_changes()
+        if not changes:
+            self._index.save()
+            if self._generation is None:
+                self._publish(None)
+            return None
+        old_names = self._indexed_names(
+            [*changes.removed, *(path.name for path in changes.modified)]
+        )
+        self._index.retain(self._index.file_names() - set(changes.removed))
+        node_paths: list[Path] = []
+        graph_files = False
+        for path in changes.changed:
+            kind = self._file_kind(path)
+            if kind == LibraryFileKind.NODE:
+                node_paths.append(path)
+            elif kind == LibraryFileKind.GRAPH:
+                # Graphs can be only indexed with the loaded library
+                self._index.set_entry(path, LibraryFileKind.GRAPH)
+                graph_files = True
+            else:
+                self._index.set_entry(path, LibraryFileKind.OTHER)
+        nodes: dict[str, QNodeType] = {}
+        results = None
+        if self._scan_workers > 1 and len(node_paths) >= min_parallel_files:
+            results = extract_node_files(node_paths, self._scan_workers)
+        if results is None:
+            results = []
+            for path in node_paths:
+                file_nodes, duration = scan_node_file(path)
+                nodes.update(file_nodes)
+                results.append(
+                    FileScanResult(
+                        path=path,
+                        items={
+                            name: node_payloads(node)
+                            for name, node in file_nodes.items()
+                        },
+                        duration=duration,
+                    )
+                )
+        node_names: set[str] = set()
+        for result in results:
+            self._index.set_entry(
+                result.path, LibraryFileKind.NODE, result.items
+            )
+            node_names.update(result.items)
+        if graph_files or old_names[LibraryFileKind.GRAPH]:
+            self._index.graphs_fingerprint = None
+        self._index.save()
+        with self._import_lock:
+            for name in old_names[LibraryFileKind.NODE]:
+                self._nodes.pop(name, None)
+            self._nodes.update(nodes)
+        self._publish(None)
+        removed = (
+            old_names[LibraryFileKind.NODE] | old_names[LibraryFileKind.GRAPH]
+        ) - node_names
+        return self._record(
+            started_at,
+            started,
+            changes,
+            node_names,
+            [],
+            removed,
+            {result.path.name: result.duration for result in results},
+        )
+
+    def _reload_loaded(self, library: QLibraryType) -> LibraryChanges | None:
+        started_at, started = datetime.now().astimezone(), time.perf_counter()
+        changes = self._detect_changes()
+        if not changes:
+            self._index.save()
+            return None
+        old_names = self._indexed_names(
+            [*changes.removed, *(path.name for path in changes.modified)]
+        )
+        kinds = {path: self._file_kind(path) for path in changes.changed}
+        entries: dict[Path, tuple[LibraryFileKind, dict[str, Any]]] = {}
+        import_times: dict[str, float] = {}
+        nodes: dict[str, QNodeType] = {}
+        for path, kind in kinds.items():
+            if kind == LibraryFileKind.NODE:
+                file_nodes, import_times[path.name] = scan_node_file(path)
+                nodes.update(file_nodes)
+                entries[path] = (
+                    kind,
+                    {
+                        name: node_payloads(node)
+                        for name, node in file_nodes.items()
+                    },
+                )
+            elif kind == LibraryFileKind.OTHER:
+                entries[path] = (kind, {})
+        removed_graphs = old_names[LibraryFileKind.GRAPH]
+        graph_files = [
+            path
+            for path, kind in kinds.items()
+            if kind == LibraryFileKind.GRAPH
+        ]
+        # The next generation is built on a copy, so readers of the published
+        # library never see partially reloaded collections
+        next_library = library
+        if nodes or old_names[LibraryFileKind.NODE]:
+            new_nodes = {
+                name: node
+                for name, node in library.nodes.items_nocopy()
+                if name not in old_names[LibraryFileKind.NODE]
+            }
+            new_nodes.update(nodes)
+            next_library = copy.copy(library)
+            next_library.nodes = RunnableCollection(new_nodes)
+            removed_graphs = set(library.graphs)
+            graph_files = sorted(
+                {
+                    *graph_files,
+                    *(
+                        self._folder / file_name
+                        for file_name in self._index.file_names(
+                            LibraryFileKind.GRAPH
+                        )
+                        - set(changes.removed)
+                    ),
+                }
+            )
+        graphs = self._scan_graphs(
+            library, next_library, graph_files, entries, import_times
+        )
+        if graphs or removed_graphs:
+            new_graphs = {
+                name: graph
+                for name, graph in library.graphs.items_nocopy()
+                if name not in removed_graphs
+            }
+            new_graphs.update(graphs)
+            if next_library is library:
+                next_library = copy.copy(library)
+            next_library.graphs = RunnableCollection(new_graphs)
+        self._index.retain(self._index.file_names() - set(changes.removed))
+        for path, (kind, items) in entries.items():
+            self._index.set_entry(path, kind, items)
+        self._index.graphs_fingerprint = self._index.nodes_fingerprint()
+        self._index.save()
+        self._publish(next_library)
+        library_class = type(library)
+        if library_class.active_library is library:
+            # Later graph imports resolve nodes of the published generation
+            library_class.active_library = next_library
+        removed = (old_names[LibraryFileKind.NODE] - set(nodes)) | (
+            removed_graphs - set(graphs)
+        )
+        return self._record(
+            started_at, started, changes, nodes, graphs, removed, import_times
+        )
+
+    @staticmethod
+    def _scan_graphs(
+        library: QLibraryType,
+        next_library: QLibraryType,
+        graph_files: Iterable[Path],
+        entries: dict[Path, tuple[LibraryFileKind, dict[str, Any]]],
+        import_times: dict[str, float],
+    ) -> dict[str, QGraphType]:
+        """
+        Import graph files. Graph files take nodes from the active library,
+        so the next library is active only while they are imported.
+        """
+        graphs: dict[str, QGraphType] = {}
+        library_class = type(library)
+        active = library_class.active_library
+        library_class.active_library = next_library
+        try:
+            for path in graph_files:
+                file_graphs, import_times[path.name] = scan_graph_file(path)
+                graphs.update(file_graphs)
+                entries[path] = (
+                    LibraryFileKind.GRAPH,
+                    {
+                        name: graph_payloads(graph)
+                        for name, graph in file_graphs.items()
+                    },
+                )
+        finally:
+            library_class.active_library = active
+        return graphs
+
+    def _graphs_indexed(self) -> bool:
+        if not self._index.has_kind(LibraryFileKind.GRAPH):
+            return True
+        return self._index.graphs_fingerprint == self._index.nodes_fingerprint()
+
+    def get_node(self, name: str) -> QNodeType | None:
+        """Node instance (not a copy). Imports only the node file if needed."""
+        generation = self.generation
+        if generation.library is not None:
+            return generation.nodes.get(name)
+        node = self._nodes.get(name)
+        if node is not None:
+            return node
+        file_name = generation.node_files.get(name)
+        if file_name is None:
+            return None
+        with self._import_lock:
+            if name not in self._nodes:
+                file_nodes, _ = scan_node_file(self._folder / file_name)
+                self._nodes.update(file_nodes)
+            return self._nodes.get(name)
+
+    def get_graph(self, name: str) -> QGraphType | None:
+        """Graph instance (not a copy). Loads the library if needed."""
+        self.get_library()
+        return self.generation.graphs.get(name)
+
+    def nodes_payload(self) -> dict[str, Any]:
+        """Serialized nodes (with targets) keyed by name."""
+        return self.generation.payloads(NODE_LIST_VARIANT)
+
+    def node_payload(self, name: str) -> Mapping[str, Any] | None:
+        """Serialized node (without targets). None if node is unknown."""
+        payloads = self.generation.node_payloads.get(name)
+        if payloads is None:
+            return None
+        return cast(Mapping[str, Any], payloads[NODE_DETAILS_VARIANT])
+
+    def _graph_payloads(self) -> Mapping[str, Mapping[str, Any]]:
+        graph_payloads = self.generation.graph_payloads
+        if graph_payloads is None:
+            self.get_library()
+            graph_payloads = self.generation.graph_payloads
+        return graph_payloads or _empty
+
+    def graphs_payload(self, cytoscape: bool = False) -> dict[str, Any]:
+        """Serialized graphs keyed by name."""
+        variant = GRAPH_CYTOSCAPE_VARIANT if cytoscape else GRAPH_VARIANT
+        return {
+            name: payloads[variant]
+            for name, payloads in self._graph_payloads().items()
+        }
+
+    def graph_payload(
+        self, name: str, cytoscape: bool = False
+    ) -> Mapping[str, Any] | None:
+        """Serialized graph. None if graph is unknown."""
+        payloads = self._graph_payloads().get(name)
+        if payloads is None:
+            return None
+        variant = GRAPH_CYTOSCAPE_VARIANT if cytoscape else GRAPH_VARIANT
+        return cast(Mapping[str, Any], payloads[variant])
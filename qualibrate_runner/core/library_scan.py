@@ -0,0 +1,182 @@
+"""
+Extraction of runnables payloads from library files.
+
+Importing node scripts dominates the time needed to index a big library.
+Payloads (name, description, parameters schema) are plain JSON data, so they
+can be extracted in a pool of worker processes in parallel, each worker
+importing a part of the node files. Node instances stay in workers, they are
+imported in the API process only when needed.
+
+Every scanned file reports its import time, so slow nodes can be found.
+"""
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, cast
+
+from fastapi.encoders import jsonable_encoder
+from qualibrate import QualibrationGraph, QualibrationNode
+from qualibrate.models.run_mode import RunModes
+from qualibrate.q_runnnable import run_modes_ctx
+
+from qualibrate_runner.core.types import QGraphType, QNodeType
+
+__all__ = [
+    "NODE_LIST_VARIANT",
+    "NODE_DETAILS_VARIANT",
+    "GRAPH_VARIANT",
+    "GRAPH_CYTOSCAPE_VARIANT",
+    "FileScanResult",
+    "node_payloads",
+    "graph_payloads",
+    "scan_node_file",
+    "scan_graph_file",
+    "extract_node_files",
+]
+
+logger = logging.getLogger(__name__)
+
+NODE_LIST_VARIANT = "list"
+NODE_DETAILS_VARIANT = "details"
+GRAPH_VARIANT = "graph"
+GRAPH_CYTOSCAPE_VARIANT = "cytoscape"
+
+
+def node_payloads(node: QNodeType) -> dict[str, Any]:
+    return {
+        NODE_LIST_VARIANT: jsonable_encoder(
+            node.serialize(exclude_targets=False)
+        ),
+        NODE_DETAILS_VARIANT: jsonable_encoder(
+            node.serialize(exclude_targets=True)
+        ),
+    }
+
+
+def graph_payloads(graph: QGraphType) -> dict[str, Any]:
+    return {
+        GRAPH_VARIANT: jsonable_encoder(graph.serialize(cytoscape=False)),
+        GRAPH_CYTOSCAPE_VARIANT: jsonable_encoder(
+            graph.serialize(cytoscape=True)
+        ),
+    }
+
+
+@dataclass
+class FileScanResult:
+    """
+    Payloads extracted from a single node file.
+
+    Args:
+        path: Scanned file.
+        items: Payload variants of nodes defined in the file keyed by name.
+        duration: Time in seconds spent importing the file.
+        error: Description of the error raised by the file import.
+    """
+
+    path: Path
+    items: dict[str, dict[str, Any]] = field(default_factory=dict)
+    duration: float = 0.0
+    error: str | None = None
+
+
+def scan_node_file(path: Path) -> tuple[dict[str, QNodeType], float]:
+    """
+    Import node file in inspection mode.
+
+    Returns:
+        Nodes defined in the file and the import time in seconds.
+    """
+    nodes: dict[str, Any] = {}
+    started = time.perf_counter()
+    token = run_modes_ctx.set(RunModes(inspection=True))
+    try:
+        QualibrationNode.scan_node_file(path, nodes)
+    except Exception as ex:
+        logger.warning(
+            f"An error occurred on scanning node file {path.name}. "
+            f"Error: {type(ex)}: {ex}"
+        )
+    finally:
+        run_modes_ctx.reset(token)
+    return cast(dict[str, QNodeType], nodes), time.perf_counter() - started
+
+
+def scan_graph_file(path: Path) -> tuple[dict[str, QGraphType], float]:
+    """
+    Import graph file in inspection mode. Requires the active library.
+
+    Returns:
+        Graphs defined in the file and the import time in seconds.
+    """
+    graphs: dict[str, Any] = {}
+    started = time.perf_counter()
+    token = run_modes_ctx.set(RunModes(inspection=True))
+    try:
+        QualibrationGraph.scan_graph_file(path, graphs)
+    except Exception as ex:
+        logger.warning(
+            f"An error occurred on scanning graph file {path.name}. "
+            f"Error: {type(ex)}: {ex}"
+        )
+    finally:
+        run_modes_ctx.reset(token)
+    return cast(dict[str, QGraphType], graphs), time.perf_counter() - started
+
+
+def _extract_node_file(path: Path) -> FileScanResult:
+    """Worker process entrypoint."""
+    nodes: dict[str, Any] = {}
+    started = time.perf_counter()
+    token = run_modes_ctx.set(RunModes(inspection=True))
+    try:
+        QualibrationNode.scan_node_file(path, nodes)
+        items = {name: node_payloads(node) for name, node in nodes.items()}
+    except Exception as ex:
+        return FileScanResult(
+            path=path,
+            duration=time.perf_counter() - started,
+            error=f"{type(ex)}: {ex}",
+        )
+    finally:
+        run_modes_ctx.reset(token)
+    return FileScanResult(
+        path=path, items=items, duration=time.perf_counter() - started
+    )
+
+
+def extract_node_files(
+    paths: list[Path], workers: int
+) -> list[FileScanResult] | None:
+    """
+    Extract payloads of node files in parallel worker processes.
+
+    Args:
+        paths: Node files to scan.
+        workers: Maximal number of worker processes.
+
+    Returns:
+        Scan results in order of `paths`. None if the pool failed (e.g. a
+        worker was killed), so files have to be scanned in-process.
+    """
+    ctx = get_context("spawn")
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(paths)), mp_context=ctx
+        ) as executor:
+            results = list(executor.map(_extract_node_file, paths))
+    except (BrokenProcessPool, OSError) as ex:
+        logger.warning(f"Parallel library scan failed. Error: {ex}")
+        return None
+    for result in results:
+        if result.error is not None:
+            logger.warning(
+                f"An error occurred on scanning node file "
+                f"{result.path.name}. Error: {result.error}"
+            )
+    return results
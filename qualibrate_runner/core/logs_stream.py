@@ -0,0 +1,262 @@
+"""
+Live streaming of qualibrate log records.
+
+`/output_logs` returns stored records and has to be polled, re-reading the
+in-memory storage or log files on every call. The log stream pushes only
+new records to websocket subscribers as they are emitted. Records are taken
+from one of two sources:
+
+- the qualibrate logger of the runner process (the same records the
+  in-memory storage keeps), captured by `LogStreamHandler`;
+- the current `qualibrate.log` file, which also contains records of other
+  processes, followed by `LogFileTailer`.
+
+Every subscriber has a `LogFilter`, so only records it displays are sent.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections import deque
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from qualibrate.utils.logger_m import logger
+
+from qualibrate_runner.utils.logs_parser import parse_log_lines
+
+__all__ = ["LogFilter", "LogStreamHandler", "LogFileTailer", "LogStream"]
+
+log_filename = "qualibrate.log"
+_exception_formatter = logging.Formatter()
+
+
+def _to_json_entry(entry: dict[str, Any]) -> dict[str, Any]:
+    asctime = entry.get("asctime")
+    if isinstance(asctime, datetime):
+        entry["asctime"] = asctime.isoformat()
+    return entry
+
+
+def _record_entry(record: logging.LogRecord) -> dict[str, Any]:
+    """
+    Entry of a log record with the fields of a parsed JSON log line.
+    Timestamp has millisecond precision as in log files.
+    """
+    asctime = datetime.fromtimestamp(record.created).replace(
+        microsecond=int(record.msecs) * 1000
+    )
+    entry: dict[str, Any] = {
+        "asctime": asctime.isoformat(),
+        "name": record.name,
+        "levelname": record.levelname,
+        "message": record.getMessage(),
+    }
+    if record.exc_info:
+        entry["exc_info"] = _exception_formatter.formatException(
+            record.exc_info
+        )
+    if record.stack_info:
+        entry["stack_info"] = record.stack_info
+    return entry
+
+
+@dataclass(frozen=True)
+class LogFilter:
+    """
+    Predicate selecting log entries sent to a subscriber.
+
+    Args:
+        levelnames: Accepted level names (e.g. `INFO`). All if None.
+        name: Logger name. Records of its child loggers are accepted too.
+        contains: Substring the message has to contain.
+    """
+
+    levelnames: frozenset[str] | None = None
+    name: str | None = None
+    contains: str | None = None
+
+    def __call__(self, entry: dict[str, Any]) -> bool:
+        if (
+            self.levelnames is not None
+            and entry.get("levelname") not in self.levelnames
+        ):
+            return False
+        if self.name is not None:
+            name = entry.get("name", "")
+            if name != self.name and not name.startswith(f"{self.name}."):
+                return False
+        return self.contains is None or self.contains in str(
+            entry.get("message", "")
+        )
+
+
+class LogStreamHandler(logging.Handler):
+    """
+    Logging handler buffering records until they are drained by the stream.
+
+    Records are only buffered while the handler is enabled (i.e. there are
+    subscribers), so an idle stream costs nothing per log call.
+    """
+
+    def __init__(self, max_records: int = 10_000) -> None:
+        super().__init__()
+        self.enabled = False
+        self.on_emit: Callable[[], None] | None = None
+        self._records: deque[dict[str, Any]] = deque(maxlen=max_records)
+        self._records_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not self.enabled:
+            return
+        try:
+            entry = _record_entry(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._records_lock:
+            self._records.append(entry)
+        if self.on_emit is not None:
+            self.on_emit()
+
+    def drain(self) -> list[dict[str, Any]]:
+        """Buffered records in emission order. Buffer is cleared."""
+        with self._records_lock:
+            records = list(self._records)
+            self._records.clear()
+        return records
+
+
+class LogFileTailer:
+    """
+    Follows the current qualibrate log file.
+
+    Reading starts from the end of the file at the first call, so only new
+    records are returned. Rotation is detected by inode change: the renamed
+    file is read to its end before switching to the new current file, so no
+    records are lost. Truncated file is read from the start.
+
+    Args:
+        log_folder_getter: Returns the log folder. Called on every read, so
+            changed settings are applied.
+    """
+
+    def __init__(self, log_folder_getter: Callable[[], Path | None]) -> None:
+        self._log_folder_getter = log_folder_getter
+        self._file: BinaryIO | None = None
+        self._inode: int | None = None
+        self._remainder = b""
+        self._previous: dict[str, Any] | None = None
+
+    def reset(self) -> None:
+        """Stop following. Next read starts from the end of the file."""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._inode = None
+        self._remainder = b""
+        self._previous = None
+
+    def _open(self, path: Path, from_end: bool) -> None:
+        try:
+            self._file = open(path, "rb")  # noqa: SIM115
+        except OSError:
+            return
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        if from_end:
+            self._file.seek(0, os.SEEK_END)
+
+    def _read_available(self) -> list[dict[str, Any]]:
+        if self._file is None:
+            return []
+        lines = (self._remainder + self._file.read()).split(b"\n")
+        # Last line is incomplete until the newline is written
+        self._remainder = lines.pop()
+        entries = parse_log_lines(
+            [line.decode("utf-8", errors="replace") for line in lines if line],
+            self._previous,
+        )
+        if not entries:
+            return []
+        self._previous = entries[-1].copy()
+        return [_to_json_entry(entry) for entry in entries if entry]
+
+    def read_new(self) -> list[dict[str, Any]]:
+        """Records written since the previous call."""
+        log_folder = self._log_folder_getter()
+        if log_folder is None:
+            return []
+        path = log_folder / log_filename
+        try:
+            inode: int | None = path.stat().st_ino
+        except OSError:
+            inode = None
+        if self._file is None:
+            if inode is not None:
+                self._open(path, from_end=True)
+            return []
+        if inode != self._inode:
+            # Rotated: finish the renamed file and continue with the new one
+            entries = self._read_available()
+            self.reset()
+            if inode is not None:
+                self._open(path, from_end=False)
+                entries.extend(self._read_available())
+            return entries
+        if os.fstat(self._file.fileno()).st_size < self._file.tell():
+            self._file.seek(0)
+            self._remainder = b""
+        return self._read_available()
+
+
+class LogStream:
+    """
+    Sources of live log records and wake-up of the streaming task.
+
+    Args:
+        log_folder_getter: Returns the folder of qualibrate log files.
+        max_records: Maximal number of records buffered between pushes.
+    """
+
+    def __init__(
+        self,
+        log_folder_getter: Callable[[], Path | None],
+        max_records: int = 10_000,
+    ) -> None:
+        self.handler = LogStreamHandler(max_records)
+        self.tailer = LogFileTailer(log_folder_getter)
+        self._event: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Attach handler to the qualibrate logger and wake up in the loop."""
+        self._loop = loop
+        self._event = asyncio.Event()
+        self.handler.on_emit = self.notify
+        logger.addHandler(self.handler)
+
+    def close(self) -> None:
+        logger.removeHandler(self.handler)
+        self.handler.on_emit = None
+        self.tailer.reset()
+
+    def notify(self) -> None:
+        """Wake up the streaming task. Can be called from any thread."""
+        if self._loop is None or self._event is None:
+            return
+        # Loop can be already closed
+        with suppress(RuntimeError):
+            self._loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self, timeout: float) -> None:
+        """Wait for new handler records or until the file poll timeout."""
+        if self._event is None:
+            raise RuntimeError("Log stream isn't bound to an event loop")
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._event.wait(), timeout)
+        self._event.clear()
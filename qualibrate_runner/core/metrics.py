@@ -0,0 +1,262 @@
+"""
+In-process metrics exposed in the Prometheus text format.
+
+The runner is a single process, so metrics are kept in memory and rendered
+on every `/metrics` scrape. Only histograms and gauges needed by the runner
+are implemented, every metric has a fixed set of label names.
+
+Metrics of the runner are registered in the module-level `registry`.
+Gauges reading the current state (e.g. websocket subscribers) are
+registered as callbacks evaluated on scrape.
+"""
+
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Histogram",
+    "MetricsRegistry",
+    "registry",
+    "http_request_duration",
+    "ws_broadcast_duration",
+    "run_duration",
+    "job_queue_wait",
+    "library_scan_duration",
+]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = tuple[str, ...]
+GaugeCallback = Callable[[], Mapping[LabelValues, float]]
+
+latency_buckets = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+run_buckets = (1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"'
+        for name, value in zip(names, values, strict=True)
+    )
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}"
+            )
+        return tuple(str(label) for label in labels)
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Histogram(_Metric):
+    """Distribution of observed values per label values."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = latency_buckets,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: counts per bucket (non-cumulative), sum, count
+        self._values: dict[LabelValues, tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            counts, total, count = self._values.get(
+                key, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[idx] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe duration of the block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(
+                (key, (list(counts), total, count))
+                for key, (counts, total, count) in self._values.items()
+            )
+        labelnames = (*self.labelnames, "le")
+        lines = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    labelnames, (*key, _format_value(bound))
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(labelnames, (*key, "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class _CallbackGauge(_Metric):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        callback: GaugeCallback,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} "
+            f"{_format_value(value)}"
+            for key, value in sorted(self._callback().items())
+        ]
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = latency_buckets,
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._register(metric)
+        return metric
+
+    def gauge_callback(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        callback: GaugeCallback,
+    ) -> None:
+        """
+        Register gauge with values returned by `callback` on render.
+        Registered gauge of the same name is replaced.
+        """
+        metric = _CallbackGauge(name, documentation, labelnames, callback)
+        with self._lock:
+            self._metrics[name] = metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "qualibrate_runner_http_request_duration_seconds",
+    "HTTP request handling time by route template.",
+    ("method", "route", "status"),
+)
+ws_broadcast_duration = registry.histogram(
+    "qualibrate_runner_ws_broadcast_duration_seconds",
+    "Time to compute and queue a websocket broadcast.",
+    ("endpoint",),
+)
+run_duration = registry.histogram(
+    "qualibrate_runner_run_duration_seconds",
+    "Duration of executed nodes and graphs.",
+    ("runnable_type", "name", "status"),
+    buckets=run_buckets,
+)
+job_queue_wait = registry.histogram(
+    "qualibrate_runner_job_queue_wait_seconds",
+    "Time jobs spent in the queue before execution.",
+    ("runnable_type",),
+    buckets=(*latency_buckets, *run_buckets[3:]),
+)
+library_scan_duration = registry.histogram(
+    "qualibrate_runner_library_scan_duration_seconds",
+    "Duration of library loads and reloads of changed files.",
+    ("operation",),
+    buckets=(0.01, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
@@ -0,0 +1,44 @@
+"""
+Statistics of the pool of pre-built runnable copies.
+
+Every run needs its own copy of the library node or graph. Copies are built
+in advance, so a submission can take a ready one (a hit) instead of copying
+the runnable before the run (a miss).
+"""
+
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+__all__ = ["CopyPoolStats"]
+
+
+class CopyPoolStats(BaseModel):
+    """Counters of the runnable copy pool."""
+
+    hits: Annotated[
+        int, Field(description="The number of copies taken from the pool.")
+    ] = 0
+    misses: Annotated[
+        int,
+        Field(description="The number of copies built on demand by a run."),
+    ] = 0
+    hit_rate: Annotated[
+        float | None,
+        Field(description="The fraction of runs served by a ready copy."),
+    ] = None
+    copies_made: Annotated[
+        int, Field(description="The number of runnable copies built.")
+    ] = 0
+    copy_time_total: Annotated[
+        float,
+        Field(description="The total time in seconds spent building copies."),
+    ] = 0.0
+    copy_time_max: Annotated[
+        float,
+        Field(description="The longest time in seconds to build a copy."),
+    ] = 0.0
+    pooled: Annotated[
+        dict[str, int],
+        Field(description="The number of ready copies keyed by runnable."),
+    ] = {}
@@ -15,3 +15,20 @@ class RunnableType(Enum):
 
     NODE = "node"
     GRAPH = "graph"
+
+
+class JobStatusEnum(Enum):
+    """Enum representing the status of a queued job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    ERROR = "error"
+    CANCELLED = "cancelled"
+
+
+class ExecutionMode(Enum):
+    """Enum representing where submitted jobs are executed."""
+
+    THREAD = "thread"
+    PROCESS = "process"
@@ -0,0 +1,72 @@
+"""
+Job model for the runner execution queue.
+
+A Job is created for every submitted node or workflow. It is queued by
+core.job_queue.JobQueue and executed one after another by a single executor,
+so the next calibration starts as soon as the previous one finishes.
+"""
+
+from collections.abc import Mapping
+from typing import Annotated, Any
+
+from pydantic import AwareDatetime, BaseModel, Field
+
+from qualibrate_runner.core.models.common import RunError
+from qualibrate_runner.core.models.enums import JobStatusEnum, RunnableType
+
+__all__ = ["Job"]
+
+
+class Job(BaseModel):
+    """
+    Record of a single submitted node or workflow run.
+
+    The job is created with QUEUED status on submission and moves to
+    RUNNING once the executor picks it up. It ends up in FINISHED, ERROR or
+    CANCELLED (cancelled jobs are never executed).
+    """
+
+    id: Annotated[str, Field(description="The unique id of the job.")]
+    name: Annotated[
+        str, Field(description="The name of the submitted node or workflow.")
+    ]
+    runnable_type: Annotated[
+        RunnableType,
+        Field(
+            description=(
+                "The type of the runnable entity. "
+                f"Possible options: {tuple(v.value for v in RunnableType)}."
+            ),
+        ),
+    ]
+    status: Annotated[
+        JobStatusEnum,
+        Field(
+            description=(
+                "The status of the job. "
+                f"Possible options: {tuple(v.value for v in JobStatusEnum)}."
+            ),
+        ),
+    ] = JobStatusEnum.QUEUED
+    passed_parameters: Annotated[
+        Mapping[str, Any],
+        Field(
+            default_factory=lambda: dict(),
+            description="The parameters passed to the run.",
+        ),
+    ]
+    submitted_at: Annotated[
+        AwareDatetime, Field(description="The submission time of the job.")
+    ]
+    started_at: Annotated[
+        AwareDatetime | None,
+        Field(description="The time the job execution was started."),
+    ] = None
+    completed_at: Annotated[
+        AwareDatetime | None,
+        Field(description="The time the job was completed or cancelled."),
+    ] = None
+    error: Annotated[
+        RunError | None,
+        Field(description="Any error encountered during the run."),
+    ] = None
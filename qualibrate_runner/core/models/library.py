@@ -0,0 +1,53 @@
+"""
+Report of an incremental calibration library reload.
+
+Library files are polled for changes and only added, modified and removed
+node and graph files are reloaded. Every reload that changed anything is
+reported by a `LibraryChanges` entry.
+"""
+
+from datetime import datetime
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+__all__ = ["LibraryChanges"]
+
+
+class LibraryChanges(BaseModel):
+    """Files and runnables changed by a single library reload."""
+
+    started_at: Annotated[
+        datetime, Field(description="The time the reload started.")
+    ]
+    duration: Annotated[
+        float, Field(description="The duration of the reload in seconds.")
+    ]
+    added_files: Annotated[
+        list[str], Field(description="The names of added library files.")
+    ] = []
+    modified_files: Annotated[
+        list[str], Field(description="The names of modified library files.")
+    ] = []
+    removed_files: Annotated[
+        list[str], Field(description="The names of removed library files.")
+    ] = []
+    nodes: Annotated[
+        list[str], Field(description="The names of (re)loaded nodes.")
+    ] = []
+    graphs: Annotated[
+        list[str], Field(description="The names of (re)loaded graphs.")
+    ] = []
+    removed: Annotated[
+        list[str],
+        Field(description="The names of nodes and graphs no longer defined."),
+    ] = []
+    import_times: Annotated[
+        dict[str, float],
+        Field(
+            description=(
+                "The import durations in seconds of scanned files keyed by "
+                "file name."
+            )
+        ),
+    ] = {}
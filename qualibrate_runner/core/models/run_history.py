@@ -0,0 +1,83 @@
+"""
+Models of the persistent run history.
+
+Every completed run (LastRun with FINISHED or ERROR status) is appended to
+core.run_history.RunHistoryStore. These models are returned by the `/runs`
+API.
+"""
+
+from collections.abc import Mapping
+from typing import Annotated
+
+from pydantic import AwareDatetime, BaseModel, Field
+
+from qualibrate_runner.core.models.enums import RunnableType, RunStatusEnum
+
+__all__ = ["RunHistoryPage", "RunHistoryStats", "RunRecord"]
+
+
+class RunRecord(BaseModel):
+    """Short record of a completed node or workflow run."""
+
+    id: Annotated[int, Field(description="The unique id of the record.")]
+    name: Annotated[str, Field(description="The name of the run.")]
+    runnable_type: Annotated[
+        RunnableType,
+        Field(description="The type of the runnable entity."),
+    ]
+    status: Annotated[
+        RunStatusEnum, Field(description="The final status of the run.")
+    ]
+    idx: Annotated[
+        int, Field(description="The snapshot index of the run, -1 if none.")
+    ]
+    started_at: Annotated[
+        AwareDatetime, Field(description="The start time of the run.")
+    ]
+    completed_at: Annotated[
+        AwareDatetime | None,
+        Field(description="The completion time of the run."),
+    ] = None
+    duration: Annotated[
+        float | None, Field(description="Duration of the run in seconds.")
+    ] = None
+    error_class: Annotated[
+        str | None,
+        Field(description="The class of the error if the run failed."),
+    ] = None
+
+
+class RunHistoryPage(BaseModel):
+    """Page of run records ordered from the newest to the oldest."""
+
+    items: Annotated[list[RunRecord], Field(description="Run records.")]
+    next_cursor: Annotated[
+        int | None,
+        Field(
+            description=(
+                "Cursor for the next page. None if there are no more records."
+            )
+        ),
+    ] = None
+
+
+class RunHistoryStats(BaseModel):
+    """Aggregated statistics of matching runs."""
+
+    count: Annotated[int, Field(description="The number of runs.")] = 0
+    status_counts: Annotated[
+        Mapping[str, int],
+        Field(
+            default_factory=lambda: dict(),
+            description="The number of runs by final status.",
+        ),
+    ]
+    duration_avg: Annotated[
+        float | None, Field(description="Average duration in seconds.")
+    ] = None
+    duration_min: Annotated[
+        float | None, Field(description="Minimal duration in seconds.")
+    ] = None
+    duration_max: Annotated[
+        float | None, Field(description="Maximal duration in seconds.")
+    ] = None
@@ -0,0 +1,44 @@
+"""
+Delivery statistics of websocket connection managers.
+
+Every subscriber has a bounded outgoing queue. When a subscriber falls
+behind, the oldest queued frames are dropped (only the latest status matters)
+and subscribers that keep lagging or can't receive a frame within the send
+timeout are disconnected. The counters below expose these events.
+"""
+
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+__all__ = ["SocketStats"]
+
+
+class SocketStats(BaseModel):
+    """Counters of a single websocket connection manager."""
+
+    connections: Annotated[
+        int, Field(description="The number of connected subscribers.")
+    ] = 0
+    frames_sent: Annotated[
+        int, Field(description="The number of frames delivered to clients.")
+    ] = 0
+    frames_dropped: Annotated[
+        int,
+        Field(
+            description=(
+                "The number of frames dropped because subscriber queue was "
+                "full."
+            )
+        ),
+    ] = 0
+    send_timeouts: Annotated[
+        int, Field(description="The number of frame sends that timed out.")
+    ] = 0
+    send_errors: Annotated[
+        int, Field(description="The number of frame sends that failed.")
+    ] = 0
+    clients_evicted: Annotated[
+        int,
+        Field(description="The number of subscribers disconnected by server."),
+    ] = 0
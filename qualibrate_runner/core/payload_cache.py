@@ -0,0 +1,137 @@
+"""
+Cache of encoded runnables payloads with conditional GET support.
+
+Serializing the whole library (`/get_nodes`, `/get_graphs`) is expensive and
+the result only changes when the library is rescanned. Payloads are encoded
+to JSON once per library generation and served as bytes. Every payload has
+a strong ETag derived from its content, so clients revalidating with
+`If-None-Match` get an empty `304 Not Modified` response. Clients accepting
+gzip get the compressed body, which is also compressed only once.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+from starlette.responses import Response
+
+from qualibrate_runner.utils.json_encoder import encode_json
+
+__all__ = ["EncodedPayload", "PayloadCache"]
+
+gzip_min_size = 1024
+_gzip_etag_suffix = "-gzip"
+
+
+def _accepts_gzip(request: Request) -> bool:
+    accept_encoding = request.headers.get("accept-encoding", "")
+    return any(
+        coding.split(";")[0].strip() == "gzip"
+        for coding in accept_encoding.lower().split(",")
+    )
+
+
+@dataclass
+class EncodedPayload:
+    """JSON encoded payload with its ETag."""
+
+    body: bytes
+    etag_hash: str
+    _gzip_body: bytes | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_content(cls, content: Any) -> "EncodedPayload":
+        body = encode_json(jsonable_encoder(content)).encode("utf-8")
+        etag_hash = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return cls(body=body, etag_hash=etag_hash)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.etag_hash}"'
+
+    @property
+    def gzip_body(self) -> bytes:
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body, mtime=0)
+        return self._gzip_body
+
+    def matches(self, if_none_match: str) -> bool:
+        """Whether `If-None-Match` header contains any ETag of payload."""
+        for tag in if_none_match.split(","):
+            tag = tag.strip().removeprefix("W/").strip('"')
+            if tag == "*" or tag.removesuffix(_gzip_etag_suffix) == (
+                self.etag_hash
+            ):
+                return True
+        return False
+
+    def response(self, request: Request) -> Response:
+        """Response to the request honouring conditional and gzip headers."""
+        use_gzip = len(self.body) >= gzip_min_size and _accepts_gzip(request)
+        etag = (
+            f'"{self.etag_hash}{_gzip_etag_suffix}"' if use_gzip else self.etag
+        )
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",
+        }
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None and self.matches(if_none_match):
+            return Response(status_code=304, headers=headers)
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=self.gzip_body if use_gzip else self.body,
+            media_type="application/json",
+            headers=headers,
+        )
+
+
+class PayloadCache:
+    """
+    Encoded payloads of the current library generation.
+
+    The generation is increased by `invalidate` (library rescan or settings
+    refresh), which drops all payloads. A payload computed while the cache
+    was invalidated isn't stored, so stale data is never cached.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._payloads: dict[Hashable, EncodedPayload] = {}
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._payloads.clear()
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> EncodedPayload:
+        """
+        Cached payload of the key or encoded result of `factory`.
+
+        Args:
+            key: Payload identifier including request variants (e.g.
+                `("graphs", cytoscape)`).
+            factory: Returns JSON-compatible content of the payload.
+        """
+        with self._lock:
+            payload = self._payloads.get(key)
+            generation = self._generation
+        if payload is not None:
+            return payload
+        payload = EncodedPayload.from_content(factory())
+        with self._lock:
+            if generation == self._generation:
+                self._payloads.setdefault(key, payload)
+        return payload
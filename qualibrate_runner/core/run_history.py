@@ -0,0 +1,329 @@
+"""
+Persistent history of completed runs.
+
+State keeps only the last run and loses it on restart. RunHistoryStore
+appends every completed LastRun to an SQLite database so runs can be
+queried later (e.g. durations of a node across the last hundreds of runs).
+
+Records are written by a background thread, so the job executor thread
+never waits for disk. Queries use keyset pagination over the record id
+(records are appended in completion order), which stays fast independently
+of the page depth, and indexes on the filtered columns.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from qualibrate_runner.config import State
+from qualibrate_runner.core.models.enums import RunnableType, RunStatusEnum
+from qualibrate_runner.core.models.last_run import LastRun
+from qualibrate_runner.core.models.run_history import (
+    RunHistoryPage,
+    RunHistoryStats,
+    RunRecord,
+)
+
+__all__ = ["RunHistoryStore"]
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    runnable_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    completed_at REAL,
+    duration REAL,
+    error_class TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_name ON runs (name);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (status);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+CREATE INDEX IF NOT EXISTS runs_runnable_type ON runs (runnable_type);
+"""
+
+_INSERT = """
+INSERT INTO runs (
+    name, runnable_type, status, idx, started_at, completed_at, duration,
+    error_class, data
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_RECORD_COLUMNS = (
+    "id, name, runnable_type, status, idx, started_at, completed_at, "
+    "duration, error_class"
+)
+
+_STOP = object()
+
+
+def _to_timestamp(value: datetime | None) -> float | None:
+    return value.timestamp() if value is not None else None
+
+
+def _from_timestamp(value: float | None) -> datetime | None:
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc).astimezone()
+
+
+class RunHistoryStore:
+    """
+    SQLite store of completed runs with a background writer.
+
+    Args:
+        db_path: Path to the database file. Parent directories are created.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self._state: State | None = None
+        self._last_appended: LastRun | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._db_path, timeout=30)
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connect()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def start(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        self._writer = threading.Thread(
+            target=self._write_forever,
+            name="qualibrate-runner-run-history",
+            daemon=True,
+        )
+        self._writer.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Write pending records and stop the writer thread."""
+        if self._state is not None:
+            self._state.remove_listener(self._on_state_change)
+            self._state = None
+        writer = self._writer
+        if writer is None:
+            return
+        self._queue.put(_STOP)
+        writer.join(timeout)
+        self._writer = None
+
+    def flush(self) -> None:
+        """Block until all appended runs are written."""
+        self._queue.join()
+
+    def attach(self, state: State) -> None:
+        """Append every completed run of the state."""
+        self._state = state
+        state.add_listener(self._on_state_change)
+
+    def _on_state_change(self) -> None:
+        state = self._state
+        last_run = state.last_run if state is not None else None
+        if (
+            last_run is None
+            or last_run.status == RunStatusEnum.RUNNING
+            or last_run is self._last_appended
+        ):
+            return
+        self._last_appended = last_run
+        self.append(last_run)
+
+    def append(self, last_run: LastRun) -> None:
+        """Schedule completed run for writing."""
+        self._queue.put(last_run)
+
+    def _write_forever(self) -> None:
+        connection = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                batch = [item]
+                # Write everything accumulated in a single transaction
+                while not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                runs = [run for run in batch if run is not _STOP]
+                try:
+                    self._write(connection, runs)
+                except Exception:
+                    logger.exception("Can't write run history")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(runs) != len(batch):
+                    return
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, runs: list[LastRun]) -> None:
+        if not runs:
+            return
+        rows = []
+        for run in runs:
+            duration = (
+                (run.completed_at - run.started_at).total_seconds()
+                if run.completed_at is not None
+                else None
+            )
+            rows.append(
+                (
+                    run.name,
+                    run.runnable_type.value,
+                    run.status.value,
+                    run.idx,
+                    _to_timestamp(run.started_at),
+                    _to_timestamp(run.completed_at),
+                    duration,
+                    run.error.error_class if run.error else None,
+                    run.model_dump_json(),
+                )
+            )
+        with connection:
+            connection.executemany(_INSERT, rows)
+
+    @staticmethod
+    def _where(
+        name: str | None,
+        status: RunStatusEnum | None,
+        runnable_type: RunnableType | None,
+        started_after: datetime | None,
+        started_before: datetime | None,
+    ) -> tuple[list[str], list[Any]]:
+        conditions: list[str] = []
+        params: list[Any] = []
+        if name is not None:
+            conditions.append("name = ?")
+            params.append(name)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status.value)
+        if runnable_type is not None:
+            conditions.append("runnable_type = ?")
+            params.append(runnable_type.value)
+        if started_after is not None:
+            conditions.append("started_at >= ?")
+            params.append(_to_timestamp(started_after))
+        if started_before is not None:
+            conditions.append("started_at < ?")
+            params.append(_to_timestamp(started_before))
+        return conditions, params
+
+    @staticmethod
+    def _record(row: tuple[Any, ...]) -> RunRecord:
+        return RunRecord(
+            id=row[0],
+            name=row[1],
+            runnable_type=RunnableType(row[2]),
+            status=RunStatusEnum(row[3]),
+            idx=row[4],
+            started_at=_from_timestamp(row[5]),
+            completed_at=_from_timestamp(row[6]),
+            duration=row[7],
+            error_class=row[8],
+        )
+
+    def query(
+        self,
+        *,
+        name: str | None = None,
+        status: RunStatusEnum | None = None,
+        runnable_type: RunnableType | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        cursor: int | None = None,
+        limit: int = 100,
+    ) -> RunHistoryPage:
+        """
+        Runs matching filters from the newest to the oldest.
+
+        Args:
+            cursor: `next_cursor` of the previous page.
+            limit: Maximal number of records in the page.
+        """
+        conditions, params = self._where(
+            name, status, runnable_type, started_after, started_before
+        )
+        if cursor is not None:
+            conditions.append("id < ?")
+            params.append(cursor)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._read() as connection:
+            rows = connection.execute(
+                f"SELECT {_RECORD_COLUMNS} FROM runs {where} "
+                "ORDER BY id DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        items = [self._record(row) for row in rows[:limit]]
+        next_cursor = items[-1].id if len(rows) > limit else None
+        return RunHistoryPage(items=items, next_cursor=next_cursor)
+
+    def get(self, run_id: int) -> dict[str, Any] | None:
+        """Full LastRun data of the record."""
+        with self._read() as connection:
+            row = connection.execute(
+                "SELECT data FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        data: dict[str, Any] = json.loads(row[0])
+        return data
+
+    def stats(
+        self,
+        *,
+        name: str | None = None,
+        runnable_type: RunnableType | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+    ) -> RunHistoryStats:
+        """Aggregated statistics of matching runs."""
+        conditions, params = self._where(
+            name, None, runnable_type, started_after, started_before
+        )
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._read() as connection:
+            count, duration_avg, duration_min, duration_max = (
+                connection.execute(
+                    "SELECT COUNT(*), AVG(duration), MIN(duration), "
+                    f"MAX(duration) FROM runs {where}",
+                    params,
+                ).fetchone()
+            )
+            status_counts = dict(
+                connection.execute(
+                    f"SELECT status, COUNT(*) FROM runs {where} "
+                    "GROUP BY status",
+                    params,
+                ).fetchall()
+            )
+        return RunHistoryStats(
+            count=count,
+            status_counts=status_counts,
+            duration_avg=duration_avg,
+            duration_min=duration_min,
+            duration_max=duration_max,
+        )
@@ -21,15 +21,28 @@ from typing import Any, cast
 
 from fastapi import HTTPException, status
 from pydantic import BaseModel, ValidationError
+from qualibrate import QualibrationGraph, QualibrationNode
+from qualibrate.models.execution_history import (
+    ExecutionHistory,
+    ExecutionHistoryItem,
+)
 from qualibrate.models.run_summary.graph import GraphRunSummary
 from qualibrate.models.run_summary.node import NodeRunSummary
+from qualibrate.parameters import ExecutionParameters
 from qualibrate.qualibration_library import QualibrationLibrary
 
 from qualibrate_runner.config import State
+from qualibrate_runner.core.copy_pool import RunnableCopyPool
 from qualibrate_runner.core.models.common import RunError
 from qualibrate_runner.core.models.enums import RunnableType, RunStatusEnum
 from qualibrate_runner.core.models.last_run import LastRun
 from qualibrate_runner.core.types import QGraphType, QLibraryType, QNodeType
+from qualibrate_runner.core.worker_pool import (
+    WorkerGraphProgress,
+    WorkerNodeProgress,
+    WorkerPool,
+    WorkerRunError,
+)
 
 
 def validate_input_parameters(
@@ -81,10 +94,50 @@ def get_active_library_or_error() -> QLibraryType:
     return QualibrationLibrary.get_active_library(create=False)
 
 
+def get_node_run_error(node: QNodeType, ex: Exception) -> RunError:
+    """
+    Build RunError for an exception raised by node run.
+
+    Error details (headline and details) are taken from the node run summary
+    if the node managed to create it before failing.
+    """
+    run_summary = getattr(node, "run_summary", None)
+    run_summary_error = (
+        getattr(run_summary, "error", None) if run_summary else None
+    )  # Very safe way to access error
+    return RunError(
+        error_class=ex.__class__.__name__,
+        message=str(ex),
+        details_headline=getattr(run_summary_error, "details_headline", None)
+        if run_summary_error
+        else None,
+        details=getattr(run_summary_error, "details", None)
+        if run_summary_error
+        else None,
+        traceback=traceback.format_tb(ex.__traceback__),
+    )
+
+
+def _node_run_parameters(
+    passed_input_parameters: Mapping[str, Any],
+    validated_parameters: BaseModel | None,
+) -> Mapping[str, Any]:
+    if validated_parameters is None:
+        return passed_input_parameters
+    # node.run merges passed values into the current node parameters and
+    # validates the result, so only explicitly passed fields are forwarded.
+    # Validated values (nested models, coerced types) are cheap to check.
+    return {
+        name: getattr(validated_parameters, name)
+        for name in validated_parameters.model_fields_set
+    }
+
+
 def run_node(
     node: QNodeType,
     passed_input_parameters: Mapping[str, Any],
     state: State,
+    validated_parameters: BaseModel | None = None,
 ) -> None:
     """
     Execute a single QualibrationNode with comprehensive state tracking.
@@ -105,6 +158,9 @@ def run_node(
             run method
         state: Global state object that tracks the current run status and
             results for monitoring/UI purposes
+        validated_parameters: `passed_input_parameters` already validated
+            against node.parameters_class (e.g. on submission). Its values
+            are passed to node.run instead of the raw ones
 
     Raises:
         Exception: Any exception raised by node.run() is re-raised after
@@ -138,27 +194,16 @@ def run_node(
         # Execute the node in interactive mode with provided parameters
         # interactive=True enables that the user approves changes to
         # variables in the frontend after execution
-        node.run(interactive=True, **passed_input_parameters)
+        node.run(
+            interactive=True,
+            **_node_run_parameters(
+                passed_input_parameters, validated_parameters
+            ),
+        )
     except Exception as ex:
         # Capture error details for state tracking
         run_status = RunStatusEnum.ERROR
-        run_summary = getattr(node, "run_summary", None)
-        run_summary_error = (
-            getattr(run_summary, "error", None) if run_summary else None
-        )  # Very safe way to access error
-        run_error = RunError(
-            error_class=ex.__class__.__name__,
-            message=str(ex),
-            details_headline=getattr(
-                run_summary_error, "details_headline", None
-            )
-            if run_summary_error
-            else None,
-            details=getattr(run_summary_error, "details", None)
-            if run_summary_error
-            else None,
-            traceback=traceback.format_tb(ex.__traceback__),
-        )
+        run_error = get_node_run_error(node, ex)
         # Re-raise to allow caller to handle the error
         raise
     else:
@@ -185,10 +230,124 @@ def run_node(
         )
 
 
+def _node_run_summary_from_worker(
+    node: QNodeType, run_summary: Mapping[str, Any] | None
+) -> NodeRunSummary | None:
+    if run_summary is None:
+        return None
+    data = dict(run_summary)
+    # Summary parameters are dumped from node specific parameters class, so
+    # base NodeParameters model can't validate them (extra fields forbidden)
+    if data.get("parameters") is not None:
+        data["parameters"] = node.parameters_class.model_validate(
+            data["parameters"]
+        )
+    return NodeRunSummary.model_validate(data)
+
+
+def _apply_node_progress(node: QNodeType, progress: WorkerNodeProgress) -> None:
+    node.fraction_complete = progress.fraction_complete
+    node.action_label = progress.action_label
+    if progress.run_start is not None:
+        node.run_start = progress.run_start
+
+
+def run_node_in_worker(
+    node: QNodeType,
+    passed_input_parameters: Mapping[str, Any],
+    state: State,
+    pool: WorkerPool,
+) -> None:
+    """
+    Execute a QualibrationNode in a worker process of the pool.
+
+    Behaves like `run_node`, but the node is executed by a worker process
+    so the API process stays responsive during heavy analysis. The passed
+    node is a local copy used for monitoring: progress reported by the
+    worker is applied to it, so it can be used as `state.run_item`.
+
+    Args:
+        node: Local copy of the QualibrationNode to execute
+        passed_input_parameters: Runtime parameters to pass to the node's
+            run method
+        state: Global state object that tracks the current run status and
+            results for monitoring/UI purposes
+        pool: Worker pool executing the node
+
+    Raises:
+        WorkerRunError: If node run in the worker raised an exception
+        RuntimeError: If the worker process exited unexpectedly
+    """
+    state.run_item = node
+    run_status = RunStatusEnum.RUNNING
+    state.last_run = LastRun(
+        name=node.name,
+        status=RunStatusEnum.RUNNING,
+        idx=-1,
+        passed_parameters=passed_input_parameters,
+        started_at=datetime.now().astimezone(),
+        runnable_type=RunnableType.NODE,
+    )
+
+    def on_progress(progress: WorkerNodeProgress) -> None:
+        _apply_node_progress(node, progress)
+        state.mark_changed()
+
+    idx = -1
+    run_error = None
+    result = None
+    try:
+        result = pool.run_node(
+            node.name,
+            node.filepath,
+            passed_input_parameters,
+            on_progress=on_progress,
+        )
+        if result.error is not None:
+            raise WorkerRunError(RunError.model_validate(result.error))
+    except WorkerRunError as ex:
+        run_status = RunStatusEnum.ERROR
+        run_error = ex.run_error
+        raise
+    except Exception as ex:
+        run_status = RunStatusEnum.ERROR
+        run_error = RunError(
+            error_class=ex.__class__.__name__,
+            message=str(ex),
+            traceback=traceback.format_tb(ex.__traceback__),
+        )
+        raise
+    else:
+        idx = result.snapshot_idx if result.snapshot_idx is not None else -1
+        run_status = RunStatusEnum.FINISHED
+    finally:
+        run_summary = None
+        state_updates: Mapping[str, Any] = {}
+        if result is not None:
+            run_summary = _node_run_summary_from_worker(
+                node, result.run_summary
+            )
+            state_updates = result.state_updates
+        state.last_run = LastRun(
+            name=state.last_run.name,
+            status=run_status,
+            idx=idx,
+            run_result=run_summary,
+            runnable_type=state.last_run.runnable_type,
+            passed_parameters=passed_input_parameters,
+            started_at=state.last_run.started_at,
+            completed_at=datetime.now().astimezone(),
+            state_updates=state_updates,
+            error=run_error,
+        )
+
+
 def run_workflow(
     workflow: QGraphType,
     passed_input_parameters: Mapping[str, Any],
     state: State,
+    copy_pool: RunnableCopyPool | None = None,
+    validated_parameters: ExecutionParameters | None = None,
 ) -> None:
     """
     Execute a calibration workflow (DAG of QualibrationNodes).
@@ -203,8 +362,9 @@ def run_workflow(
     5. Capture any errors with full traceback
     6. Update state with final results
 
-    The workflow is retrieved fresh from the library to ensure a clean instance
-    for each run, avoiding state pollution between runs.
+    The workflow is retrieved fresh from the library (or taken from the copy
+    pool) to ensure a clean instance for each run, avoiding state pollution
+    between runs.
 
     Args:
         workflow: The workflow (graph) instance to execute - note that a fresh
@@ -216,6 +376,12 @@ def run_workflow(
             'parameters' (workflow-level) and 'nodes' (per-node overrides)
         state: Global state object that tracks the current run status and
             results for monitoring/UI purposes
+        copy_pool: Pool of pre-built copies of library runnables. If passed,
+            the copy of `workflow` is taken from the pool instead of the
+            active library
+        validated_parameters: `passed_input_parameters` already validated
+            against workflow.full_parameters_class (e.g. on submission), so
+            they aren't validated again
 
     Raises:
         Exception: Any exception raised during workflow execution is re-raised
@@ -244,21 +410,27 @@ def run_workflow(
     run_error = None
 
     try:
-        # Get the active library to retrieve a fresh workflow copy
-        library = get_active_library_or_error()
+        if copy_pool is not None:
+            # Take a pre-built copy of the workflow
+            workflow = copy_pool.acquire(RunnableType.GRAPH, workflow)
+        else:
+            # Get the active library to retrieve a fresh workflow copy
+            library = get_active_library_or_error()
 
-        # Get a fresh copy of the workflow from the library
-        # This ensures each run starts with a clean state
-        workflow = library.graphs[workflow.name]
+            # Get a fresh copy of the workflow from the library
+            # This ensures each run starts with a clean state
+            workflow = library.graphs[workflow.name]
 
         # Set the currently executing item for monitoring
         state.run_item = workflow
 
-        # Validate and structure input parameters
+        # Validate (unless done on submission) and structure input parameters
         # full_parameters_class expects: {parameters: {...}, nodes: {...}}
         # where 'parameters' are workflow-level and 'nodes' are per-node
-        input_parameters = workflow.full_parameters_class(
-            **passed_input_parameters
+        input_parameters = (
+            validated_parameters
+            if validated_parameters is not None
+            else workflow.full_parameters_class(**passed_input_parameters)
         )
 
         # Execute the workflow DAG
@@ -297,3 +469,192 @@ def run_workflow(
             passed_parameters=passed_input_parameters,
             error=run_error,
         )
+
+
+def _history_item_from_worker(
+    graph: QGraphType, data: Mapping[str, Any]
+) -> ExecutionHistoryItem | None:
+    """
+    Rebuild execution history item dumped by a worker. Parameters are
+    validated by the class of the graph element, as base parameters models
+    can't validate them. None if the graph has no such element.
+    """
+    element = graph._nodes.get(data["metadata"]["name"])
+    if element is None:
+        return None
+    item = dict(data)
+    item["metadata"] = {
+        key: value
+        for key, value in data["metadata"].items()
+        if key != "run_duration"
+    }
+    item["data"] = {
+        **data["data"],
+        "parameters": element.parameters_class.model_validate(
+            data["data"]["parameters"]
+        ),
+    }
+    elements_history = data.get("elements_history")
+    if elements_history is not None and isinstance(element, QualibrationGraph):
+        item["elements_history"] = ExecutionHistory(
+            items=[
+                sub_item
+                for sub_item_data in elements_history["items"]
+                if (
+                    sub_item := _history_item_from_worker(
+                        element, sub_item_data
+                    )
+                )
+                is not None
+            ]
+        )
+    return ExecutionHistoryItem.model_validate(item)
+
+
+def _apply_graph_progress(
+    graph: QGraphType, progress: WorkerGraphProgress
+) -> None:
+    """Apply progress of the graph run in a worker to its local copy."""
+    if progress.run_start is not None:
+        graph.run_start = progress.run_start
+    elements = graph._nodes
+    for name, element_status in progress.statuses.items():
+        if name in elements:
+            graph._graph.nodes[elements[name]][
+                QualibrationGraph.ELEMENT_STATUS_FIELD
+            ] = element_status
+    orchestrator = graph._orchestrator
+    for data in progress.history:
+        item = _history_item_from_worker(graph, data)
+        if item is not None:
+            orchestrator._execution_history.append(item)
+    orchestrator._active_element = None
+    element: Any = graph
+    for name in progress.active_path:
+        if not isinstance(element, QualibrationGraph):
+            break
+        child = element._nodes.get(name)
+        element._orchestrator._active_element = child
+        element = child
+    if (
+        isinstance(element, QualibrationNode)
+        and progress.active_node is not None
+    ):
+        _apply_node_progress(element, progress.active_node)
+
+
+def _graph_run_summary_from_worker(
+    graph: QGraphType, run_summary: Mapping[str, Any] | None
+) -> GraphRunSummary | None:
+    if run_summary is None:
+        return None
+    data = dict(run_summary)
+    if data.get("parameters") is not None:
+        data["parameters"] = graph.full_parameters_class.model_validate(
+            data["parameters"]
+        )
+    return GraphRunSummary.model_validate(data)
+
+
+def run_workflow_in_worker(
+    workflow: QGraphType,
+    passed_input_parameters: Mapping[str, Any],
+    state: State,
+    pool: WorkerPool,
+    validated_parameters: ExecutionParameters | None = None,
+) -> None:
+    """
+    Execute a calibration workflow in a worker process of the pool.
+
+    Behaves like `run_workflow`, but the workflow is executed by a worker
+    process. The passed workflow is a local copy used for monitoring:
+    element statuses, execution history items and progress of the active
+    node reported by the worker are applied to it, so it can be used as
+    `state.run_item`.
+
+    Args:
+        workflow: Local copy of the workflow (graph) to execute
+        passed_input_parameters: Runtime parameters containing both workflow-
+            level parameters and node-specific parameters
+        state: Global state object that tracks the current run status and
+            results for monitoring/UI purposes
+        pool: Worker pool executing the workflow
+        validated_parameters: `passed_input_parameters` already validated
+            against workflow.full_parameters_class (e.g. on submission), so
+            they aren't validated again
+
+    Raises:
+        WorkerRunError: If workflow run in the worker raised an exception
+        RuntimeError: If the worker process exited unexpectedly
+    """
+    run_status = RunStatusEnum.RUNNING
+    state.last_run = LastRun(
+        name=workflow.name,
+        status=run_status,
+        idx=-1,
+        started_at=datetime.now().astimezone(),
+        runnable_type=RunnableType.GRAPH,
+        passed_parameters=passed_input_parameters,
+    )
+
+    def on_progress(progress: WorkerGraphProgress) -> None:
+        _apply_graph_progress(workflow, progress)
+        state.mark_changed()
+
+    idx = -1
+    run_error = None
+    result = None
+    try:
+        input_parameters = (
+            validated_parameters
+            if validated_parameters is not None
+            else workflow.full_parameters_class(**passed_input_parameters)
+        )
+        # Local copy reports parameters and progress of the run
+        workflow.cleanup()
+        workflow._full_parameters = input_parameters
+        # Replaced by the graph run start reported by the worker
+        workflow.run_start = state.last_run.started_at
+        state.run_item = workflow
+        result = pool.run_graph(
+            workflow.name,
+            workflow.filepath,
+            {
+                "nodes": input_parameters.nodes.model_dump(),
+                **input_parameters.parameters.model_dump(),
+            },
+            on_progress=on_progress,
+        )
+        if result.error is not None:
+            raise WorkerRunError(RunError.model_validate(result.error))
+    except WorkerRunError as ex:
+        run_status = RunStatusEnum.ERROR
+        run_error = ex.run_error
+        raise
+    except Exception as ex:
+        run_status = RunStatusEnum.ERROR
+        run_error = RunError(
+            error_class=ex.__class__.__name__,
+            message=str(ex),
+            traceback=traceback.format_tb(ex.__traceback__),
+        )
+        raise
+    else:
+        idx = result.snapshot_idx if result.snapshot_idx is not None else -1
+        run_status = RunStatusEnum.FINISHED
+    finally:
+        if result is not None:
+            workflow.run_summary = _graph_run_summary_from_worker(
+                workflow, result.run_summary
+            )
+        state.last_run = LastRun(
+            name=state.last_run.name,
+            status=run_status,
+            idx=idx,
+            run_result=cast(GraphRunSummary | None, workflow.run_summary),
+            started_at=state.last_run.started_at,
+            completed_at=datetime.now().astimezone(),
+            runnable_type=state.last_run.runnable_type,
+            passed_parameters=passed_input_parameters,
+            error=run_error,
+        )
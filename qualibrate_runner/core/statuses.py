@@ -1,5 +1,26 @@
+"""
+Status of the running (or last run) node or workflow.
+
+Status is requested by every websocket push and HTTP status request, while
+most of it doesn't change once the run is completed. Parameters and run
+results dumps are memoized by identity of their source objects, and the
+latest finished graph node is memoized by the number of completed nodes.
+Parameters of a running item are changed in place (e.g. graph sets targets
+of its full parameters, node scripts assign parameter fields), so until the
+run is completed their dumps are also keyed by the State version and the run
+progress. Run summaries are created at the end of a run and never changed.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
 from qualibrate import QualibrationGraph, QualibrationNode
-from qualibrate.models.execution_history import ExecutionHistory
+from qualibrate.models.execution_history import (
+    ExecutionHistory,
+)
 
 from qualibrate_runner.config import State
 from qualibrate_runner.core.models.active_run import (
@@ -13,13 +34,89 @@ from qualibrate_runner.core.models.run_results import RunResults
 from qualibrate_runner.core.types import QGraphType, QNodeType
 
 __all__ = [
+    "clear_status_cache",
     "get_graph_and_node_run_status",
     "get_graph_execution_history",
     "get_node_run_status",
+    "get_run_progress_key",
     "get_run_status",
 ]
 
 
+_V = TypeVar("_V")
+
+
+class _IdentityMemo(Generic[_V]):
+    """
+    Small LRU cache of values derived from objects.
+
+    Entry is valid only while the object is the same instance. The object is
+    referenced by the entry, so its id can't be reused by another object.
+    """
+
+    def __init__(self, maxsize: int = 8) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[Any, _V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, obj: Any, factory: Callable[[], _V], key: Hashable = None
+    ) -> _V:
+        cache_key = (id(obj), key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] is obj:
+                self._entries.move_to_end(cache_key)
+                return entry[1]
+        value = factory()
+        with self._lock:
+            self._entries[cache_key] = (obj, value)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_parameters_memo: _IdentityMemo[dict[str, Any]] = _IdentityMemo()
+_run_results_memo: _IdentityMemo[RunResults] = _IdentityMemo()
+_finished_node_memo: _IdentityMemo[RunStatusNode | None] = _IdentityMemo()
+
+
+def _dump_parameters(
+    parameters: BaseModel, version: Hashable = None
+) -> dict[str, Any]:
+    return _parameters_memo.get(
+        parameters, lambda: parameters.model_dump(mode="json"), key=version
+    )
+
+
+def _parameters_version(state: State, last_run: LastRun) -> Hashable:
+    """Version of the run item parameters. None once the run is completed."""
+    if last_run.status != RunStatusEnum.RUNNING:
+        return None
+    return state.version, get_run_progress_key(state)
+
+
+def _run_results(run_summary: BaseModel | None) -> RunResults | None:
+    if run_summary is None:
+        return None
+    return _run_results_memo.get(
+        run_summary,
+        lambda: RunResults.model_validate(run_summary.model_dump()),
+    )
+
+
+def clear_status_cache() -> None:
+    """Drop memoized status parts."""
+    _parameters_memo.clear()
+    _run_results_memo.clear()
+    _finished_node_memo.clear()
+
+
 def get_node_status_enum(
     last_run: LastRun,
     node: QNodeType,
@@ -35,52 +132,63 @@ def get_node_status_enum(
 
 
 def get_node_run_status(
-    last_run: LastRun, node: QNodeType, graph: QGraphType | None
+    last_run: LastRun,
+    node: QNodeType,
+    graph: QGraphType | None,
+    parameters_version: Hashable = None,
 ) -> RunStatusNode:
     return RunStatusNode(
         name=node.name,
         description=node.description,
-        parameters=node.parameters.model_dump(mode="json"),
+        parameters=_dump_parameters(node.parameters, parameters_version),
         id=node.snapshot_idx or last_run.idx,
         status=get_node_status_enum(last_run, node, graph),
         run_start=node.run_start,
         current_action=node.action_label,
         run_end=last_run.completed_at,
         percentage_complete=node.fraction_complete * 100,
-        run_results=(
-            RunResults.model_validate(node.run_summary.model_dump())
-            if node.run_summary
-            else None
-        ),
+        run_results=_run_results(node.run_summary),
     )
 
 
 def get_graph_and_node_run_status(
-    last_run: LastRun, graph: QGraphType, node: QNodeType | None
+    last_run: LastRun,
+    graph: QGraphType,
+    node: QNodeType | None,
+    parameters_version: Hashable = None,
 ) -> tuple[RunStatusGraph, RunStatusNode | None]:
+    finished_nodes = graph.completed_count()
     graph_status = RunStatusGraph(
         name=graph.name,
         description=graph.description,
-        parameters=graph.full_parameters.model_dump(mode="json"),
+        parameters=_dump_parameters(graph.full_parameters, parameters_version),
         status=last_run.status,
         run_start=graph.run_start,
         run_end=last_run.completed_at,
-        finished_nodes=graph.completed_count(),
+        finished_nodes=finished_nodes,
         total_nodes=len(graph._nodes),
-        run_results=(
-            RunResults.model_validate(graph.run_summary.model_dump())
-            if graph.run_summary
-            else None
-        ),
+        run_results=_run_results(graph.run_summary),
     )
-    orchestrator = graph._orchestrator
-    execution_history = (
-        orchestrator.get_execution_history().items if orchestrator else []
-    )
-    if node is not None or orchestrator is None or len(execution_history) == 0:
+    if node is not None or graph._orchestrator is None:
         return graph_status, None
+    # Execution history is extended only when a node is completed
+    node_status = _finished_node_memo.get(
+        graph,
+        lambda: _get_last_finished_node_status(graph),
+        key=finished_nodes,
+    )
+    return graph_status, node_status
+
+
+def _get_last_finished_node_status(graph: QGraphType) -> RunStatusNode | None:
+    orchestrator = graph._orchestrator
+    if orchestrator is None:
+        return None
+    execution_history = orchestrator.get_execution_history().items
+    if len(execution_history) == 0:
+        return None
     node_hist = execution_history[-1]
-    node_status = RunStatusNode(
+    return RunStatusNode(
         name=node_hist.metadata.name,
         description=node_hist.metadata.description,
         parameters=node_hist.data.parameters.model_dump(mode="json"),
@@ -90,7 +198,6 @@ def get_graph_and_node_run_status(
         run_end=node_hist.metadata.run_end,
         percentage_complete=100,
     )
-    return graph_status, node_status
 
 
 def get_run_status(state: State) -> RunStatus:
@@ -109,11 +216,14 @@ def get_run_status(state: State) -> RunStatus:
 
     node_status: RunStatusNode | None = None
     graph_status: RunStatusGraph | None = None
+    parameters_version = _parameters_version(state, last_run)
     if node:
-        node_status = get_node_run_status(last_run, node, graph)
+        node_status = get_node_run_status(
+            last_run, node, graph, parameters_version
+        )
     if graph:
         graph_status, node_graph_status = get_graph_and_node_run_status(
-            last_run, graph, node
+            last_run, graph, node, parameters_version
         )
         node_status = node_status or node_graph_status
     return RunStatus(
@@ -124,9 +234,44 @@ def get_run_status(state: State) -> RunStatus:
     )
 
 
+def get_run_progress_key(state: State) -> Hashable:
+    """
+    Cheap fingerprint of the running item progress.
+
+    Node progress (fraction complete, current action) and graph progress are
+    changed inside qualibrate without notifying the State, so this key is
+    probed periodically while an item is running to detect such changes.
+    """
+    run_item = state.run_item
+    if isinstance(run_item, QualibrationGraph):
+        graph: QGraphType = run_item
+        node = graph.active_node
+        node_key = (
+            (node.name, node.fraction_complete, node.action_label)
+            if node is not None
+            else None
+        )
+        return id(graph), node_key, graph.completed_count()
+    if isinstance(run_item, QualibrationNode):
+        return id(run_item), run_item.fraction_complete, run_item.action_label
+    return None
+
+
 def get_graph_execution_history(
-    state: State, reverse: bool = False
+    state: State, reverse: bool = False, since: int | None = None
 ) -> ExecutionHistory | None:
+    """
+    Execution history of the running (or last run) graph.
+
+    Args:
+        state: Runner state.
+        reverse: Whether the latest executed items go first.
+        since: Number of items already known by the caller. Items are
+            only appended to the history, so the items after the first
+            `since` ones are returned. Ids can't be used as the cursor, as
+            they aren't unique and may be missing. All items are returned if
+            the history has fewer items (e.g. another graph was started).
+    """
     if not isinstance(state.run_item, QualibrationGraph):
         return None
     graph: QGraphType = state.run_item
@@ -134,6 +279,8 @@ def get_graph_execution_history(
     if orch is None:
         raise RuntimeError("No graph orchestrator")
     history: ExecutionHistory = orch.get_execution_history()
+    if since is not None and since <= len(history.items):
+        history.items = list(history.items[since:])
     if reverse:
         history.items = list(reversed(history.items))
     return history
@@ -0,0 +1,598 @@
+"""
+Isolated worker processes for node and workflow execution.
+
+In the default thread execution mode nodes run inside the API process, so
+heavy numpy/xarray analysis competes with request handling for the GIL. The
+WorkerPool pre-spawns worker processes which import the calibration library
+once on startup and then execute submitted nodes and workflows on request.
+
+Communication with a worker goes through a multiprocessing pipe:
+- parent -> worker: ("run_node", name, filepath, parameters),
+  ("run_graph", name, filepath, parameters), ("stop", bool), ("shutdown",)
+- worker -> parent: ("ready", names), ("progress", WorkerNodeProgress or
+  WorkerGraphProgress), ("result", WorkerNodeResult)
+
+Node progress messages carry `fraction_complete`, `action_label` and
+`run_start` of the running node. Graph progress messages additionally carry
+statuses of graph elements, execution history items added since the previous
+message and the path to the active node. Progress is applied to a local copy
+of the runnable, so status reporting (core.statuses) works the same way as in
+thread mode.
+
+Workers keep the library imported on startup, so they are restarted with
+`WorkerPool.restart` when library files are changed.
+"""
+
+import logging
+import queue
+import threading
+import traceback
+from collections.abc import Callable, Mapping
+from contextlib import suppress
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any, cast
+
+from qualibrate_runner.core.models.common import RunError
+from qualibrate_runner.core.types import QGraphType, QLibraryType, QNodeType
+
+__all__ = [
+    "WorkerGraphProgress",
+    "WorkerNodeProgress",
+    "WorkerNodeResult",
+    "WorkerPool",
+    "WorkerRunError",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRunError(RuntimeError):
+    """Node run in a worker process raised an exception."""
+
+    def __init__(self, run_error: RunError) -> None:
+        super().__init__(f"{run_error.error_class}: {run_error.message}")
+        self.run_error = run_error
+
+
+@dataclass
+class WorkerNodeProgress:
+    fraction_complete: float
+    action_label: str | None
+    run_start: datetime | None
+
+
+@dataclass
+class WorkerGraphProgress:
+    """
+    Args:
+        run_start: Start of the graph run.
+        statuses: Run statuses of graph elements keyed by element name.
+        history: Dumps of execution history items added since the previous
+            progress message.
+        active_path: Names of elements leading to the active node, starting
+            from the graph element. Empty if no element is running.
+        active_node: Progress of the active node.
+    """
+
+    run_start: datetime | None
+    statuses: Mapping[str, Any]
+    history: list[Mapping[str, Any]]
+    active_path: list[str]
+    active_node: WorkerNodeProgress | None
+
+
+@dataclass
+class WorkerNodeResult:
+    """Result of a node or graph run in a worker process."""
+
+    snapshot_idx: int | None = None
+    run_summary: Mapping[str, Any] | None = None
+    state_updates: Mapping[str, Any] = field(default_factory=dict)
+    error: Mapping[str, Any] | None = None
+
+
+ProgressCallback = Callable[[WorkerNodeProgress], None]
+GraphProgressCallback = Callable[[WorkerGraphProgress], None]
+
+
+def _node_progress(node: QNodeType) -> WorkerNodeProgress:
+    return WorkerNodeProgress(
+        fraction_complete=node.fraction_complete,
+        action_label=node.action_label,
+        run_start=node.run_start,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+
+class _WorkerRuntime:
+    """Executes run requests inside the worker process."""
+
+    def __init__(
+        self, conn: Connection, library_folder: Path, progress_interval: float
+    ) -> None:
+        from qualibrate import QualibrationLibrary
+
+        self._conn = conn
+        self._send_lock = threading.Lock()
+        self._progress_interval = progress_interval
+        self._requests: queue.Queue[tuple[Any, ...]] = queue.Queue()
+        self._active: QNodeType | QGraphType | None = None
+        self._library_loaded_at = datetime.now().timestamp()
+        self._library: QLibraryType = QualibrationLibrary(
+            library_folder=library_folder, set_active=True
+        )
+
+    def send(self, message: tuple[Any, ...]) -> None:
+        with self._send_lock:
+            self._conn.send(message)
+
+    def receive_forever(self) -> None:
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                message = ("shutdown",)
+            if message[0] == "stop":
+                runnable = self._active
+                if runnable is not None:
+                    runnable.stop(stop_graph_node=message[1])
+                continue
+            self._requests.put(message)
+            if message[0] == "shutdown":
+                return
+
+    def serve_forever(self) -> None:
+        self.send(("ready", sorted(self._library.nodes.keys())))
+        threading.Thread(target=self.receive_forever, daemon=True).start()
+        while True:
+            message = self._requests.get()
+            if message[0] == "shutdown":
+                return
+            if message[0] == "run_node":
+                _, name, filepath, parameters = message
+                self.send(("result", self.run_node(name, filepath, parameters)))
+            elif message[0] == "run_graph":
+                _, name, filepath, parameters = message
+                self.send(
+                    ("result", self.run_graph(name, filepath, parameters))
+                )
+
+    def _get_node(self, name: str, filepath: Path | None) -> QNodeType:
+        from qualibrate import QualibrationNode
+        from qualibrate.models.run_mode import RunModes
+        from qualibrate.q_runnnable import run_modes_ctx
+
+        cached = self._library.nodes.get_nocopy(name)
+        if (
+            cached is not None
+            and filepath is not None
+            and cached.filepath == filepath
+            and filepath.stat().st_mtime <= self._library_loaded_at
+        ):
+            return self._library.nodes[name]
+        if filepath is None:
+            raise KeyError(f"Unknown node name {name}")
+        # Node file was added or modified after startup, rescan only it
+        nodes: dict[str, Any] = {}
+        token = run_modes_ctx.set(RunModes(inspection=True))
+        try:
+            QualibrationNode.scan_node_file(filepath, nodes)
+        finally:
+            run_modes_ctx.reset(token)
+        if name not in nodes:
+            raise KeyError(f"Node {name} not found in {filepath}")
+        self._library.nodes[name] = cast(QNodeType, nodes[name])
+        return self._library.nodes[name]
+
+    def _get_graph(self, name: str, filepath: Path | None) -> QGraphType:
+        from qualibrate import QualibrationGraph
+        from qualibrate.models.run_mode import RunModes
+        from qualibrate.q_runnnable import run_modes_ctx
+
+        cached = self._library.graphs.get_nocopy(name)
+        if (
+            cached is not None
+            and filepath is not None
+            and cached.filepath == filepath
+            and filepath.stat().st_mtime <= self._library_loaded_at
+        ):
+            return self._library.graphs[name]
+        if filepath is None:
+            raise KeyError(f"Unknown graph name {name}")
+        # Graph file was added or modified after startup, rescan only it.
+        # Graph takes nodes from the library loaded by the worker.
+        graphs: dict[str, Any] = {}
+        token = run_modes_ctx.set(RunModes(inspection=True))
+        try:
+            QualibrationGraph.scan_graph_file(filepath, graphs)
+        finally:
+            run_modes_ctx.reset(token)
+        if name not in graphs:
+            raise KeyError(f"Graph {name} not found in {filepath}")
+        self._library.graphs[name] = cast(QGraphType, graphs[name])
+        return self._library.graphs[name]
+
+    def _report_progress(self, node: QNodeType, done: threading.Event) -> None:
+        last: WorkerNodeProgress | None = None
+        while not done.wait(self._progress_interval):
+            progress = _node_progress(node)
+            if progress != last:
+                self.send(("progress", progress))
+                last = progress
+
+    @staticmethod
+    def _graph_progress(
+        graph: QGraphType, history_sent: int
+    ) -> WorkerGraphProgress:
+        from qualibrate import QualibrationGraph
+
+        statuses = {
+            element.name: status
+            for element, status in graph._graph.nodes(
+                data=QualibrationGraph.ELEMENT_STATUS_FIELD
+            )
+        }
+        history = graph._orchestrator.get_execution_history().items
+        active_path: list[str] = []
+        element: Any = graph
+        while isinstance(element, QualibrationGraph):
+            element = element._orchestrator.active_element
+            if element is None:
+                break
+            active_path.append(element.name)
+        return WorkerGraphProgress(
+            run_start=getattr(graph, "run_start", None),
+            statuses=statuses,
+            history=[item.model_dump() for item in history[history_sent:]],
+            active_path=active_path,
+            active_node=(
+                None
+                if element is None or isinstance(element, QualibrationGraph)
+                else _node_progress(element)
+            ),
+        )
+
+    def _report_graph_progress(
+        self, graph: QGraphType, done: threading.Event
+    ) -> None:
+        last: WorkerGraphProgress | None = None
+        history_sent = 0
+        while True:
+            # The last message is sent after the run, so the parent gets
+            # all execution history items before the result
+            finished = done.wait(self._progress_interval)
+            progress = self._graph_progress(graph, history_sent)
+            if progress != last:
+                self.send(("progress", progress))
+                history_sent += len(progress.history)
+                last = replace(progress, history=[])
+            if finished:
+                return
+
+    def run_node(
+        self,
+        name: str,
+        filepath: Path | None,
+        parameters: Mapping[str, Any],
+    ) -> WorkerNodeResult:
+        from qualibrate_runner.core.run_job import get_node_run_error
+
+        try:
+            node = self._get_node(name, filepath)
+        except Exception as ex:
+            return WorkerNodeResult(
+                error=RunError(
+                    error_class=ex.__class__.__name__,
+                    message=str(ex),
+                    traceback=traceback.format_tb(ex.__traceback__),
+                ).model_dump()
+            )
+        self._active = node
+        done = threading.Event()
+        reporter = threading.Thread(
+            target=self._report_progress, args=(node, done), daemon=True
+        )
+        reporter.start()
+        result = WorkerNodeResult()
+        try:
+            node.run(interactive=True, **parameters)
+        except Exception as ex:
+            result.error = get_node_run_error(node, ex).model_dump()
+        finally:
+            done.set()
+            reporter.join()
+            self._active = None
+        result.snapshot_idx = node.snapshot_idx
+        result.state_updates = dict(node.state_updates)
+        if node.run_summary is not None:
+            result.run_summary = node.run_summary.model_dump()
+        return result
+
+    def run_graph(
+        self,
+        name: str,
+        filepath: Path | None,
+        parameters: Mapping[str, Any],
+    ) -> WorkerNodeResult:
+        try:
+            graph = self._get_graph(name, filepath)
+        except Exception as ex:
+            return WorkerNodeResult(
+                error=RunError(
+                    error_class=ex.__class__.__name__,
+                    message=str(ex),
+                    traceback=traceback.format_tb(ex.__traceback__),
+                ).model_dump()
+            )
+        self._active = graph
+        done = threading.Event()
+        reporter = threading.Thread(
+            target=self._report_graph_progress,
+            args=(graph, done),
+            daemon=True,
+        )
+        reporter.start()
+        result = WorkerNodeResult()
+        try:
+            graph.run(**parameters)
+        except Exception as ex:
+            result.error = RunError(
+                error_class=ex.__class__.__name__,
+                message=str(ex),
+                traceback=traceback.format_tb(ex.__traceback__),
+            ).model_dump()
+        finally:
+            done.set()
+            reporter.join()
+            self._active = None
+        result.snapshot_idx = getattr(graph, "snapshot_idx", None)
+        result.state_updates = dict(graph.state_updates)
+        if graph.run_summary is not None:
+            result.run_summary = graph.run_summary.model_dump()
+        return result
+
+
+def _worker_main(
+    conn: Connection, library_folder: Path, progress_interval: float
+) -> None:
+    try:
+        runtime = _WorkerRuntime(conn, library_folder, progress_interval)
+    except Exception:
+        logging.exception("Can't initialize worker process")
+        conn.close()
+        return
+    runtime.serve_forever()
+
+
+# ---------------------------------------------------------------------------
+# API process side
+# ---------------------------------------------------------------------------
+
+
+class _WorkerHandle:
+    def __init__(
+        self, library_folder: Path, progress_interval: float, version: int
+    ) -> None:
+        # Version of the pool library the worker imports on startup
+        self.version = version
+        ctx = get_context("spawn")
+        self.conn, child_conn = ctx.Pipe(duplex=True)
+        self.send_lock = threading.Lock()
+        self.process: BaseProcess = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, library_folder, progress_interval),
+            name="qualibrate-runner-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def send(self, message: tuple[Any, ...]) -> None:
+        with self.send_lock:
+            self.conn.send(message)
+
+    def recv(self) -> tuple[Any, ...]:
+        message: tuple[Any, ...] = self.conn.recv()
+        return message
+
+    def wait_ready(self) -> None:
+        if self.ready:
+            return
+        message = self.recv()
+        if message[0] != "ready":
+            raise RuntimeError(f"Unexpected worker message {message[0]}")
+        self.ready = True
+
+    def close(self, timeout: float | None = None) -> None:
+        with suppress(BrokenPipeError, OSError):
+            self.send(("shutdown",))
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    Pool of pre-spawned processes executing nodes and graphs outside the
+    API process.
+
+    Args:
+        library_folder: Calibration library folder imported by workers.
+        size: Number of worker processes.
+        progress_interval: Interval in seconds between progress updates.
+    """
+
+    def __init__(
+        self,
+        library_folder: Path,
+        size: int = 1,
+        progress_interval: float = 0.2,
+    ) -> None:
+        self._library_folder = library_folder
+        self._size = size
+        self._progress_interval = progress_interval
+        self._idle: queue.Queue[_WorkerHandle] = queue.Queue()
+        self._workers: list[_WorkerHandle] = []
+        self._active: _WorkerHandle | None = None
+        self._lock = threading.Lock()
+        self._version = 0
+
+    def _spawn(self) -> _WorkerHandle:
+        with self._lock:
+            worker = _WorkerHandle(
+                self._library_folder, self._progress_interval, self._version
+            )
+            self._workers.append(worker)
+        return worker
+
+    def _respawn_outdated(self, worker: _WorkerHandle) -> _WorkerHandle:
+        if worker.version == self._version:
+            return worker
+        self._discard(worker)
+        return self._spawn()
+
+    def _discard(self, worker: _WorkerHandle) -> None:
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.close(timeout=1)
+
+    def start(self) -> None:
+        """Spawn worker processes. Workers import the library in background."""
+        for _ in range(self._size - len(self._workers)):
+            self._idle.put(self._spawn())
+
+    def restart(self, library_folder: Path | None = None) -> None:
+        """
+        Replace workers, so they import the current library. Workers keep
+        the library imported on startup, so they have to be restarted when
+        library files are changed. The busy worker is replaced once its run
+        is completed.
+
+        Args:
+            library_folder: New calibration library folder. The current one
+                is kept if None.
+        """
+        with self._lock:
+            if library_folder is not None:
+                self._library_folder = library_folder
+            self._version += 1
+        outdated: list[_WorkerHandle] = []
+        with suppress(queue.Empty):
+            while True:
+                outdated.append(self._idle.get_nowait())
+        for worker in outdated:
+            self._idle.put(self._respawn_outdated(worker))
+
+    def stop(self, timeout: float | None = None) -> None:
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.close(timeout)
+
+    @property
+    def is_busy(self) -> bool:
+        return self._active is not None
+
+    def stop_active(self, stop_graph_node: bool = False) -> bool:
+        """Ask the worker running a node or graph to stop it."""
+        worker = self._active
+        if worker is None:
+            return False
+        try:
+            worker.send(("stop", stop_graph_node))
+        except (BrokenPipeError, OSError):
+            return False
+        return True
+
+    def run_node(
+        self,
+        name: str,
+        filepath: Path | None,
+        parameters: Mapping[str, Any],
+        on_progress: ProgressCallback | None = None,
+    ) -> WorkerNodeResult:
+        """
+        Execute node in an idle worker and wait for the result.
+
+        Raises:
+            RuntimeError: If the worker process exited unexpectedly.
+        """
+        return self._run(
+            ("run_node", name, filepath, dict(parameters)), on_progress
+        )
+
+    def run_graph(
+        self,
+        name: str,
+        filepath: Path | None,
+        parameters: Mapping[str, Any],
+        on_progress: GraphProgressCallback | None = None,
+    ) -> WorkerNodeResult:
+        """
+        Execute graph in an idle worker and wait for the result.
+
+        Args:
+            name: Name of the library graph.
+            filepath: File defining the graph.
+            parameters: Keyword arguments of `QualibrationGraph.run`.
+            on_progress: Called with every graph progress message.
+
+        Raises:
+            RuntimeError: If the worker process exited unexpectedly.
+        """
+        return self._run(
+            ("run_graph", name, filepath, dict(parameters)), on_progress
+        )
+
+    def _run(
+        self,
+        request: tuple[Any, ...],
+        on_progress: Callable[[Any], None] | None,
+    ) -> WorkerNodeResult:
+        worker = self._respawn_outdated(self._idle.get())
+        self._active = worker
+        try:
+            worker.wait_ready()
+            worker.send(request)
+            while True:
+                message = worker.recv()
+                if message[0] == "progress":
+                    if on_progress is not None:
+                        # The worker keeps running, so it's never interrupted
+                        # by the callback failure
+                        try:
+                            on_progress(message[1])
+                        except Exception as ex:
+                            logger.exception(
+                                "Can't apply worker progress", exc_info=ex
+                            )
+                    continue
+                if message[0] == "result":
+                    result: WorkerNodeResult = message[1]
+                    break
+        except (EOFError, OSError) as ex:
+            self._discard(worker)
+            worker = self._spawn()
+            raise RuntimeError("Worker process exited unexpectedly") from ex
+        except RuntimeError:
+            # Worker didn't follow the protocol, so it's never reused
+            self._discard(worker)
+            worker = self._spawn()
+            raise
+        finally:
+            self._active = None
+            self._idle.put(self._respawn_outdated(worker))
+        return result
@@ -0,0 +1,55 @@
+"""
+JSON encoding of websocket frames.
+
+Broadcast payloads are encoded once and the same text frame is sent to every
+subscriber. `orjson` is used if it's installed (`fast-json` extra), otherwise
+the standard library encoder with the same settings as
+`starlette.websockets.WebSocket.send_json` is used.
+
+Both encoders produce the same output: non-finite floats (NaN, Infinity) are
+encoded as `null` like `orjson` does, since `NaN` and `Infinity` tokens
+aren't valid JSON and can't be parsed by browsers.
+"""
+
+import json
+import math
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ["encode_json"]
+
+
+def _replace_non_finite(data: Any) -> Any:
+    if isinstance(data, float):
+        return data if math.isfinite(data) else None
+    if isinstance(data, dict):
+        return {key: _replace_non_finite(value) for key, value in data.items()}
+    if isinstance(data, list | tuple):
+        return [_replace_non_finite(value) for value in data]
+    return data
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(
+        data, separators=(",", ":"), ensure_ascii=False, allow_nan=False
+    )
+
+
+def encode_json(data: Any) -> str:
+    """
+    Encode JSON-compatible data (e.g. `model_dump(mode="json")` result).
+
+    Output is compact and keeps non-ASCII characters as is. Non-finite
+    floats are encoded as `null`.
+    """
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    try:
+        return _dumps(data)
+    except ValueError:
+        # Non-finite floats are rare, so data is only copied if they exist
+        return _dumps(_replace_non_finite(data))
@@ -0,0 +1,222 @@
+"""
+Sidecar timestamp index of qualibrate log files.
+
+The index stores sparse checkpoints `(timestamp, byte offset)` of every log
+file: approximately every `checkpoint_interval` bytes the start of the next
+log record (header line) and its timestamp are recorded. Log records are
+written in chronological order, so checkpoints allow narrowing a time
+window query down to a byte range with a binary search.
+
+Checkpoints are found by seeking, so building the index doesn't read files
+completely. Files are identified by inode, which is kept when the rotating
+handler renames `qualibrate.log` to `qualibrate.log.1`, so the index of a
+rotated file stays valid. A file that only grew (active log file) is
+indexed incrementally from its last checkpoint. The index is persisted to
+a sidecar JSON file in the log folder.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from qualibrate_runner.utils.logs_parser import parse_log_line_timestamp
+
+__all__ = ["LogFileIndex", "LogFolderIndex", "get_log_folder_index"]
+
+logger = logging.getLogger(__name__)
+
+index_filename = ".qualibrate_logs_index.json"
+checkpoint_interval = 256 * 1024
+
+
+@dataclass
+class LogFileIndex:
+    """Checkpoints of a single log file."""
+
+    inode: int
+    size: int = 0
+    mtime: float = 0.0
+    # Timestamps (as POSIX timestamps of naive local datetimes) and offsets
+    timestamps: list[float] = field(default_factory=list)
+    offsets: list[int] = field(default_factory=list)
+
+    def update(self, path: Path, stat: os.stat_result) -> bool:
+        """
+        Index file content appended after the last update.
+
+        Returns:
+            Whether the index was changed.
+        """
+        if stat.st_size == self.size and stat.st_mtime == self.mtime:
+            return False
+        with open(path, "rb") as f:
+            if stat.st_size < self.size or not self._first_record_same(f):
+                # File was truncated or replaced, index from scratch
+                self.timestamps.clear()
+                self.offsets.clear()
+            position = (
+                self.offsets[-1] + checkpoint_interval if self.offsets else 0
+            )
+            while position < stat.st_size:
+                f.seek(position)
+                if position > 0:
+                    # Skip rest of the line checkpoint falls into
+                    f.readline()
+                checkpoint = self._find_record(f)
+                if checkpoint is None:
+                    break
+                timestamp, offset = checkpoint
+                if not self.offsets or offset > self.offsets[-1]:
+                    self.timestamps.append(timestamp.timestamp())
+                    self.offsets.append(offset)
+                position = offset + checkpoint_interval
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        return True
+
+    def _first_record_same(self, f: Any) -> bool:
+        if not self.offsets:
+            return True
+        f.seek(self.offsets[0])
+        checkpoint = self._find_record(f)
+        return (
+            checkpoint is not None
+            and checkpoint[0].timestamp() == self.timestamps[0]
+        )
+
+    @staticmethod
+    def _find_record(f: Any) -> tuple[datetime, int] | None:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                # End of file or record which is being written
+                return None
+            timestamp = parse_log_line_timestamp(
+                line.decode("utf-8", errors="replace")
+            )
+            if timestamp is not None:
+                return timestamp, offset
+
+    def byte_range(
+        self, after: datetime | None, before: datetime | None
+    ) -> tuple[int, int | None]:
+        """
+        Byte range of the file containing records within time window.
+
+        Returns:
+            Start offset and end offset (None means end of file).
+        """
+        start, end = 0, None
+        if after is not None:
+            # All records before the last checkpoint older than `after` are
+            # older too
+            idx = bisect.bisect_left(self.timestamps, after.timestamp())
+            if idx > 0:
+                start = self.offsets[idx - 1]
+        if before is not None:
+            # All records after the first checkpoint newer than `before` are
+            # newer too
+            idx = bisect.bisect_right(self.timestamps, before.timestamp())
+            if idx < len(self.offsets):
+                end = self.offsets[idx]
+        return start, end
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "inode": self.inode,
+            "size": self.size,
+            "mtime": self.mtime,
+            "timestamps": self.timestamps,
+            "offsets": self.offsets,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LogFileIndex":
+        return cls(
+            inode=int(data["inode"]),
+            size=int(data["size"]),
+            mtime=float(data["mtime"]),
+            timestamps=list(map(float, data["timestamps"])),
+            offsets=list(map(int, data["offsets"])),
+        )
+
+
+class LogFolderIndex:
+    """Indexes of all log files of a folder persisted to a sidecar file."""
+
+    def __init__(self, log_folder: Path) -> None:
+        self._index_path = log_folder / index_filename
+        self._lock = threading.Lock()
+        self._files: dict[int, LogFileIndex] = self._load()
+
+    def _load(self) -> dict[int, LogFileIndex]:
+        if not self._index_path.is_file():
+            return {}
+        try:
+            data = json.loads(self._index_path.read_text())
+            return {
+                int(inode): LogFileIndex.from_dict(file_data)
+                for inode, file_data in data.get("files", {}).items()
+            }
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Can't read log index {self._index_path}")
+            return {}
+
+    def _save(self) -> None:
+        data = {
+            "files": {
+                str(inode): index.to_dict()
+                for inode, index in self._files.items()
+            }
+        }
+        tmp_path = self._index_path.with_suffix(".tmp")
+        try:
+            tmp_path.write_text(json.dumps(data))
+            tmp_path.replace(self._index_path)
+        except OSError:
+            logger.warning(f"Can't write log index {self._index_path}")
+
+    def get(self, paths: list[Path]) -> dict[Path, LogFileIndex]:
+        """Up-to-date indexes of given log files."""
+        result: dict[Path, LogFileIndex] = {}
+        with self._lock:
+            changed = False
+            alive_inodes = set()
+            for path in paths:
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                alive_inodes.add(stat.st_ino)
+                index = self._files.get(stat.st_ino)
+                if index is None:
+                    index = LogFileIndex(inode=stat.st_ino)
+                    self._files[stat.st_ino] = index
+                changed |= index.update(path, stat)
+                result[path] = index
+            for inode in set(self._files) - alive_inodes:
+                del self._files[inode]
+                changed = True
+            if changed:
+                self._save()
+        return result
+
+
+_folder_indexes: dict[Path, LogFolderIndex] = {}
+_folder_indexes_lock = threading.Lock()
+
+
+def get_log_folder_index(log_folder: Path) -> LogFolderIndex:
+    with _folder_indexes_lock:
+        index = _folder_indexes.get(log_folder)
+        if index is None:
+            index = LogFolderIndex(log_folder)
+            _folder_indexes[log_folder] = index
+        return index
@@ -1,67 +1,252 @@
 import json
 import logging
-from collections.abc import Generator
+import os
+import re
+from collections.abc import Generator, Iterable, Iterator
 from datetime import datetime
-from functools import partial
-from itertools import islice
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, TextIO, cast
 
 from qualibrate.utils.logger_m import LazyInitLogger, logger
-from qualibrate.utils.logger_utils.filters import filter_log_date
 from qualibrate_config.models import QualibrateConfig
 
 __all__ = [
+    "parse_asctime",
     "parse_log_line",
     "parse_log_line_with_previous",
+    "parse_log_lines",
     "get_logs_from_qualibrate_files",
     "get_logs_from_qualibrate_in_memory_storage",
+    "get_qualibrate_log_files",
+    "iter_log_entries_reversed",
+    "parse_log_line_timestamp",
 ]
 
 default_asctime_log_format = "%Y-%m-%d %H:%M:%S,%f"
+_asctime_seconds_format = "%Y-%m-%d %H:%M:%S"
+read_block_size = 64 * 1024
+_rotated_log_file_re = re.compile(r"^qualibrate\.log(?:\.(\d+))?$")
 
 
-def parse_log_line(
-    line: str, previous_msg: dict[str, Any] | None = None
-) -> dict[str, Any]:
+@lru_cache(maxsize=4096)
+def _parse_asctime_seconds(value: str) -> datetime:
+    return datetime.strptime(value, _asctime_seconds_format)
+
+
+def parse_asctime(value: str) -> datetime:
+    """
+    Decode `asctime` of a log record (`%Y-%m-%d %H:%M:%S,%f`).
+
+    Records are written in bursts, so many consecutive records share the
+    same second. The `%Y-%m-%d %H:%M:%S` part is decoded once per second
+    and cached, only milliseconds are parsed for every record. Values of
+    other shape are decoded with `datetime.strptime`.
+    """
+    if len(value) == 23 and value[19] == "," and value[20:].isdigit():
+        return _parse_asctime_seconds(value[:19]).replace(
+            microsecond=int(value[20:]) * 1000
+        )
+    return datetime.strptime(value, default_asctime_log_format)
+
+
+def _parse_header_line(line: str) -> dict[str, Any] | None:
+    """Parsed log record header line. None for continuation lines."""
     # JSON format
     if line.startswith("{"):
         try:
-            data = dict(json.loads(line))
+            data: dict[str, Any] = json.loads(line)
         except json.decoder.JSONDecodeError as ex:
             logging.exception(f"Can't parse line {line}", exc_info=ex)
             return {}
         if "asctime" in data:
-            data["asctime"] = datetime.strptime(
-                data["asctime"], default_asctime_log_format
-            )
+            data["asctime"] = parse_asctime(data["asctime"])
         return data
     # old default-string-format
     parts = line.split(" - ", maxsplit=3)
     if len(parts) == 4:
         return {
-            "asctime": datetime.strptime(parts[0], default_asctime_log_format),
+            "asctime": parse_asctime(parts[0]),
             "name": parts[1],
             "levelname": parts[2],
             "message": parts[3].rstrip(),
         }
+    return None
+
+
+def parse_log_line(
+    line: str, previous_msg: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    header = _parse_header_line(line)
+    if header is not None:
+        return header
     if previous_msg is None:
         return {"message": line.rstrip()}
-    copied = previous_msg.copy()
-    copied["message"] = line.rstrip()
-    return copied
+    return {**previous_msg, "message": line.rstrip()}
+
+
+def _parse_json_lines(lines: list[str]) -> list[dict[str, Any]]:
+    """
+    Parse JSON log lines decoding the whole block as a single JSON array.
+
+    Lines are parsed one by one if the block can't be decoded at once
+    (e.g. it contains a broken line) or a line isn't decoded to a single
+    record (e.g. a line with several comma separated objects).
+    """
+    try:
+        records = json.loads(f"[{','.join(lines)}]")
+    except json.decoder.JSONDecodeError:
+        records = None
+    if (
+        not isinstance(records, list)
+        or len(records) != len(lines)
+        or not all(isinstance(record, dict) for record in records)
+    ):
+        return [
+            cast(dict[str, Any], _parse_header_line(line)) for line in lines
+        ]
+    for record in records:
+        if "asctime" in record:
+            record["asctime"] = parse_asctime(record["asctime"])
+    return records
+
+
+def parse_log_lines(
+    lines: Iterable[str], previous_msg: dict[str, Any] | None = None
+) -> list[dict[str, Any]]:
+    """
+    Parse a block of log lines at once.
+
+    Produces the same entries as calling `parse_log_line` for every line
+    with the previous entry. JSON records of the block are decoded by a
+    single `json.loads` call and continuation lines of multi-line messages
+    are built from their header entry.
+
+    Args:
+        lines: Lines in the order they are written.
+        previous_msg: Entry preceding the block (e.g. the last entry of the
+            previous block).
+    """
+    lines = list(lines)
+    json_records = iter(
+        _parse_json_lines([line for line in lines if line.startswith("{")])
+    )
+    entries: list[dict[str, Any]] = []
+    append = entries.append
+    header = previous_msg
+    for line in lines:
+        entry: dict[str, Any] | None
+        if line.startswith("{"):
+            entry = next(json_records)
+        else:
+            entry = _parse_header_line(line)
+        if entry is not None:
+            header = entry
+        elif header is None:
+            entry = {"message": line.rstrip()}
+        else:
+            entry = {**header, "message": line.rstrip()}
+        append(entry)
+    return entries
 
 
 def parse_log_line_with_previous(
     file: TextIO,
 ) -> Generator[dict[str, Any], None, None]:
     previous = None
-    for line in file:
-        previous = parse_log_line(line, previous)
-        try:
-            yield previous
-        except TypeError as e:
-            logging.exception(line, exc_info=e)
+    while lines := file.readlines(read_block_size):
+        entries = parse_log_lines(lines, previous)
+        previous = entries[-1]
+        yield from entries
+
+
+def parse_log_line_timestamp(line: str) -> datetime | None:
+    """Timestamp of the log record header line. None for other lines."""
+    try:
+        header = _parse_header_line(line)
+    except ValueError:
+        return None
+    asctime = header.get("asctime") if header is not None else None
+    return asctime if isinstance(asctime, datetime) else None
+
+
+def _iter_lines_reversed(
+    file_path: Path,
+    block_size: int = read_block_size,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[str]:
+    """
+    Lines of file from the last to the first one, read in blocks.
+
+    Only byte range [start, end) is read, both offsets have to be starts of
+    lines.
+    """
+    with open(file_path, "rb") as f:
+        file_end = f.seek(0, os.SEEK_END)
+        position = file_end if end is None else min(end, file_end)
+        remainder = b""
+        while position > start:
+            read_size = min(block_size, position - start)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + remainder
+            lines = block.split(b"\n")
+            # First line can be incomplete, keep it for the next block
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line.decode("utf-8", errors="replace")
+        if remainder:
+            yield remainder.decode("utf-8", errors="replace")
+
+
+def iter_log_entries_reversed(
+    file_path: Path,
+    block_size: int = read_block_size,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Parsed log entries of the file from the newest to the oldest.
+
+    Produces the same entries as `parse_log_line_with_previous` in reverse
+    order. Continuation lines of multi-line messages are read before their
+    header line, so they are buffered until the header is parsed.
+    Continuation lines without header (at the start of the file) are skipped.
+    """
+    continuation: list[str] = []
+    for line in _iter_lines_reversed(file_path, block_size, start, end):
+        header = _parse_header_line(line)
+        if header is None:
+            continuation.append(line)
+            continue
+        for continuation_line in continuation:
+            yield {**header, "message": continuation_line.rstrip()}
+        continuation.clear()
+        yield header
+
+
+def _log_file_rotation_idx(file_path: Path) -> int:
+    match = _rotated_log_file_re.match(file_path.name)
+    return int(match.group(1) or 0) if match else -1
+
+
+def get_qualibrate_log_files(log_folder: Path) -> list[Path]:
+    """
+    Qualibrate log files from the newest to the oldest.
+
+    The current file is `qualibrate.log`, rotated files are
+    `qualibrate.log.1` (newest), `qualibrate.log.2`, ...
+    """
+    return sorted(
+        (
+            path
+            for path in log_folder.glob("qualibrate.log*")
+            if _log_file_rotation_idx(path) >= 0 and path.is_file()
+        ),
+        key=_log_file_rotation_idx,
+    )
 
 
 def get_logs_from_qualibrate_files(
@@ -71,20 +256,43 @@ def get_logs_from_qualibrate_files(
     *,
     config: QualibrateConfig,
 ) -> list[dict[str, Any]]:
+    """
+    Latest `num_entries` log entries within the time range.
+
+    Files are read from the end backwards, so only the required tail of the
+    logs is parsed. Reading is stopped as soon as enough entries are
+    collected or an entry older than `after` is reached. For time window
+    queries the sidecar index narrows each file to the relevant byte range.
+    """
+    # Index depends on the parser
+    from qualibrate_runner.utils.logs_index import get_log_folder_index
+
     log_folder = config.log_folder
-    if log_folder is None:
+    if log_folder is None or num_entries <= 0:
         return []
     out_logs: list[dict[str, Any]] = []
-    q_log_files = filter(Path.is_file, log_folder.glob("qualibrate.log*"))
-    filter_log_date_range = partial(filter_log_date, after=after, before=before)
-    for log_file in sorted(q_log_files):
-        with open(log_file) as f:
-            filtered = list(
-                filter(filter_log_date_range, parse_log_line_with_previous(f))
-            )
-            lines_date_filtered = reversed(filtered)
-            file_logs = islice(lines_date_filtered, num_entries - len(out_logs))
-            out_logs.extend(file_logs)
+    log_files = get_qualibrate_log_files(log_folder)
+    indexes = (
+        get_log_folder_index(log_folder).get(log_files)
+        if after is not None or before is not None
+        else {}
+    )
+    for log_file in log_files:
+        file_index = indexes.get(log_file)
+        start, end = (
+            file_index.byte_range(after, before)
+            if file_index is not None
+            else (0, None)
+        )
+        for entry in iter_log_entries_reversed(log_file, start=start, end=end):
+            asctime = entry.get("asctime")
+            if not isinstance(asctime, datetime):
+                continue
+            if after is not None and asctime < after:
+                return list(reversed(out_logs))
+            if before is not None and asctime > before:
+                continue
+            out_logs.append(entry)
             if len(out_logs) == num_entries:
                 return list(reversed(out_logs))
     return list(reversed(out_logs))
@@ -0,0 +1,142 @@
+"""
+Micro-benchmark of qualibrate log file parsing.
+
+Compares the line by line parser with `datetime.strptime` decoding and dict
+copies for continuation lines (implementation used before batch parsing)
+against `parse_log_line` and the batch `parse_log_lines`.
+
+Not collected by pytest. Run with:
+
+    python -m tests.benchmarks.bench_logs_parser --lines 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from qualibrate_runner.utils.logs_parser import (
+    default_asctime_log_format,
+    parse_log_line,
+    parse_log_lines,
+    read_block_size,
+)
+
+
+def reference_parse_log_line(
+    line: str, previous_msg: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    if line.startswith("{"):
+        data = dict(json.loads(line))
+        if "asctime" in data:
+            data["asctime"] = datetime.strptime(
+                data["asctime"], default_asctime_log_format
+            )
+        return data
+    parts = line.split(" - ", maxsplit=3)
+    if len(parts) == 4:
+        return {
+            "asctime": datetime.strptime(parts[0], default_asctime_log_format),
+            "name": parts[1],
+            "levelname": parts[2],
+            "message": parts[3].rstrip(),
+        }
+    if previous_msg is None:
+        return {"message": line.rstrip()}
+    copied = previous_msg.copy()
+    copied["message"] = line.rstrip()
+    return copied
+
+
+def write_fixture(path: Path, num_lines: int) -> None:
+    """
+    Write log file similar to real ones.
+
+    Records are JSON, several records are written per second and every
+    tenth record has a three lines traceback.
+    """
+    start = datetime(2024, 1, 15, 10, 0, 0)
+    with path.open("w") as f:
+        written = 0
+        i = 0
+        while written < num_lines:
+            asctime = (start + timedelta(milliseconds=i * 50)).strftime(
+                default_asctime_log_format
+            )[:-3]
+            record = {
+                "asctime": asctime,
+                "name": "qualibrate",
+                "levelname": "INFO",
+                "message": f"Node iteration {i} finished",
+            }
+            f.write(json.dumps(record) + "\n")
+            written += 1
+            if i % 10 == 0:
+                f.write("Traceback (most recent call last):\n")
+                f.write('  File "node.py", line 10, in <module>\n')
+                f.write("ValueError: failed\n")
+                written += 3
+            i += 1
+
+
+def _line_by_line(
+    parser: Callable[[str, dict[str, Any] | None], dict[str, Any]],
+) -> Callable[[Path], Iterator[dict[str, Any]]]:
+    def parse(path: Path) -> Iterator[dict[str, Any]]:
+        previous = None
+        with path.open() as f:
+            for line in f:
+                previous = parser(line, previous)
+                yield previous
+
+    return parse
+
+
+def _batch(path: Path) -> Iterator[dict[str, Any]]:
+    previous = None
+    with path.open() as f:
+        while lines := f.readlines(read_block_size):
+            entries = parse_log_lines(lines, previous)
+            previous = entries[-1]
+            yield from entries
+
+
+def run(num_lines: int, repeat: int) -> None:
+    parsers = {
+        "reference (strptime, copies)": _line_by_line(reference_parse_log_line),
+        "parse_log_line": _line_by_line(parse_log_line),
+        "parse_log_lines (batch)": _batch,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "qualibrate.log"
+        write_fixture(path, num_lines)
+        results: dict[str, float] = {}
+        for name, parse in parsers.items():
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                count = sum(1 for _ in parse(path))
+                best = min(best, time.perf_counter() - started)
+            results[name] = best
+            print(
+                f"{name:32} {best:8.3f} s  {count / best:12,.0f} lines/s  "
+                f"x{results[next(iter(results))] / best:.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.lines, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
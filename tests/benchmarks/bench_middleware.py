@@ -0,0 +1,158 @@
+"""
+Benchmark of the request timing middleware under concurrent load.
+
+Compares the `BaseHTTPMiddleware` timing middleware (implementation used
+before the pure ASGI one) against the pure ASGI `ProcessTimeMiddleware`
+with `TimedRoute` routes. An application without any middleware is the
+baseline. Requests are sent concurrently through the in-process ASGI
+transport, so only the application and middleware overhead is measured.
+
+Not collected by pytest. Run with:
+
+    python -m tests.benchmarks.bench_middleware --requests 5000 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Callable
+
+import httpx
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from starlette.middleware.base import (
+    BaseHTTPMiddleware,
+    RequestResponseEndpoint,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+from qualibrate_runner.api.middleware.process_time import (
+    ProcessTimeMiddleware,
+    TimedRoute,
+    get_route_template,
+)
+from qualibrate_runner.core.metrics import http_request_duration
+
+
+class ReferenceProcessTimeMiddleware(BaseHTTPMiddleware):
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        process_time = time.perf_counter() - start_time
+        response.headers["X-Process-Time"] = str(process_time)
+        http_request_duration.observe(
+            process_time,
+            request.method,
+            get_route_template(request.scope),
+            str(response.status_code),
+        )
+        return response
+
+
+def create_app(
+    middleware: Callable[[ASGIApp], ASGIApp] | None,
+    route_class: type[APIRoute] = APIRoute,
+) -> FastAPI:
+    """Application with an async and a sync route returning small JSON."""
+    app = FastAPI()
+    if middleware is not None:
+        app.add_middleware(middleware)
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/async/{name}")
+    async def async_route(name: str) -> dict[str, str]:
+        return {"name": name, "status": "finished"}
+
+    @router.get("/sync/{name}")
+    def sync_route(name: str) -> dict[str, str]:
+        return {"name": name, "status": "finished"}
+
+    app.include_router(router)
+    return app
+
+
+async def load(
+    app: FastAPI, path: str, num_requests: int, concurrency: int
+) -> tuple[float, list[float]]:
+    """Send requests with `concurrency` clients. Returns wall time and
+    latencies of every request."""
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                started = time.perf_counter()
+                response = await client.get(path)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        per_worker, rest = divmod(num_requests, concurrency)
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                worker(per_worker + (1 if idx < rest else 0))
+                for idx in range(concurrency)
+            )
+        )
+        return time.perf_counter() - started, latencies
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+def run(num_requests: int, concurrency: int, repeat: int) -> None:
+    apps: dict[str, Callable[[], FastAPI]] = {
+        "no middleware": lambda: create_app(None),
+        "BaseHTTPMiddleware (reference)": lambda: create_app(
+            ReferenceProcessTimeMiddleware
+        ),
+        "pure ASGI + Server-Timing": lambda: create_app(
+            ProcessTimeMiddleware, TimedRoute
+        ),
+    }
+    for path in ("/async/node", "/sync/node"):
+        print(f"{path}: {num_requests} requests, concurrency {concurrency}")
+        results: dict[str, float] = {}
+        for name, factory in apps.items():
+            app = factory()
+            # Warm up routing and dependency caches
+            asyncio.run(load(app, path, concurrency, concurrency))
+            best = float("inf")
+            best_latencies: list[float] = []
+            for _ in range(repeat):
+                elapsed, latencies = asyncio.run(
+                    load(app, path, num_requests, concurrency)
+                )
+                if elapsed < best:
+                    best, best_latencies = elapsed, latencies
+            results[name] = best
+            print(
+                f"  {name:32} {num_requests / best:9,.0f} req/s  "
+                f"p50 {_percentile(best_latencies, 50) * 1000:7.2f} ms  "
+                f"p99 {_percentile(best_latencies, 99) * 1000:7.2f} ms  "
+                f"x{results[next(iter(results))] / best:.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+"""
+Benchmark suite of the runner hot paths with stored baselines.
+
+Cases run offline on a synthetic library: nodes of tests/fixtures/test_nodes
+plus generated nodes and a graph chaining some of them. The graph is run
+once, so status cases measure a finished graph with a full execution
+history.
+
+- `library_scan`: load (import and index) the whole library;
+- `get_nodes_encode`: serialize and encode the `/get_nodes` payload;
+- `run_status`: build and dump the graph run status without memoized parts;
+- `execution_history`: get and dump the graph execution history;
+- `ws_broadcast_fanout`: deliver a status frame to every connected client;
+- `parse_log_line`: parse a log file line by line.
+
+Median time of a case is compared with the stored baseline and the case is
+reported as a regression if it's slower than the baseline by more than the
+tolerance. Baselines depend on the machine, so they have to be saved on the
+machine used for comparison (`--save-baseline`).
+
+Not collected by pytest. Run with:
+
+    python -m tests.benchmarks.bench_suite
+    python -m tests.benchmarks.bench_suite --save-baseline
+    python -m tests.benchmarks.bench_suite --cases run_status parse_log_line
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+from fastapi import WebSocket
+from qualibrate_config.models import CalibrationLibraryConfig
+
+from qualibrate_runner.config.models import State
+from qualibrate_runner.core.app.ws_manager import SocketConnectionManagerList
+from qualibrate_runner.core.library_manager import LibraryManager
+from qualibrate_runner.core.payload_cache import EncodedPayload
+from qualibrate_runner.core.run_job import run_workflow
+from qualibrate_runner.core.statuses import (
+    clear_status_cache,
+    get_graph_execution_history,
+    get_run_status,
+)
+from qualibrate_runner.utils.json_encoder import encode_json
+from qualibrate_runner.utils.logs_parser import parse_log_line
+from tests.benchmarks.bench_logs_parser import write_fixture
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+TEST_NODES_PATH = Path(__file__).parent.parent / "fixtures" / "test_nodes"
+GRAPH_NAME = "bench_graph"
+
+NODE_FILE_TEMPLATE = '''
+from typing import Any
+
+from pydantic import Field
+from qualibrate import NodeParameters, QualibrationNode
+
+
+class Parameters(NodeParameters):
+    """Parameters of a generated benchmark node."""
+
+    qubits: list[str] = ["q0", "q1", "q2", "q3"]
+    amplitude: float = Field(default=0.5, ge=0.0, le=1.0)
+    frequency: float = Field(default=5.0e9, gt=0.0)
+    num_points: int = Field(default=100, ge=1)
+
+
+node = QualibrationNode(name="{name}", parameters=Parameters())
+
+
+@node.run_action
+def measure(node: QualibrationNode[Parameters, Any]) -> dict[str, Any]:
+    amplitude = node.parameters.amplitude
+    num_points = node.parameters.num_points
+    return {{"data": [amplitude * i for i in range(num_points)]}}
+
+
+@node.run_action
+def analyse(node: QualibrationNode[Parameters, Any]) -> dict[str, Any]:
+    data = node.namespace["data"]
+    node.outcomes = {{q: "successful" for q in node.parameters.qubits}}
+    return {{"mean": sum(data) / len(data), "max": max(data)}}
+
+
+node.results = node.namespace
+'''
+
+GRAPH_FILE_TEMPLATE = """
+from qualibrate import QualibrationGraph, QualibrationLibrary
+from qualibrate.parameters import GraphParameters
+
+
+class Parameters(GraphParameters):
+    qubits: list[str] = ["q0", "q1", "q2", "q3"]
+
+
+library = QualibrationLibrary.get_active_library()
+names = {names!r}
+graph = QualibrationGraph(
+    name="{name}",
+    parameters=Parameters(),
+    nodes={{name: library.nodes[name] for name in names}},
+    connectivity=list(zip(names, names[1:])),
+)
+"""
+
+
+@dataclass
+class Case:
+    """
+    Benchmarked operation.
+
+    Args:
+        name: Name of the case in reports and baselines.
+        func: Benchmarked operation.
+        items: Number of items processed by a single call (throughput).
+        number: Calls per timed sample, so short operations are measurable.
+    """
+
+    name: str
+    func: Callable[[], Any]
+    items: int = 1
+    number: int = 1
+
+
+@dataclass
+class CaseResult:
+    """Timings of a case in seconds per call."""
+
+    median: float
+    min: float
+    items: int
+
+    def to_dict(self) -> dict[str, float]:
+        return {"median": self.median, "min": self.min, "items": self.items}
+
+
+def build_library(folder: Path, num_nodes: int, graph_nodes: int) -> None:
+    """
+    Library with fixture nodes and generated nodes (`num_nodes` in total)
+    and a graph chaining the first `graph_nodes` generated nodes.
+    """
+    shutil.copytree(
+        TEST_NODES_PATH,
+        folder,
+        ignore=shutil.ignore_patterns("__pycache__", "__init__.py"),
+    )
+    fixture_nodes = len(list(folder.glob("*.py")))
+    names = [
+        f"bench_node_{idx:04d}"
+        for idx in range(max(num_nodes - fixture_nodes, graph_nodes))
+    ]
+    for name in names:
+        (folder / f"{name}.py").write_text(NODE_FILE_TEMPLATE.format(name=name))
+    (folder / f"{GRAPH_NAME}.py").write_text(
+        GRAPH_FILE_TEMPLATE.format(name=GRAPH_NAME, names=names[:graph_nodes])
+    )
+
+
+def _library_config(folder: Path) -> CalibrationLibraryConfig:
+    return CalibrationLibraryConfig(
+        {"folder": str(folder), "resolver": "qualibrate.QualibrationLibrary"}
+    )
+
+
+class _CountingWebSocket:
+    """Websocket counting delivered frames of all fake clients."""
+
+    def __init__(self, delivered: Callable[[], None]) -> None:
+        self._delivered = delivered
+
+    async def accept(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        self._delivered()
+
+
+@contextmanager
+def ws_fanout(message: Any, clients: int) -> Iterator[Callable[[], None]]:
+    """Broadcast function delivering `message` to all `clients`."""
+    loop = asyncio.new_event_loop()
+    pending = 0
+    done = asyncio.Event()
+
+    def delivered() -> None:
+        nonlocal pending
+        pending -= 1
+        if pending == 0:
+            done.set()
+
+    manager = SocketConnectionManagerList()
+
+    async def connect() -> None:
+        for _ in range(clients):
+            websocket = _CountingWebSocket(delivered)
+            await manager.connect(cast(WebSocket, websocket))
+
+    async def broadcast() -> None:
+        nonlocal pending
+        pending = clients
+        done.clear()
+        await manager.broadcast(message)
+        await done.wait()
+
+    async def disconnect() -> None:
+        for websocket in manager.active_connections:
+            manager.disconnect(websocket)
+        # Let cancelled writer tasks of subscribers finish
+        writers = asyncio.all_tasks() - {asyncio.current_task()}
+        await asyncio.gather(*writers, return_exceptions=True)
+
+    loop.run_until_complete(connect())
+    try:
+        yield lambda: loop.run_until_complete(broadcast())
+    finally:
+        loop.run_until_complete(disconnect())
+        loop.close()
+
+
+def _parse_lines(path: Path) -> None:
+    previous = None
+    with path.open() as f:
+        for line in f:
+            previous = parse_log_line(line, previous)
+
+
+def _run_status_dump(state: State) -> dict[str, Any]:
+    clear_status_cache()
+    return get_run_status(state).model_dump(mode="json")
+
+
+def _execution_history_dump(state: State) -> str:
+    history = get_graph_execution_history(state)
+    assert history is not None
+    return encode_json([item.model_dump(mode="json") for item in history.items])
+
+
+def measure(case: Case, repeat: int) -> CaseResult:
+    case.func()  # warm up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(case.number):
+            case.func()
+        samples.append((time.perf_counter() - started) / case.number)
+    return CaseResult(
+        median=statistics.median(samples), min=min(samples), items=case.items
+    )
+
+
+def run_cases(
+    args: argparse.Namespace, selected: set[str]
+) -> dict[str, CaseResult]:
+    results: dict[str, CaseResult] = {}
+
+    def run(case: Case, repeat: int = args.repeat) -> None:
+        if case.name not in selected:
+            return
+        print(f"running {case.name}...", file=sys.stderr)
+        results[case.name] = measure(case, repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        log_file = tmp_path / "qualibrate.log"
+        write_fixture(log_file, args.log_lines)
+        run(
+            Case(
+                "parse_log_line", lambda: _parse_lines(log_file), args.log_lines
+            )
+        )
+        if not selected - {"parse_log_line"}:
+            return results
+
+        folder = tmp_path / "library"
+        build_library(folder, args.nodes, args.graph_nodes)
+        config = _library_config(folder)
+        run(
+            Case(
+                "library_scan",
+                lambda: LibraryManager(config, None).get_library(),
+                args.nodes,
+            ),
+            # Scanning the library imports every file, it's slow
+            repeat=max(1, args.repeat // 2),
+        )
+
+        manager = LibraryManager(config, None)
+        library = manager.get_library()
+        nodes_payload = manager.nodes_payload()
+        run(
+            Case(
+                "get_nodes_encode",
+                lambda: EncodedPayload.from_content(nodes_payload),
+                len(nodes_payload),
+                number=5,
+            )
+        )
+
+        state = State()
+        run_workflow(library.graphs[GRAPH_NAME], {}, state)
+        run(
+            Case(
+                "run_status",
+                lambda: _run_status_dump(state),
+                number=200,
+            )
+        )
+        run(
+            Case(
+                "execution_history",
+                lambda: _execution_history_dump(state),
+                args.graph_nodes,
+                number=20,
+            )
+        )
+        with ws_fanout(_run_status_dump(state), args.clients) as broadcast:
+            run(
+                Case(
+                    "ws_broadcast_fanout",
+                    broadcast,
+                    args.clients,
+                    number=50,
+                )
+            )
+    return results
+
+
+def _parameters(args: argparse.Namespace) -> dict[str, int]:
+    return {
+        "nodes": args.nodes,
+        "graph_nodes": args.graph_nodes,
+        "clients": args.clients,
+        "log_lines": args.log_lines,
+    }
+
+
+def load_baseline(path: Path) -> dict[str, Any]:
+    if not path.is_file():
+        return {"cases": {}}
+    return cast(dict[str, Any], json.loads(path.read_text()))
+
+
+def save_baseline(
+    path: Path, args: argparse.Namespace, results: dict[str, CaseResult]
+) -> None:
+    # Cases not run this time keep their previous baselines
+    cases = load_baseline(path)["cases"]
+    cases.update({name: result.to_dict() for name, result in results.items()})
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "parameters": _parameters(args),
+        "cases": dict(sorted(cases.items())),
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:8.3f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.3f} ms"
+    return f"{seconds * 1e6:8.3f} us"
+
+
+def compare(
+    results: dict[str, CaseResult],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[dict[str, Any]]:
+    """Comparison of results with the baseline medians."""
+    report = []
+    for name, result in results.items():
+        entry: dict[str, Any] = {
+            "case": name,
+            "median": result.median,
+            "min": result.min,
+            "throughput": result.items / result.median,
+            "baseline": None,
+            "change": None,
+            "status": "new",
+        }
+        reference = baseline.get(name)
+        if reference is not None:
+            ratio = result.median / reference["median"]
+            entry["baseline"] = reference["median"]
+            entry["change"] = ratio - 1
+            if ratio > 1 + tolerance:
+                entry["status"] = "REGRESSION"
+            elif ratio < 1 / (1 + tolerance):
+                entry["status"] = "improved"
+            else:
+                entry["status"] = "ok"
+        report.append(entry)
+    return report
+
+
+def print_report(report: list[dict[str, Any]]) -> None:
+    print(
+        f"{'case':22} {'baseline':>11} {'median':>11} {'min':>11} "
+        f"{'items/s':>13} {'change':>8}  status"
+    )
+    for entry in report:
+        baseline = (
+            _format_time(entry["baseline"])
+            if entry["baseline"] is not None
+            else f"{'-':>11}"
+        )
+        change = (
+            f"{entry['change']:+8.1%}"
+            if entry["change"] is not None
+            else f"{'-':>8}"
+        )
+        print(
+            f"{entry['case']:22} {baseline} {_format_time(entry['median'])} "
+            f"{_format_time(entry['min'])} {entry['throughput']:13,.0f} "
+            f"{change}  {entry['status']}"
+        )
+
+
+CASES = (
+    "library_scan",
+    "get_nodes_encode",
+    "run_status",
+    "execution_history",
+    "ws_broadcast_fanout",
+    "parse_log_line",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--nodes", type=int, default=500)
+    parser.add_argument("--graph-nodes", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--log-lines", type=int, default=200_000)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown relative to the baseline (0.25 is 25%%).",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store results as the new baseline instead of failing.",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write the comparison report as JSON."
+    )
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    if baseline.get("parameters", _parameters(args)) != _parameters(args):
+        print(
+            "Warning: baseline was saved with different parameters "
+            f"{baseline['parameters']}",
+            file=sys.stderr,
+        )
+    results = run_cases(args, set(args.cases))
+    report = compare(results, baseline["cases"], args.tolerance)
+    print_report(report)
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        save_baseline(args.baseline, args, results)
+        print(f"Baseline saved to {args.baseline}")
+    elif any(entry["status"] == "REGRESSION" for entry in report):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+"""
+Integration tests for the lazily loaded calibration library.
+
+Tests use a copy of tests/fixtures/test_nodes/ and check that node payloads
+are served from the persisted index without importing node scripts.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from qualibrate import (
+    QualibrationGraph,
+    QualibrationLibrary,
+    QualibrationNode,
+)
+from qualibrate_config.models import CalibrationLibraryConfig
+
+from qualibrate_runner.core import library_manager
+from qualibrate_runner.core.library_manager import LibraryManager
+
+TEST_NODES_PATH = Path(__file__).parent.parent / "fixtures" / "test_nodes"
+
+GRAPH_FILE_CONTENT = """
+from qualibrate import QualibrationGraph, QualibrationLibrary
+from qualibrate.parameters import GraphParameters
+
+
+class Parameters(GraphParameters):
+    qubits: list[str] = []
+
+
+library = QualibrationLibrary.get_active_library()
+graph = QualibrationGraph(
+    name="simple_graph",
+    parameters=Parameters(),
+    nodes={
+        "first": library.nodes["node_can_raise_in_body"],
+        "second": library.nodes["node_with_subroutine"],
+    },
+    connectivity=[("first", "second")],
+)
+"""
+
+
+@pytest.fixture
+def library_folder(tmp_path: Path) -> Path:
+    folder = tmp_path / "library"
+    shutil.copytree(
+        TEST_NODES_PATH,
+        folder,
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    return folder
+
+
+@pytest.fixture
+def config(library_folder: Path) -> CalibrationLibraryConfig:
+    return CalibrationLibraryConfig(
+        {
+            "folder": str(library_folder),
+            "resolver": "qualibrate.QualibrationLibrary",
+        }
+    )
+
+
+@pytest.fixture
+def index_path(tmp_path: Path) -> Path:
+    return tmp_path / "library_index.json"
+
+
+@pytest.fixture
+def scanned_files(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    scanned: list[str] = []
+    scan_node_file = QualibrationNode.scan_node_file
+    scan_graph_file = QualibrationGraph.scan_graph_file
+
+    def counting_node_scan(file: Path, nodes: dict[str, Any]) -> None:
+        scanned.append(file.name)
+        scan_node_file(file, nodes)
+
+    def counting_graph_scan(file: Path, graphs: dict[str, Any]) -> None:
+        scanned.append(file.name)
+        scan_graph_file(file, graphs)
+
+    monkeypatch.setattr(QualibrationNode, "scan_node_file", counting_node_scan)
+    monkeypatch.setattr(
+        QualibrationGraph, "scan_graph_file", counting_graph_scan
+    )
+    return scanned
+
+
+def _rename_node(
+    library_folder: Path, file_name: str, old: str, new: str
+) -> None:
+    node_file = library_folder / file_name
+    node_file.write_text(
+        node_file.read_text().replace(f'name="{old}"', f'name="{new}"')
+    )
+
+
+class TestLibraryManager:
+    def test_payloads_match_library(
+        self, config: CalibrationLibraryConfig, index_path: Path
+    ) -> None:
+        manager = LibraryManager(config, index_path)
+        nodes = manager.nodes_payload()
+        assert set(nodes) == {
+            "node_with_actions",
+            "node_with_subroutine",
+            "node_can_raise_in_body",
+        }
+        assert not manager.is_loaded
+        assert index_path.is_file()
+
+        library = manager.get_library()
+        assert manager.is_loaded
+        assert nodes == jsonable_encoder(
+            {
+                name: node.serialize(exclude_targets=False)
+                for name, node in library.nodes.items_nocopy()
+            }
+        )
+        node = library.nodes.get_nocopy("node_with_actions")
+        assert manager.node_payload("node_with_actions") == jsonable_encoder(
+            node.serialize(exclude_targets=True)
+        )
+
+    def test_index_reused_without_imports(
+        self,
+        config: CalibrationLibraryConfig,
+        index_path: Path,
+        scanned_files: list[str],
+    ) -> None:
+        expected = LibraryManager(config, index_path).nodes_payload()
+        scanned_files.clear()
+
+        manager = LibraryManager(config, index_path)
+        assert manager.nodes_payload() == expected
+        assert manager.node_payload("node_with_actions") is not None
+        assert manager.node_payload("unknown") is None
+        assert manager.graphs_payload() == {}
+        assert scanned_files == []
+        assert not manager.is_loaded
+
+    def test_touched_file_not_imported(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+        scanned_files: list[str],
+    ) -> None:
+        LibraryManager(config, index_path).nodes_payload()
+        scanned_files.clear()
+        node_file = library_folder / "node_with_actions.py"
+        stat = node_file.stat()
+        os.utime(node_file, (stat.st_atime, stat.st_mtime + 10))
+
+        LibraryManager(config, index_path).nodes_payload()
+        assert scanned_files == []
+
+    def test_changed_file_imported_alone(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+        scanned_files: list[str],
+    ) -> None:
+        LibraryManager(config, index_path).nodes_payload()
+        scanned_files.clear()
+        _rename_node(
+            library_folder,
+            "node_with_actions.py",
+            "node_with_actions",
+            "renamed_node",
+        )
+
+        nodes = LibraryManager(config, index_path).nodes_payload()
+        assert scanned_files == ["node_with_actions.py"]
+        assert "renamed_node" in nodes
+        assert "node_with_actions" not in nodes
+
+    def test_removed_file_dropped(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+    ) -> None:
+        LibraryManager(config, index_path).nodes_payload()
+        (library_folder / "node_with_actions.py").unlink()
+
+        manager = LibraryManager(config, index_path)
+        assert "node_with_actions" not in manager.nodes_payload()
+        assert manager.get_node("node_with_actions") is None
+
+    def test_get_node_imports_single_file(
+        self,
+        config: CalibrationLibraryConfig,
+        index_path: Path,
+        scanned_files: list[str],
+    ) -> None:
+        LibraryManager(config, index_path).nodes_payload()
+        scanned_files.clear()
+
+        manager = LibraryManager(config, index_path)
+        node = manager.get_node("node_with_subroutine")
+        assert node is not None
+        assert node.name == "node_with_subroutine"
+        assert manager.get_node("node_with_subroutine") is node
+        assert scanned_files == ["node_with_subroutine.py"]
+        assert not manager.is_loaded
+
+    def test_rescan_not_loaded_imports_changed_only(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+        scanned_files: list[str],
+    ) -> None:
+        manager = LibraryManager(config, index_path)
+        manager.nodes_payload()
+        scanned_files.clear()
+        assert manager.reload_changed() is None
+
+        _rename_node(
+            library_folder,
+            "node_with_actions.py",
+            "node_with_actions",
+            "renamed_node",
+        )
+        manager.rescan()
+        assert scanned_files == ["node_with_actions.py"]
+        changes = manager.changes[0]
+        assert changes.modified_files == ["node_with_actions.py"]
+        assert changes.nodes == ["renamed_node"]
+        assert changes.removed == ["node_with_actions"]
+        assert "renamed_node" in manager.nodes_payload()
+        assert not manager.is_loaded
+
+
+class TestLibraryReload:
+    @pytest.fixture
+    def library_folder(self, library_folder: Path) -> Path:
+        (library_folder / "simple_graph.py").write_text(GRAPH_FILE_CONTENT)
+        return library_folder
+
+    def test_changed_node_swapped(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+        scanned_files: list[str],
+    ) -> None:
+        reports: list[Any] = []
+        manager = LibraryManager(config, index_path, on_change=reports.append)
+        library = manager.get_library()
+        assert set(library.graphs) == {"simple_graph"}
+        unchanged = library.nodes.get_nocopy("node_with_subroutine")
+        scanned_files.clear()
+
+        _rename_node(
+            library_folder,
+            "node_with_actions.py",
+            "node_with_actions",
+            "renamed_node",
+        )
+        changes = manager.reload_changed()
+        assert changes is not None
+        assert reports == [changes]
+        # Graphs hold node copies, so they are reloaded with the node file
+        assert scanned_files == ["node_with_actions.py", "simple_graph.py"]
+        assert changes.nodes == ["renamed_node"]
+        assert changes.graphs == ["simple_graph"]
+        assert changes.removed == ["node_with_actions"]
+        reloaded = manager.get_library()
+        assert set(reloaded.nodes) == {
+            "renamed_node",
+            "node_with_subroutine",
+            "node_can_raise_in_body",
+        }
+        assert reloaded.nodes.get_nocopy("node_with_subroutine") is unchanged
+        assert "renamed_node" in manager.nodes_payload()
+        assert manager.reload_changed() is None
+
+    def test_changed_graph_reloaded_alone(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+        scanned_files: list[str],
+    ) -> None:
+        manager = LibraryManager(config, index_path)
+        library = manager.get_library()
+        nodes = dict(library.nodes.items_nocopy())
+        scanned_files.clear()
+
+        (library_folder / "simple_graph.py").write_text(
+            GRAPH_FILE_CONTENT.replace("simple_graph", "renamed_graph")
+        )
+        changes = manager.reload_changed()
+        assert changes is not None
+        assert scanned_files == ["simple_graph.py"]
+        assert changes.graphs == ["renamed_graph"]
+        assert changes.removed == ["simple_graph"]
+        reloaded = manager.get_library()
+        assert set(reloaded.graphs) == {"renamed_graph"}
+        assert dict(reloaded.nodes.items_nocopy()) == nodes
+        assert set(manager.graphs_payload()) == {"renamed_graph"}
+
+    def test_removed_files(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+    ) -> None:
+        manager = LibraryManager(config, index_path)
+        library = manager.get_library()
+
+        (library_folder / "simple_graph.py").unlink()
+        changes = manager.reload_changed()
+        assert changes is not None
+        assert changes.removed_files == ["simple_graph.py"]
+        assert changes.removed == ["simple_graph"]
+        assert len(manager.get_library().graphs) == 0
+        assert set(library.graphs) == {"simple_graph"}
+        assert manager.changes == [changes]
+
+    def test_published_library_not_changed(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        manager = LibraryManager(config, index_path)
+        library = manager.get_library()
+        generation = manager.generation
+        nodes = dict(library.nodes.items_nocopy())
+        graphs = dict(library.graphs.items_nocopy())
+        during_scan: list[Any] = []
+        scan_graph_file = QualibrationGraph.scan_graph_file
+
+        def checking_scan(file: Path, graphs: dict[str, Any]) -> None:
+            during_scan.append(
+                (
+                    set(manager.get_library().nodes),
+                    QualibrationLibrary.get_active_library(),
+                )
+            )
+            scan_graph_file(file, graphs)
+
+        monkeypatch.setattr(QualibrationGraph, "scan_graph_file", checking_scan)
+        _rename_node(
+            library_folder,
+            "node_with_actions.py",
+            "node_with_actions",
+            "renamed_node",
+        )
+        assert manager.reload_changed() is not None
+
+        [(published_nodes, active)] = during_scan
+        # Readers see the previous generation until the next one is published
+        assert published_nodes == set(nodes)
+        assert active is not library
+        assert active is manager.get_library()
+        assert QualibrationLibrary.get_active_library() is active
+        assert manager.generation.library is not library
+        assert generation.library is library
+        assert dict(library.nodes.items_nocopy()) == nodes
+        assert dict(library.graphs.items_nocopy()) == graphs
+        assert set(generation.nodes) == set(nodes)
+
+
+class TestLibraryGenerations:
+    def test_readers_not_blocked_by_reload(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        manager = LibraryManager(config, index_path)
+        generation = manager.generation
+        scan_started = threading.Event()
+        release_scan = threading.Event()
+        scan_node_file = QualibrationNode.scan_node_file
+
+        def blocking_scan(file: Path, nodes: dict[str, Any]) -> None:
+            scan_started.set()
+            release_scan.wait(timeout=10)
+            scan_node_file(file, nodes)
+
+        monkeypatch.setattr(QualibrationNode, "scan_node_file", blocking_scan)
+        _rename_node(
+            library_folder,
+            "node_with_actions.py",
+            "node_with_actions",
+            "renamed_node",
+        )
+        reload = threading.Thread(target=manager.reload_changed)
+        reload.start()
+        try:
+            assert scan_started.wait(timeout=10)
+            # Current generation is served while the next one is built
+            assert manager.generation is generation
+            assert "node_with_actions" in manager.nodes_payload()
+            assert manager.node_payload("node_with_actions") is not None
+        finally:
+            release_scan.set()
+            reload.join(timeout=10)
+        assert manager.generation.number == generation.number + 1
+        assert "renamed_node" in manager.nodes_payload()
+        assert "node_with_actions" not in manager.nodes_payload()
+
+    def test_revalidate_in_background(
+        self,
+        config: CalibrationLibraryConfig,
+        library_folder: Path,
+        index_path: Path,
+    ) -> None:
+        reloaded = threading.Event()
+        manager = LibraryManager(
+            config, index_path, on_change=lambda _: reloaded.set()
+        )
+        manager.nodes_payload()
+        reloaded.clear()
+        _rename_node(
+            library_folder,
+            "node_with_actions.py",
+            "node_with_actions",
+            "renamed_node",
+        )
+        manager.revalidate()
+        manager.revalidate()
+        assert reloaded.wait(timeout=10)
+        assert "renamed_node" in manager.nodes_payload()
+        assert manager.changes[0].nodes == ["renamed_node"]
+
+
+class TestParallelScan:
+    def test_payloads_extracted_in_workers(
+        self,
+        config: CalibrationLibraryConfig,
+        tmp_path: Path,
+        scanned_files: list[str],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        expected = LibraryManager(config, None).nodes_payload()
+        scanned_files.clear()
+        monkeypatch.setattr(library_manager, "min_parallel_files", 1)
+
+        manager = LibraryManager(config, None, scan_workers=2)
+        assert manager.nodes_payload() == expected
+        # Node files were imported by worker processes only
+        assert scanned_files == []
+        changes = manager.changes[0]
+        assert set(changes.import_times) == {
+            "node_with_actions.py",
+            "node_with_subroutine.py",
+            "test_node_can_raise_in_body.py",
+        }
+        assert all(duration > 0 for duration in changes.import_times.values())
+        node = manager.get_node("node_with_actions")
+        assert node is not None
+        assert scanned_files == ["node_with_actions.py"]
@@ -0,0 +1,166 @@
+"""
+Integration tests for run status computation with memoized parts.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+from qualibrate import NodeParameters, QualibrationLibrary
+from qualibrate.models.execution_history import (
+    ExecutionHistory,
+    ExecutionHistoryItem,
+    ItemData,
+    ItemMetadata,
+)
+from qualibrate.models.node_status import ElementRunStatus
+
+from qualibrate_runner.config.models import State
+from qualibrate_runner.core.models.last_run import LastRun
+from qualibrate_runner.core.run_job import run_node
+from qualibrate_runner.core.statuses import (
+    get_graph_execution_history,
+    get_run_status,
+)
+
+
+def _history_item(name: str) -> ExecutionHistoryItem:
+    now = datetime.now().astimezone()
+    return ExecutionHistoryItem(
+        created_at=now,
+        metadata=ItemMetadata(
+            name=name,
+            status=ElementRunStatus.finished,
+            run_start=now,
+            run_end=now,
+        ),
+        data=ItemData(parameters=NodeParameters()),
+    )
+
+
+class TestRunStatusMemoization:
+    """Tests for reusing stable parts of the status."""
+
+    def test_stable_parts_reused(
+        self, test_library: QualibrationLibrary[Any, Any], fresh_state: State
+    ) -> None:
+        """Test that parameters and results aren't rebuilt between calls."""
+        node = test_library.nodes["node_can_raise_in_body"]
+        run_node(node, {"amplitude": 0.3}, fresh_state)
+
+        first = get_run_status(fresh_state).node
+        second = get_run_status(fresh_state).node
+
+        assert first is not None and second is not None
+        assert first.run_results is not None
+        assert second.run_results is first.run_results
+        assert second.parameters == first.parameters
+        assert first.parameters["amplitude"] == 0.3
+
+    def test_new_run_invalidates_parts(
+        self, test_library: QualibrationLibrary[Any, Any], fresh_state: State
+    ) -> None:
+        """Test that status reflects parameters and results of a new run."""
+        node = test_library.nodes["node_can_raise_in_body"]
+        run_node(node, {"amplitude": 0.3}, fresh_state)
+        first = get_run_status(fresh_state).node
+
+        run_node(node, {"amplitude": 0.6}, fresh_state)
+        second = get_run_status(fresh_state).node
+
+        assert first is not None and second is not None
+        assert second.run_results is not first.run_results
+        assert second.parameters["amplitude"] == 0.6
+
+    def test_parameters_changed_in_place_during_run(
+        self,
+        test_library: QualibrationLibrary[Any, Any],
+        fresh_state: State,
+        sample_last_run_running: LastRun,
+    ) -> None:
+        """Test that in-place parameter changes of a running item are seen."""
+        node = test_library.nodes["node_can_raise_in_body"]
+        fresh_state.run_item = node
+        fresh_state.last_run = sample_last_run_running
+        first = get_run_status(fresh_state).node
+
+        node.parameters.amplitude = 0.9
+        fresh_state.mark_changed()
+        second = get_run_status(fresh_state).node
+
+        assert first is not None and second is not None
+        assert first.parameters["amplitude"] == 0.5
+        assert second.parameters["amplitude"] == 0.9
+
+    def test_running_parameters_dumped_once_per_version(
+        self,
+        test_library: QualibrationLibrary[Any, Any],
+        fresh_state: State,
+        sample_last_run_running: LastRun,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that polling a running item reuses the parameters dump."""
+        node = test_library.nodes["node_can_raise_in_body"]
+        fresh_state.run_item = node
+        fresh_state.last_run = sample_last_run_running
+        parameters_class = type(node.parameters)
+        model_dump = parameters_class.model_dump
+        dumps: list[Any] = []
+
+        def counting_dump(self: Any, **kwargs: Any) -> dict[str, Any]:
+            dumps.append(self)
+            result: dict[str, Any] = model_dump(self, **kwargs)
+            return result
+
+        monkeypatch.setattr(parameters_class, "model_dump", counting_dump)
+        get_run_status(fresh_state)
+        get_run_status(fresh_state)
+        assert len(dumps) == 1
+
+        node.fraction_complete = 0.5
+        get_run_status(fresh_state)
+        assert len(dumps) == 2
+
+
+class TestGraphExecutionHistory:
+    """Tests for the execution history cursor."""
+
+    @pytest.fixture
+    def history_state(self, mock_workflow: Mock) -> State:
+        # Items of nodes without snapshots have no id
+        items = [_history_item(name) for name in ("first", "second", "third")]
+        orchestrator = Mock()
+        orchestrator.get_execution_history.side_effect = lambda: (
+            ExecutionHistory(items=list(items))
+        )
+        mock_workflow._orchestrator = orchestrator
+        return State.model_construct(run_item=mock_workflow)
+
+    def test_items_after_cursor_without_ids(self, history_state: State) -> None:
+        """Test that items are returned after the received item count."""
+        history = get_graph_execution_history(history_state, since=1)
+        reversed_history = get_graph_execution_history(
+            history_state, reverse=True, since=1
+        )
+
+        assert history is not None and reversed_history is not None
+        assert [item.metadata.name for item in history.items] == [
+            "second",
+            "third",
+        ]
+        assert [item.metadata.name for item in reversed_history.items] == [
+            "third",
+            "second",
+        ]
+
+    def test_cursor_at_end_and_beyond(self, history_state: State) -> None:
+        """Test that no items are new at the end, all after a restart."""
+        at_end = get_graph_execution_history(history_state, since=3)
+        beyond = get_graph_execution_history(history_state, since=5)
+
+        assert at_end is not None and beyond is not None
+        assert list(at_end.items) == []
+        assert len(beyond.items) == 3
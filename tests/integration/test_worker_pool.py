@@ -0,0 +1,299 @@
+"""
+Integration tests for executing nodes in worker processes.
+
+These tests spawn a real worker process which imports the test library from
+tests/fixtures/test_nodes/ and verify that results, errors and state are
+transferred back to the API process. Workflow tests use a copy of the test
+library extended with a graph.
+"""
+
+from __future__ import annotations
+
+import shutil
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from qualibrate import QualibrationLibrary
+from qualibrate.models.node_status import ElementRunStatus
+from qualibrate.models.run_summary.graph import GraphRunSummary
+from qualibrate.models.run_summary.node import NodeRunSummary
+
+from qualibrate_runner.config.models import RunStatusEnum, State
+from qualibrate_runner.core.run_job import (
+    run_node_in_worker,
+    run_workflow_in_worker,
+)
+from qualibrate_runner.core.statuses import (
+    get_graph_execution_history,
+    get_run_status,
+)
+from qualibrate_runner.core.worker_pool import WorkerPool, WorkerRunError
+
+TEST_NODES_PATH = Path(__file__).parent.parent / "fixtures" / "test_nodes"
+
+GRAPH_NODE_FILE_CONTENT = """
+import time
+
+from qualibrate import NodeParameters, QualibrationNode
+
+
+class Parameters(NodeParameters):
+    qubits: list[str] = []
+    duration: float = 0.2
+    should_fail: bool = False
+
+
+node = QualibrationNode(name="graph_node", parameters=Parameters())
+time.sleep(node.parameters.duration)
+if node.parameters.should_fail:
+    raise ValueError("Graph node failure")
+"""
+
+GRAPH_FILE_CONTENT = """
+from qualibrate import QualibrationGraph, QualibrationLibrary
+from qualibrate.parameters import GraphParameters
+
+
+class Parameters(GraphParameters):
+    qubits: list[str] = ["q1", "q2"]
+
+
+library = QualibrationLibrary.get_active_library()
+graph = QualibrationGraph(
+    name="simple_graph",
+    parameters=Parameters(),
+    nodes={
+        "first": library.nodes["graph_node"],
+        "second": library.nodes["graph_node"],
+    },
+    connectivity=[("first", "second")],
+)
+"""
+
+
+@pytest.fixture(scope="module")
+def worker_pool() -> Iterator[WorkerPool]:
+    pool = WorkerPool(TEST_NODES_PATH, size=1, progress_interval=0.05)
+    pool.start()
+    yield pool
+    pool.stop(timeout=5)
+
+
+@pytest.fixture(scope="module")
+def graph_library_folder(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    folder = tmp_path_factory.mktemp("graph_library") / "library"
+    shutil.copytree(
+        TEST_NODES_PATH,
+        folder,
+        ignore=shutil.ignore_patterns("__pycache__"),
+    )
+    (folder / "graph_node.py").write_text(GRAPH_NODE_FILE_CONTENT)
+    (folder / "simple_graph.py").write_text(GRAPH_FILE_CONTENT)
+    return folder
+
+
+@pytest.fixture(scope="module")
+def graph_worker_pool(graph_library_folder: Path) -> Iterator[WorkerPool]:
+    pool = WorkerPool(graph_library_folder, size=1, progress_interval=0.05)
+    pool.start()
+    yield pool
+    pool.stop(timeout=5)
+
+
+@pytest.fixture
+def graph_library(
+    graph_library_folder: Path,
+) -> Iterator[QualibrationLibrary[Any, Any]]:
+    # Graph file takes nodes from the active library
+    library_class: type[QualibrationLibrary[Any, Any]] = QualibrationLibrary
+    active = library_class.active_library
+    yield QualibrationLibrary(library_folder=graph_library_folder)
+    library_class.active_library = active
+
+
+class TestWorkerPoolExecution:
+    """Tests for node execution in a worker process."""
+
+    def test_node_success(
+        self,
+        worker_pool: WorkerPool,
+        test_library: QualibrationLibrary[Any, Any],
+        fresh_state: State,
+    ) -> None:
+        """Test that successful run updates state with worker results."""
+        node = test_library.nodes["node_can_raise_in_body"]
+
+        run_node_in_worker(node, {"amplitude": 0.8}, fresh_state, worker_pool)
+
+        last_run = fresh_state.last_run
+        assert last_run is not None
+        assert last_run.status == RunStatusEnum.FINISHED
+        assert last_run.error is None
+        assert fresh_state.run_item is node
+        assert isinstance(last_run.run_result, NodeRunSummary)
+        assert last_run.run_result.parameters is not None
+        assert last_run.run_result.parameters.amplitude == 0.8  # type: ignore[attr-defined]
+
+    def test_node_error(
+        self,
+        worker_pool: WorkerPool,
+        test_library: QualibrationLibrary[Any, Any],
+        fresh_state: State,
+    ) -> None:
+        """Test that error raised in worker is captured and re-raised."""
+        node = test_library.nodes["node_can_raise_in_body"]
+
+        with pytest.raises(WorkerRunError, match="Worker failure"):
+            run_node_in_worker(
+                node,
+                {"should_fail": True, "error_message": "Worker failure"},
+                fresh_state,
+                worker_pool,
+            )
+
+        last_run = fresh_state.last_run
+        assert last_run is not None
+        assert last_run.status == RunStatusEnum.ERROR
+        assert last_run.error is not None
+        assert last_run.error.error_class == "ValueError"
+        assert last_run.error.message == "Worker failure"
+        assert last_run.error.traceback
+
+    def test_worker_reused_between_runs(
+        self,
+        worker_pool: WorkerPool,
+        test_library: QualibrationLibrary[Any, Any],
+        fresh_state: State,
+    ) -> None:
+        """Test that the pool isn't busy after run and executes next node."""
+        node = test_library.nodes["node_can_raise_in_body"]
+
+        run_node_in_worker(node, {}, fresh_state, worker_pool)
+        run_node_in_worker(node, {"num_points": 3}, fresh_state, worker_pool)
+
+        assert not worker_pool.is_busy
+        assert fresh_state.last_run is not None
+        assert fresh_state.last_run.status == RunStatusEnum.FINISHED
+
+    def test_restart_replaces_workers(
+        self,
+        worker_pool: WorkerPool,
+        test_library: QualibrationLibrary[Any, Any],
+        fresh_state: State,
+    ) -> None:
+        """Test that restarted pool runs nodes in a new worker process."""
+        node = test_library.nodes["node_can_raise_in_body"]
+        [worker] = worker_pool._workers
+
+        worker_pool.restart()
+        run_node_in_worker(node, {}, fresh_state, worker_pool)
+
+        assert not worker.process.is_alive()
+        assert worker_pool._workers != [worker]
+        assert fresh_state.last_run is not None
+        assert fresh_state.last_run.status == RunStatusEnum.FINISHED
+
+    def test_worker_with_unexpected_message_replaced(
+        self,
+        worker_pool: WorkerPool,
+        test_library: QualibrationLibrary[Any, Any],
+        fresh_state: State,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that worker breaking the protocol isn't reused."""
+        node = test_library.nodes["node_can_raise_in_body"]
+        [worker] = worker_pool._workers
+        worker.ready = False
+        monkeypatch.setattr(worker, "recv", lambda: ("result", None))
+
+        with pytest.raises(RuntimeError, match="Unexpected worker message"):
+            run_node_in_worker(node, {}, fresh_state, worker_pool)
+        run_node_in_worker(node, {}, fresh_state, worker_pool)
+
+        assert not worker.process.is_alive()
+        assert worker not in worker_pool._workers
+        assert fresh_state.last_run is not None
+        assert fresh_state.last_run.status == RunStatusEnum.FINISHED
+
+
+class TestWorkerPoolWorkflowExecution:
+    """Tests for workflow execution in a worker process."""
+
+    def test_workflow_success(
+        self,
+        graph_worker_pool: WorkerPool,
+        graph_library: QualibrationLibrary[Any, Any],
+        fresh_state: State,
+    ) -> None:
+        """Test that workflow progress and results are applied locally."""
+        graph = graph_library.graphs["simple_graph"]
+        active_nodes: list[str] = []
+
+        def on_change() -> None:
+            run_item = fresh_state.run_item
+            if run_item is None or fresh_state.last_run is None:
+                return
+            status = get_run_status(fresh_state)
+            if status.node is not None and not status.node.run_end:
+                active_nodes.append(status.node.name)
+
+        fresh_state.add_listener(on_change)
+        run_workflow_in_worker(
+            graph,
+            {"parameters": {}, "nodes": {"first": {"duration": 0.3}}},
+            fresh_state,
+            graph_worker_pool,
+        )
+
+        last_run = fresh_state.last_run
+        assert last_run is not None
+        assert last_run.status == RunStatusEnum.FINISHED
+        assert last_run.error is None
+        assert fresh_state.run_item is graph
+        assert isinstance(last_run.run_result, GraphRunSummary)
+        assert sorted(last_run.run_result.successful_targets) == ["q1", "q2"]
+        # Active node progress was reported while the graph was running
+        assert "first" in active_nodes
+        assert "second" in active_nodes
+        assert graph.completed_count() == 2
+        history = get_graph_execution_history(fresh_state)
+        assert history is not None
+        assert [item.metadata.name for item in history.items] == [
+            "first",
+            "second",
+        ]
+        assert history.items[0].data.parameters.duration == 0.3  # type: ignore[attr-defined]
+        graph_status = get_run_status(fresh_state).graph
+        assert graph_status is not None
+        assert graph_status.finished_nodes == 2
+        assert not graph_worker_pool.is_busy
+
+    def test_workflow_error(
+        self,
+        graph_worker_pool: WorkerPool,
+        graph_library: QualibrationLibrary[Any, Any],
+        fresh_state: State,
+    ) -> None:
+        """Test that failed graph element is reported by the worker."""
+        graph = graph_library.graphs["simple_graph"]
+
+        with pytest.raises(WorkerRunError, match="Graph node failure"):
+            run_workflow_in_worker(
+                graph,
+                {"parameters": {}, "nodes": {"first": {"should_fail": True}}},
+                fresh_state,
+                graph_worker_pool,
+            )
+
+        last_run = fresh_state.last_run
+        assert last_run is not None
+        assert last_run.status == RunStatusEnum.ERROR
+        assert last_run.error is not None
+        assert last_run.error.error_class == "ValueError"
+        history = get_graph_execution_history(fresh_state)
+        assert history is not None
+        [item] = history.items
+        assert item.metadata.status == ElementRunStatus.error
+        assert item.data.error is not None
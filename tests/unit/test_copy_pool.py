@@ -0,0 +1,140 @@
+"""
+Tests for the pool of pre-built runnable copies.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from qualibrate_runner.core.copy_pool import RunnableCopyPool
+from qualibrate_runner.core.models.enums import RunnableType
+
+
+class _Runnable:
+    copies_made = 0
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.origin: _Runnable | None = None
+
+    def __copy__(self) -> _Runnable:
+        _Runnable.copies_made += 1
+        runnable_copy = _Runnable(self.name)
+        runnable_copy.origin = self
+        return runnable_copy
+
+
+@pytest.fixture
+def scheduled() -> list[Callable[[], None]]:
+    return []
+
+
+@pytest.fixture
+def copy_pool(scheduled: list[Callable[[], None]]) -> RunnableCopyPool:
+    return RunnableCopyPool(1, scheduled.append)
+
+
+def _acquire(pool: RunnableCopyPool, source: _Runnable) -> Any:
+    return pool.acquire(RunnableType.NODE, source)  # type: ignore[type-var]
+
+
+class TestRunnableCopyPool:
+    """Tests for acquiring and refilling copies."""
+
+    def test_first_acquire_copies_on_demand(
+        self,
+        copy_pool: RunnableCopyPool,
+        scheduled: list[Callable[[], None]],
+    ) -> None:
+        """Test that the first acquire is a miss and schedules a refill."""
+        source = _Runnable("node")
+
+        runnable_copy = _acquire(copy_pool, source)
+
+        assert runnable_copy is not source
+        assert runnable_copy.origin is source
+        stats = copy_pool.stats
+        assert (stats.hits, stats.misses, stats.copies_made) == (0, 1, 1)
+        assert len(scheduled) == 1
+
+    def test_refilled_copy_is_hit(
+        self,
+        copy_pool: RunnableCopyPool,
+        scheduled: list[Callable[[], None]],
+    ) -> None:
+        """Test that acquire after refill takes the ready copy."""
+        source = _Runnable("node")
+        _acquire(copy_pool, source)
+        scheduled.pop()()
+        assert copy_pool.stats.pooled == {"node:node": 1}
+
+        runnable_copy = _acquire(copy_pool, source)
+
+        assert runnable_copy.origin is source
+        stats = copy_pool.stats
+        assert (stats.hits, stats.misses, stats.copies_made) == (1, 1, 2)
+        assert stats.hit_rate == 0.5
+        assert stats.pooled == {"node:node": 0}
+
+    def test_refill_is_scheduled_once(
+        self,
+        copy_pool: RunnableCopyPool,
+        scheduled: list[Callable[[], None]],
+    ) -> None:
+        """Test that pending refill isn't scheduled again."""
+        source = _Runnable("node")
+        _acquire(copy_pool, source)
+        _acquire(copy_pool, source)
+
+        assert len(scheduled) == 1
+
+    def test_stale_copies_are_dropped(
+        self,
+        copy_pool: RunnableCopyPool,
+        scheduled: list[Callable[[], None]],
+    ) -> None:
+        """Test that copies of a replaced library runnable aren't used."""
+        old_source = _Runnable("node")
+        _acquire(copy_pool, old_source)
+        scheduled.pop()()
+        new_source = _Runnable("node")
+
+        runnable_copy = _acquire(copy_pool, new_source)
+
+        assert runnable_copy.origin is new_source
+        assert copy_pool.stats.misses == 2
+
+    def test_disabled_pool_copies_every_time(
+        self, scheduled: list[Callable[[], None]]
+    ) -> None:
+        """Test that pool of size 0 doesn't schedule refills."""
+        pool = RunnableCopyPool(0, scheduled.append)
+        source = _Runnable("node")
+
+        _acquire(pool, source)
+        _acquire(pool, source)
+
+        assert scheduled == []
+        assert pool.stats.misses == 2
+
+    def test_current_library_runnable_is_copied(
+        self, scheduled: list[Callable[[], None]]
+    ) -> None:
+        """Test that a runnable captured before a reload isn't copied."""
+        submitted = _Runnable("graph")
+        current: dict[str, _Runnable] = {}
+        pool = RunnableCopyPool(
+            1,
+            scheduled.append,
+            lambda kind, name: current.get(name),  # type: ignore[arg-type,return-value]
+        )
+
+        unchanged_copy = _acquire(pool, submitted)
+        current["graph"] = _Runnable("graph")
+        reloaded_copy = _acquire(pool, submitted)
+
+        assert unchanged_copy.origin is submitted
+        assert reloaded_copy.origin is current["graph"]
@@ -0,0 +1,213 @@
+"""
+Tests for the JobQueue executing submitted jobs one after another.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from functools import partial
+
+import pytest
+
+from qualibrate_runner.core.job_queue import JobQueue
+from qualibrate_runner.core.models.enums import JobStatusEnum, RunnableType
+
+
+@pytest.fixture
+def job_queue() -> Iterator[JobQueue]:
+    queue = JobQueue(max_finished_jobs=3)
+    queue.start()
+    yield queue
+    queue.stop(timeout=1)
+
+
+def _block(event: threading.Event) -> None:
+    event.wait(2)
+
+
+def _wait_for_status(
+    queue: JobQueue, job_id: str, status: JobStatusEnum, timeout: float = 2
+) -> None:
+    event = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        job = queue.get(job_id)
+        if job is not None and job.status == status:
+            return
+        event.wait(0.01)
+    raise AssertionError(f"Job {job_id} didn't reach status {status}")
+
+
+class TestJobQueueExecution:
+    """Tests for job execution order and statuses."""
+
+    def test_jobs_executed_in_submission_order(
+        self, job_queue: JobQueue
+    ) -> None:
+        """Test that jobs are executed in FIFO order."""
+        executed: list[int] = []
+        jobs = [
+            job_queue.submit(
+                f"node_{i}",
+                RunnableType.NODE,
+                {},
+                lambda i=i: executed.append(i),  # type: ignore[misc]
+            )
+            for i in range(5)
+        ]
+
+        _wait_for_status(job_queue, jobs[-1].id, JobStatusEnum.FINISHED)
+
+        assert executed == [0, 1, 2, 3, 4]
+
+    def test_submit_returns_queued_job(self) -> None:
+        """Test that submitted job is queued until executor is started."""
+        queue = JobQueue()
+
+        job = queue.submit("node", RunnableType.NODE, {"a": 1}, lambda: None)
+
+        assert job.status == JobStatusEnum.QUEUED
+        assert job.passed_parameters == {"a": 1}
+        assert job.started_at is None
+        assert queue.pending_count == 1
+
+    def test_failed_job_has_error(self, job_queue: JobQueue) -> None:
+        """Test that exception raised by job is captured and next job runs."""
+
+        def failing() -> None:
+            raise ValueError("Invalid data")
+
+        failed = job_queue.submit("failing", RunnableType.NODE, {}, failing)
+        succeeded = job_queue.submit("ok", RunnableType.NODE, {}, lambda: None)
+
+        _wait_for_status(job_queue, succeeded.id, JobStatusEnum.FINISHED)
+        failed_job = job_queue.get(failed.id)
+
+        assert failed_job is not None
+        assert failed_job.status == JobStatusEnum.ERROR
+        assert failed_job.error is not None
+        assert failed_job.error.error_class == "ValueError"
+        assert failed_job.completed_at is not None
+
+    def test_active_job_reported_while_running(
+        self, job_queue: JobQueue
+    ) -> None:
+        """Test that running job is exposed as active job."""
+        release = threading.Event()
+        job = job_queue.submit(
+            "blocking", RunnableType.GRAPH, {}, partial(_block, release)
+        )
+
+        _wait_for_status(job_queue, job.id, JobStatusEnum.RUNNING)
+        active = job_queue.active_job
+        release.set()
+
+        assert active is not None
+        assert active.id == job.id
+        assert active.started_at is not None
+
+
+class TestJobQueueCancel:
+    """Tests for cancelling queued jobs."""
+
+    def test_cancel_queued_job(self) -> None:
+        """Test that cancelled job is never executed."""
+        queue = JobQueue()
+        executed: list[str] = []
+        job = queue.submit(
+            "node", RunnableType.NODE, {}, lambda: executed.append("node")
+        )
+
+        cancelled = queue.cancel(job.id)
+        queue.start()
+        last = queue.submit("last", RunnableType.NODE, {}, lambda: None)
+        _wait_for_status(queue, last.id, JobStatusEnum.FINISHED)
+        queue.stop(timeout=1)
+
+        assert cancelled.status == JobStatusEnum.CANCELLED
+        assert executed == []
+
+    def test_cancel_running_job_raises(self, job_queue: JobQueue) -> None:
+        """Test that running job can't be cancelled."""
+        release = threading.Event()
+        job = job_queue.submit(
+            "blocking", RunnableType.NODE, {}, partial(_block, release)
+        )
+        _wait_for_status(job_queue, job.id, JobStatusEnum.RUNNING)
+
+        with pytest.raises(ValueError, match="Can't cancel"):
+            job_queue.cancel(job.id)
+        release.set()
+
+    def test_cancel_unknown_job_raises(self, job_queue: JobQueue) -> None:
+        """Test that cancelling unknown job raises KeyError."""
+        with pytest.raises(KeyError):
+            job_queue.cancel("unknown")
+
+
+class TestJobQueueListing:
+    """Tests for listing jobs."""
+
+    def test_filter_by_status(self) -> None:
+        """Test listing jobs filtered by status."""
+        queue = JobQueue()
+        first = queue.submit("first", RunnableType.NODE, {}, lambda: None)
+        queue.submit("second", RunnableType.NODE, {}, lambda: None)
+        queue.cancel(first.id)
+
+        queued = queue.list_jobs(JobStatusEnum.QUEUED)
+        cancelled = queue.list_jobs(JobStatusEnum.CANCELLED)
+
+        assert [job.name for job in queued] == ["second"]
+        assert [job.name for job in cancelled] == ["first"]
+
+    def test_completed_jobs_are_trimmed(self, job_queue: JobQueue) -> None:
+        """Test that only the latest completed jobs are kept."""
+        jobs = [
+            job_queue.submit(f"node_{i}", RunnableType.NODE, {}, lambda: None)
+            for i in range(5)
+        ]
+        _wait_for_status(job_queue, jobs[-1].id, JobStatusEnum.FINISHED)
+
+        names = [job.name for job in job_queue.list_jobs()]
+
+        assert names == ["node_2", "node_3", "node_4"]
+        assert job_queue.get(jobs[0].id) is None
+
+
+class TestJobQueueIdleTasks:
+    """Tests for tasks executed between jobs."""
+
+    def test_idle_task_waits_for_queued_jobs(self, job_queue: JobQueue) -> None:
+        """Test that queued jobs are executed before idle tasks."""
+        executed: list[str] = []
+        release = threading.Event()
+        done = threading.Event()
+        job_queue.submit(
+            "blocker", RunnableType.NODE, {}, partial(_block, release)
+        )
+
+        def idle_task() -> None:
+            executed.append("idle")
+            done.set()
+
+        job_queue.run_when_idle(idle_task)
+        job = job_queue.submit(
+            "second", RunnableType.NODE, {}, lambda: executed.append("job")
+        )
+        release.set()
+
+        assert done.wait(2)
+        assert executed == ["job", "idle"]
+        _wait_for_status(job_queue, job.id, JobStatusEnum.FINISHED)
+
+    def test_failed_idle_task_keeps_executor(self, job_queue: JobQueue) -> None:
+        """Test that an exception of idle task doesn't stop the queue."""
+
+        def idle_task() -> None:
+            raise ValueError("Idle task failed")
+
+        job_queue.run_when_idle(idle_task)
+        job = job_queue.submit("node", RunnableType.NODE, {}, lambda: None)
+
+        _wait_for_status(job_queue, job.id, JobStatusEnum.FINISHED)
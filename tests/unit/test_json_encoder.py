@@ -0,0 +1,38 @@
+"""Tests for JSON encoding of websocket frames."""
+
+from typing import Any
+
+import pytest
+
+from qualibrate_runner.utils import json_encoder
+from qualibrate_runner.utils.json_encoder import encode_json
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> str:
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_encoder, "orjson", None)
+    return str(request.param)
+
+
+class TestEncodeJson:
+    """Tests for encode_json with and without orjson."""
+
+    def test_compact_non_ascii(self, encoder: str) -> None:
+        data: dict[str, Any] = {"name": "qubit α", "values": [1, 2.5, None]}
+
+        assert encode_json(data) == '{"name":"qubit α","values":[1,2.5,null]}'
+
+    def test_non_finite_floats_encoded_as_null(self, encoder: str) -> None:
+        data: dict[str, Any] = {
+            "nan": float("nan"),
+            "nested": [{"inf": float("inf")}, (float("-inf"), 1.0)],
+        }
+
+        assert encode_json(data) == (
+            '{"nan":null,"nested":[{"inf":null},[null,1.0]]}'
+        )
@@ -0,0 +1,118 @@
+"""
+Tests for the sidecar timestamp index of qualibrate log files.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from qualibrate_runner.utils import logs_index
+from qualibrate_runner.utils.logs_index import LogFolderIndex
+from qualibrate_runner.utils.logs_parser import get_logs_from_qualibrate_files
+
+START = datetime(2024, 1, 15, 10, 0, 0)
+
+
+def _lines(first: int, last: int) -> str:
+    out = []
+    for i in range(first, last):
+        asctime = (START + timedelta(seconds=i)).strftime(
+            "%Y-%m-%d %H:%M:%S,%f"
+        )[:-3]
+        record = {"asctime": asctime, "name": "q", "message": f"message {i}"}
+        out.append(json.dumps(record) + "\n")
+    return "".join(out)
+
+
+@pytest.fixture(autouse=True)
+def small_checkpoints(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logs_index, "checkpoint_interval", 200)
+
+
+class TestLogFileIndex:
+    """Tests for building and using file checkpoints."""
+
+    def test_byte_range_narrowed(self, tmp_path: Path) -> None:
+        """Test that time window is mapped to part of the file."""
+        path = tmp_path / "qualibrate.log"
+        path.write_text(_lines(0, 100))
+        index = LogFolderIndex(tmp_path).get([path])[path]
+
+        start, end = index.byte_range(
+            START + timedelta(seconds=40), START + timedelta(seconds=50)
+        )
+
+        assert len(index.offsets) > 10
+        assert start > 0
+        assert end is not None and end < path.stat().st_size
+        content = path.read_bytes()[start:end].decode()
+        assert '"message 40"' in content
+        assert '"message 50"' in content
+        assert '"message 5"' not in content
+
+    def test_appended_file_indexed_incrementally(self, tmp_path: Path) -> None:
+        """Test that checkpoints of grown file are extended."""
+        path = tmp_path / "qualibrate.log"
+        path.write_text(_lines(0, 50))
+        folder_index = LogFolderIndex(tmp_path)
+        offsets = list(folder_index.get([path])[path].offsets)
+
+        with path.open("a") as f:
+            f.write(_lines(50, 100))
+        index = folder_index.get([path])[path]
+
+        assert index.offsets[: len(offsets)] == offsets
+        assert len(index.offsets) > len(offsets)
+
+    def test_index_persisted_and_survives_rotation(
+        self, tmp_path: Path
+    ) -> None:
+        """Test that index is loaded from sidecar after file rename."""
+        path = tmp_path / "qualibrate.log"
+        path.write_text(_lines(0, 50))
+        offsets = LogFolderIndex(tmp_path).get([path])[path].offsets
+        rotated = path.rename(tmp_path / "qualibrate.log.1")
+
+        index = LogFolderIndex(tmp_path).get([rotated])[rotated]
+
+        assert index.offsets == offsets
+
+
+class TestIndexedQueries:
+    """Tests for time window queries using the index."""
+
+    @pytest.mark.parametrize(
+        ("after", "before"), [(10, 20), (0, 5), (95, None), (None, 33)]
+    )
+    def test_window_matches_full_scan(
+        self, tmp_path: Path, after: int | None, before: int | None
+    ) -> None:
+        """Test that indexed query returns all entries of the window."""
+        (tmp_path / "qualibrate.log.1").write_text(_lines(0, 60))
+        (tmp_path / "qualibrate.log").write_text(_lines(60, 100))
+        after_dt = (
+            START + timedelta(seconds=after) if after is not None else None
+        )
+        before_dt = (
+            START + timedelta(seconds=before) if before is not None else None
+        )
+
+        logs = get_logs_from_qualibrate_files(
+            after=after_dt,
+            before=before_dt,
+            num_entries=1000,
+            config=Mock(log_folder=tmp_path),
+        )
+
+        expected = range(
+            after if after is not None else 0,
+            (before + 1) if before is not None else 100,
+        )
+        assert [log["message"] for log in logs] == [
+            f"message {i}" for i in expected
+        ]
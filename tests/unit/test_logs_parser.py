@@ -0,0 +1,199 @@
+"""
+Tests for reading qualibrate log files from the end.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+
+from qualibrate_runner.utils.logs_parser import (
+    get_logs_from_qualibrate_files,
+    get_qualibrate_log_files,
+    iter_log_entries_reversed,
+    parse_asctime,
+    parse_log_line,
+    parse_log_line_with_previous,
+    parse_log_lines,
+)
+
+START = datetime(2024, 1, 15, 10, 0, 0)
+
+
+def _json_line(i: int, message: str | None = None) -> str:
+    asctime = (START + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S,%f")
+    return json.dumps(
+        {
+            "asctime": asctime[:-3],
+            "name": "qualibrate",
+            "levelname": "INFO",
+            "message": message or f"message {i}",
+        }
+    )
+
+
+def _legacy_line(i: int) -> str:
+    asctime = (START + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S,%f")
+    return f"{asctime[:-3]} - qualibrate - INFO - message {i}"
+
+
+def _write(path: Path, lines: list[str]) -> Path:
+    path.write_text("".join(f"{line}\n" for line in lines))
+    return path
+
+
+def _config(log_folder: Path) -> Any:
+    return Mock(log_folder=log_folder)
+
+
+class TestBatchParser:
+    """Tests for parsing blocks of log lines."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2024-01-15 10:00:00,000",
+            "2024-01-15 10:00:00,999",
+            "2024-12-31 23:59:59,5",
+            "2024-01-15 10:00:00,123456",
+        ],
+    )
+    def test_asctime_matches_strptime(self, value: str) -> None:
+        """Test that cached decoding gives the same datetime."""
+        assert parse_asctime(value) == datetime.strptime(
+            value, "%Y-%m-%d %H:%M:%S,%f"
+        )
+
+    def test_invalid_asctime_rejected(self) -> None:
+        """Test that invalid timestamp raises like strptime."""
+        with pytest.raises(ValueError):
+            parse_asctime("2024-13-15 10:00:00,000")
+
+    def test_same_entries_as_line_parser(self) -> None:
+        """Test that batch parsing matches parsing line by line."""
+        lines = [
+            "orphan continuation",
+            _legacy_line(0),
+            "traceback line 1",
+            "traceback line 2",
+            _json_line(1),
+            "continuation of json",
+            _legacy_line(2),
+        ]
+        broken = [*lines, '{"broken json', "after broken"]
+        expected = []
+        previous = None
+        for line in lines:
+            previous = parse_log_line(line, previous)
+            expected.append(previous)
+
+        entries = parse_log_lines(lines)
+
+        assert entries == expected
+        assert parse_log_lines(broken)[: len(lines)] == expected
+        assert parse_log_lines(broken)[-2:] == [{}, {"message": "after broken"}]
+        assert entries[3]["asctime"] == START
+        assert entries[3]["message"] == "traceback line 2"
+        assert entries[1]["message"] == "message 0"
+
+    def test_line_with_several_records(self) -> None:
+        """Test that a line decoded to several records doesn't shift
+        entries of the following lines."""
+        lines = ['{"message": "a"},{"message": "b"}', '{"message": "c"}']
+        expected = []
+        previous = None
+        for line in lines:
+            previous = parse_log_line(line, previous)
+            expected.append(previous)
+
+        assert parse_log_lines(lines) == expected
+        assert expected == [{}, {"message": "c"}]
+
+
+class TestReverseReader:
+    """Tests for parsing log file backwards."""
+
+    @pytest.mark.parametrize("block_size", [7, 64, 64 * 1024])
+    def test_same_entries_as_forward_parser(
+        self, tmp_path: Path, block_size: int
+    ) -> None:
+        """Test that reversed entries match forward parsing."""
+        lines = [
+            "orphan continuation",
+            _legacy_line(0),
+            "traceback line 1",
+            "traceback line 2",
+            _json_line(1, "µs unicode"),
+            _legacy_line(2),
+        ]
+        path = _write(tmp_path / "qualibrate.log", lines)
+        with open(path) as f:
+            forward = [
+                entry
+                for entry in parse_log_line_with_previous(f)
+                if "asctime" in entry
+            ]
+
+        backward = list(iter_log_entries_reversed(path, block_size))
+
+        assert list(reversed(backward)) == forward
+        assert backward[-2]["message"] == "traceback line 1"
+
+    def test_rotated_files_sorted_numerically(self, tmp_path: Path) -> None:
+        """Test that files are ordered from newest to oldest."""
+        for name in ("qualibrate.log.10", "qualibrate.log.2", "other.log"):
+            _write(tmp_path / name, [])
+        _write(tmp_path / "qualibrate.log", [])
+        _write(tmp_path / "qualibrate.log.1", [])
+
+        files = get_qualibrate_log_files(tmp_path)
+
+        assert [f.name for f in files] == [
+            "qualibrate.log",
+            "qualibrate.log.1",
+            "qualibrate.log.2",
+            "qualibrate.log.10",
+        ]
+
+
+class TestGetLogsFromFiles:
+    """Tests for getting latest entries within time range."""
+
+    def test_latest_entries_across_rotated_files(self, tmp_path: Path) -> None:
+        """Test that latest entries are taken from several files."""
+        _write(tmp_path / "qualibrate.log.1", [_json_line(i) for i in range(5)])
+        _write(
+            tmp_path / "qualibrate.log", [_json_line(i) for i in range(5, 7)]
+        )
+
+        logs = get_logs_from_qualibrate_files(
+            num_entries=4, config=_config(tmp_path)
+        )
+
+        assert [log["message"] for log in logs] == [
+            f"message {i}" for i in range(3, 7)
+        ]
+
+    def test_time_window(self, tmp_path: Path) -> None:
+        """Test filtering entries by after and before."""
+        _write(tmp_path / "qualibrate.log", [_json_line(i) for i in range(10)])
+
+        logs = get_logs_from_qualibrate_files(
+            after=START + timedelta(seconds=2),
+            before=START + timedelta(seconds=5),
+            num_entries=100,
+            config=_config(tmp_path),
+        )
+
+        assert [log["message"] for log in logs] == [
+            f"message {i}" for i in range(2, 6)
+        ]
+
+    def test_no_log_folder(self) -> None:
+        """Test that nothing is returned if log folder isn't configured."""
+        assert get_logs_from_qualibrate_files(config=_config(None)) == []  # type: ignore[arg-type]
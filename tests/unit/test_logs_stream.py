@@ -0,0 +1,168 @@
+"""
+Tests for sources of live log records.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+from qualibrate_runner.core.logs_stream import (
+    LogFileTailer,
+    LogFilter,
+    LogStreamHandler,
+)
+from qualibrate_runner.utils.logs_parser import parse_log_line
+
+
+def _line(i: int, levelname: str = "INFO") -> str:
+    record = {
+        "asctime": f"2024-01-15 10:00:{i:02d},000",
+        "name": "qualibrate",
+        "levelname": levelname,
+        "message": f"message {i}",
+    }
+    return json.dumps(record) + "\n"
+
+
+def _append(path: Path, text: str) -> None:
+    with path.open("a") as f:
+        f.write(text)
+
+
+class TestLogFilter:
+    """Tests for selecting records sent to a subscriber."""
+
+    def test_filters_combined(self) -> None:
+        """Test that record has to match level, logger and substring."""
+        log_filter = LogFilter(
+            levelnames=frozenset({"ERROR"}), name="qualibrate", contains="node"
+        )
+
+        assert log_filter(
+            {"levelname": "ERROR", "name": "qualibrate", "message": "node x"}
+        )
+        assert not log_filter(
+            {"levelname": "INFO", "name": "qualibrate", "message": "node x"}
+        )
+        assert not log_filter(
+            {"levelname": "ERROR", "name": "qm", "message": "node x"}
+        )
+        assert not log_filter(
+            {"levelname": "ERROR", "name": "qualibrate", "message": "graph"}
+        )
+
+    def test_child_loggers_accepted(self) -> None:
+        """Test that logger name filter includes child loggers only."""
+        log_filter = LogFilter(name="qualibrate")
+
+        assert log_filter({"name": "qualibrate.node"})
+        assert not log_filter({"name": "qualibrate_runner"})
+
+
+class TestLogFileTailer:
+    """Tests for following the current log file."""
+
+    def test_only_new_records_returned(self, tmp_path: Path) -> None:
+        """Test that existing records are skipped and new ones returned."""
+        path = tmp_path / "qualibrate.log"
+        path.write_text(_line(0))
+        tailer = LogFileTailer(lambda: tmp_path)
+
+        assert tailer.read_new() == []
+        _append(path, _line(1) + _line(2)[:10])
+        first = tailer.read_new()
+        _append(path, _line(2)[10:] + "traceback line\n")
+        second = tailer.read_new()
+
+        assert [entry["message"] for entry in first] == ["message 1"]
+        assert [entry["message"] for entry in second] == [
+            "message 2",
+            "traceback line",
+        ]
+        assert second[1]["asctime"] == "2024-01-15T10:00:02"
+
+    def test_rotation_followed(self, tmp_path: Path) -> None:
+        """Test that rotated file is finished before reading the new one."""
+        path = tmp_path / "qualibrate.log"
+        path.write_text("")
+        tailer = LogFileTailer(lambda: tmp_path)
+        tailer.read_new()
+
+        _append(path, _line(1))
+        path.rename(tmp_path / "qualibrate.log.1")
+        path.write_text(_line(2))
+
+        assert [entry["message"] for entry in tailer.read_new()] == [
+            "message 1",
+            "message 2",
+        ]
+
+    def test_truncated_file_read_from_start(self, tmp_path: Path) -> None:
+        """Test that truncation of the file is detected."""
+        path = tmp_path / "qualibrate.log"
+        path.write_text(_line(0) + _line(1))
+        tailer = LogFileTailer(lambda: tmp_path)
+        tailer.read_new()
+
+        with path.open("r+") as f:
+            f.truncate(0)
+        _append(path, _line(2))
+
+        assert [entry["message"] for entry in tailer.read_new()] == [
+            "message 2"
+        ]
+
+
+class TestLogStreamHandler:
+    """Tests for capturing records of the runner logger."""
+
+    def test_records_buffered_only_when_enabled(self) -> None:
+        """Test that disabled handler doesn't keep records."""
+        handler = LogStreamHandler()
+        emitted: list[None] = []
+        handler.on_emit = lambda: emitted.append(None)
+        test_logger = logging.getLogger("test_logs_stream")
+        test_logger.addHandler(handler)
+        try:
+            test_logger.warning("skipped")
+            handler.enabled = True
+            test_logger.warning("captured")
+        finally:
+            test_logger.removeHandler(handler)
+
+        records = handler.drain()
+        assert [record["message"] for record in records] == ["captured"]
+        assert records[0]["levelname"] == "WARNING"
+        assert isinstance(records[0]["asctime"], str)
+        assert len(emitted) == 1
+        assert handler.drain() == []
+
+    def test_entry_matches_parsed_json_line(self) -> None:
+        """Test that entries have fields of parsed JSON log lines."""
+        handler = LogStreamHandler()
+        handler.enabled = True
+        test_logger = logging.getLogger("test_logs_stream.entry")
+        test_logger.setLevel(logging.INFO)
+        test_logger.addHandler(handler)
+        try:
+            test_logger.info("value %d", 5)
+            try:
+                raise ValueError("failed")
+            except ValueError:
+                test_logger.exception("with traceback")
+        finally:
+            test_logger.removeHandler(handler)
+
+        info, error = handler.drain()
+        parsed = parse_log_line(
+            json.dumps({**info, "asctime": "2024-01-15 10:00:02,123"})
+        )
+        assert set(info) == set(parsed)
+        assert info["name"] == "test_logs_stream.entry"
+        assert info["message"] == "value 5"
+        assert datetime.fromisoformat(info["asctime"]).microsecond % 1000 == 0
+        assert error["levelname"] == "ERROR"
+        assert "ValueError: failed" in error["exc_info"]
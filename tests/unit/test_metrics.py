@@ -0,0 +1,57 @@
+"""
+Tests for in-process metrics rendered in the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from qualibrate_runner.core.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry:
+    """Tests for histograms and callback gauges."""
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Test that histogram samples follow the exposition format."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram(
+            "latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)
+        )
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, "/get_nodes")
+
+        lines = registry.render().splitlines()
+
+        assert lines == [
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{route="/get_nodes",le="0.1"} 1',
+            'latency_seconds_bucket{route="/get_nodes",le="1.0"} 3',
+            'latency_seconds_bucket{route="/get_nodes",le="+Inf"} 4',
+            'latency_seconds_sum{route="/get_nodes"} 6.05',
+            'latency_seconds_count{route="/get_nodes"} 4',
+        ]
+
+    def test_gauge_callback_and_label_escaping(self) -> None:
+        """Test that gauge values are read on render and labels escaped."""
+        registry = MetricsRegistry()
+        values: dict[tuple[str, ...], float] = {('a"b',): 1.0}
+        registry.gauge_callback(
+            "subscribers", "Subs.", ("endpoint",), lambda: values
+        )
+        values[("logs",)] = 2.0
+
+        samples = registry.render().splitlines()[2:]
+
+        assert samples == [
+            'subscribers{endpoint="a\\"b"} 1.0',
+            'subscribers{endpoint="logs"} 2.0',
+        ]
+
+    def test_wrong_labels_rejected(self) -> None:
+        """Test that observation with missing labels raises."""
+        histogram = MetricsRegistry().histogram("runs", "Runs.", ("name",))
+
+        with pytest.raises(ValueError):
+            histogram.observe(1.0)
@@ -0,0 +1,125 @@
+"""
+Tests for cached encoded payloads and conditional GET responses.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from qualibrate_runner.core.payload_cache import PayloadCache
+
+
+@pytest.fixture
+def payload_cache() -> PayloadCache:
+    return PayloadCache()
+
+
+@pytest.fixture
+def factory_calls() -> list[int]:
+    return []
+
+
+@pytest.fixture
+def client(payload_cache: PayloadCache, factory_calls: list[int]) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/payload")
+    def get_payload(request: Request, size: int = 1) -> Response:
+        def factory() -> dict[str, list[str]]:
+            factory_calls.append(size)
+            return {"items": ["µ" * 10] * size}
+
+        return payload_cache.get(("payload", size), factory).response(request)
+
+    return TestClient(app)
+
+
+class TestPayloadCache:
+    """Tests for caching payloads per library generation."""
+
+    def test_payload_encoded_once_per_generation(
+        self,
+        client: TestClient,
+        payload_cache: PayloadCache,
+        factory_calls: list[int],
+    ) -> None:
+        """Test that payload is recomputed only after invalidation."""
+        first = client.get("/payload")
+        client.get("/payload")
+        payload_cache.invalidate()
+        client.get("/payload")
+
+        assert first.json() == {"items": ["µ" * 10]}
+        assert first.headers["content-type"] == "application/json"
+        assert factory_calls == [1, 1]
+
+    def test_variants_cached_separately(
+        self, client: TestClient, factory_calls: list[int]
+    ) -> None:
+        """Test that payloads of different keys don't share data."""
+        one = client.get("/payload", params={"size": 1})
+        two = client.get("/payload", params={"size": 2})
+
+        assert len(one.json()["items"]) == 1
+        assert len(two.json()["items"]) == 2
+        assert one.headers["etag"] != two.headers["etag"]
+
+    def test_stale_payload_not_stored(
+        self, payload_cache: PayloadCache
+    ) -> None:
+        """Test that payload computed during invalidation isn't cached."""
+        payload_cache.get("key", payload_cache.invalidate)
+
+        assert payload_cache.get("key", lambda: 1).body == b"1"
+
+
+class TestConditionalGet:
+    """Tests for ETag, If-None-Match and gzip handling."""
+
+    def test_not_modified_if_etag_matches(self, client: TestClient) -> None:
+        """Test that matching If-None-Match gives empty 304 response."""
+        etag = client.get("/payload").headers["etag"]
+
+        response = client.get(
+            "/payload", headers={"If-None-Match": f'"other", {etag}'}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_etag_stable_across_same_content(
+        self, client: TestClient, payload_cache: PayloadCache
+    ) -> None:
+        """Test that rescan without changes keeps client caches valid."""
+        etag = client.get("/payload").headers["etag"]
+        payload_cache.invalidate()
+
+        response = client.get("/payload", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    def test_gzip_body_for_large_payload(self, client: TestClient) -> None:
+        """Test that large payload is sent compressed if client accepts."""
+        response = client.get(
+            "/payload",
+            params={"size": 200},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        raw = client.get(
+            "/payload",
+            params={"size": 200},
+            headers={"Accept-Encoding": "identity"},
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == raw.json()
+        assert response.headers["etag"] != raw.headers["etag"]
+        assert "content-encoding" not in raw.headers
+        assert len(gzip.compress(raw.content)) < len(raw.content)
+        assert json.loads(raw.content) == {"items": ["µ" * 10] * 200}
@@ -0,0 +1,46 @@
+"""Tests for periodic background tasks."""
+
+import asyncio
+
+from qualibrate_runner.core.app import periodic_tasks
+from qualibrate_runner.core.app.periodic_tasks import (
+    cancel_background_tasks,
+    repeat_every,
+    run_in_background,
+)
+
+
+class TestBackgroundTasks:
+    """Tests for background task tracking."""
+
+    def test_task_referenced_until_done(self) -> None:
+        """Test that a finished task is no longer referenced."""
+
+        async def scenario() -> None:
+            task = run_in_background(asyncio.sleep(0))
+            assert task in periodic_tasks._background_tasks
+            await task
+            await asyncio.sleep(0)
+            assert task not in periodic_tasks._background_tasks
+
+        asyncio.run(scenario())
+
+    def test_repeated_task_cancelled(self) -> None:
+        """Test that repeated tasks are stopped by cancellation."""
+        calls: list[None] = []
+
+        @repeat_every(seconds=0.01)
+        def tick() -> None:
+            calls.append(None)
+
+        async def scenario() -> None:
+            await tick()
+            await asyncio.sleep(0.05)
+            assert calls
+            assert periodic_tasks._background_tasks
+            tasks = list(periodic_tasks._background_tasks)
+            await cancel_background_tasks()
+            assert all(task.cancelled() for task in tasks)
+            assert not periodic_tasks._background_tasks
+
+        asyncio.run(scenario())
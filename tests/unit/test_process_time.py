@@ -0,0 +1,116 @@
+"""
+Tests for the request timing middleware and `Server-Timing` breakdown.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from typing import Annotated
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from qualibrate_runner.api.middleware.process_time import (
+    ProcessTimeMiddleware,
+    TimedRoute,
+)
+from qualibrate_runner.core.metrics import http_request_duration
+
+
+def _slow_dependency() -> int:
+    time.sleep(0.02)
+    return 1
+
+
+def _server_timing(header: str) -> dict[str, float]:
+    matches = re.findall(r"(\w+);dur=([0-9.]+)", header)
+    return {name: float(duration) for name, duration in matches}
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ProcessTimeMiddleware)
+    router = APIRouter(prefix="/timed", route_class=TimedRoute)
+
+    @router.get("/sync/{value}")
+    def sync_endpoint(
+        value: int, dep: Annotated[int, Depends(_slow_dependency)]
+    ) -> dict[str, int]:
+        time.sleep(0.05)
+        return {"value": value + dep}
+
+    @router.get("/async")
+    async def async_endpoint() -> dict[str, bool]:
+        return {"async": True}
+
+    @app.get("/untimed")
+    def untimed_endpoint() -> dict[str, bool]:
+        return {"timed": False}
+
+    @app.websocket("/ws")
+    async def ws_endpoint(websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.send_json({"ok": True})
+        await websocket.close()
+
+    app.include_router(router)
+    return TestClient(app)
+
+
+class TestProcessTimeMiddleware:
+    """Tests for timing headers of the pure ASGI middleware."""
+
+    def test_server_timing_breakdown(self, client: TestClient) -> None:
+        """Test that phases of a timed route are reported."""
+        response = client.get("/timed/sync/2")
+
+        assert response.json() == {"value": 3}
+        timings = _server_timing(response.headers["Server-Timing"])
+        assert list(timings) == ["deps", "handler", "serialize", "total"]
+        assert timings["deps"] >= 20
+        assert timings["handler"] >= 50
+        assert timings["total"] >= timings["deps"] + timings["handler"]
+        assert float(response.headers["X-Process-Time"]) == pytest.approx(
+            timings["total"] / 1000, abs=1e-3
+        )
+
+    def test_async_endpoint_is_timed(self, client: TestClient) -> None:
+        """Test that coroutine endpoints keep working when wrapped."""
+        response = client.get("/timed/async")
+
+        assert response.json() == {"async": True}
+        assert "handler" in _server_timing(response.headers["Server-Timing"])
+
+    def test_total_only_without_timed_endpoint(
+        self, client: TestClient
+    ) -> None:
+        """Test that requests not reaching a timed endpoint report total."""
+        untimed = client.get("/untimed")
+        invalid = client.get("/timed/sync/not-int")
+        missing = client.get("/missing")
+
+        assert invalid.status_code == 422
+        assert missing.status_code == 404
+        for response in (untimed, invalid, missing):
+            timings = _server_timing(response.headers["Server-Timing"])
+            assert list(timings) == ["total"]
+            assert "X-Process-Time" in response.headers
+
+    def test_request_duration_recorded_by_route_template(
+        self, client: TestClient
+    ) -> None:
+        """Test that the metric is labeled by the matched route template."""
+        client.get("/timed/sync/5")
+
+        rendered = "\n".join(http_request_duration.samples())
+        assert (
+            'method="GET",route="/timed/sync/{value}",status="200"' in rendered
+        )
+
+    def test_websocket_passes_through(self, client: TestClient) -> None:
+        """Test that websocket connections aren't affected."""
+        with client.websocket_connect("/ws") as websocket:
+            assert websocket.receive_json() == {"ok": True}
@@ -0,0 +1,162 @@
+"""
+Tests for the persistent run history store.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from qualibrate_runner.config.models import State
+from qualibrate_runner.core.models.common import RunError
+from qualibrate_runner.core.models.enums import RunnableType, RunStatusEnum
+from qualibrate_runner.core.models.last_run import LastRun
+from qualibrate_runner.core.run_history import RunHistoryStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Iterator[RunHistoryStore]:
+    history = RunHistoryStore(tmp_path / "history.sqlite")
+    history.start()
+    yield history
+    history.stop(timeout=1)
+
+
+def _run(
+    name: str,
+    started_at: datetime,
+    duration: float = 1.0,
+    status: RunStatusEnum = RunStatusEnum.FINISHED,
+) -> LastRun:
+    return LastRun(
+        name=name,
+        status=status,
+        idx=1,
+        runnable_type=RunnableType.NODE,
+        passed_parameters={},
+        started_at=started_at,
+        completed_at=started_at + timedelta(seconds=duration),
+        error=(
+            RunError(error_class="ValueError", message="fail", traceback=[])
+            if status == RunStatusEnum.ERROR
+            else None
+        ),
+    )
+
+
+class TestRunHistoryQuery:
+    """Tests for querying stored runs."""
+
+    def test_keyset_pagination(
+        self, store: RunHistoryStore, aware_datetime: datetime
+    ) -> None:
+        """Test that pages cover all runs from newest to oldest."""
+        for i in range(5):
+            store.append(
+                _run(f"node_{i}", aware_datetime + timedelta(minutes=i))
+            )
+        store.flush()
+
+        first = store.query(limit=2)
+        second = store.query(limit=2, cursor=first.next_cursor)
+        third = store.query(limit=2, cursor=second.next_cursor)
+
+        names = [r.name for page in (first, second, third) for r in page.items]
+        assert names == [f"node_{i}" for i in reversed(range(5))]
+        assert third.next_cursor is None
+
+    def test_filters(
+        self, store: RunHistoryStore, aware_datetime: datetime
+    ) -> None:
+        """Test filtering by name, status and start time."""
+        store.append(_run("a", aware_datetime))
+        store.append(
+            _run(
+                "a",
+                aware_datetime + timedelta(hours=1),
+                status=RunStatusEnum.ERROR,
+            )
+        )
+        store.append(_run("b", aware_datetime + timedelta(hours=2)))
+        store.flush()
+
+        by_name = store.query(name="a")
+        failed = store.query(status=RunStatusEnum.ERROR)
+        recent = store.query(started_after=aware_datetime + timedelta(hours=1))
+
+        assert len(by_name.items) == 2
+        assert [r.error_class for r in failed.items] == ["ValueError"]
+        assert [r.name for r in recent.items] == ["b", "a"]
+
+    def test_get_full_record(
+        self, store: RunHistoryStore, aware_datetime: datetime
+    ) -> None:
+        """Test that full LastRun data is stored."""
+        store.append(_run("node", aware_datetime, duration=2.5))
+        store.flush()
+
+        record = store.query().items[0]
+        data = store.get(record.id)
+
+        assert record.duration == 2.5
+        assert record.started_at == aware_datetime
+        assert data is not None
+        assert data["name"] == "node"
+        assert store.get(record.id + 1) is None
+
+    def test_stats(
+        self, store: RunHistoryStore, aware_datetime: datetime
+    ) -> None:
+        """Test aggregated durations and status counts."""
+        store.append(_run("node", aware_datetime, duration=1))
+        store.append(_run("node", aware_datetime, duration=3))
+        store.append(
+            _run("node", aware_datetime, duration=5, status=RunStatusEnum.ERROR)
+        )
+        store.append(_run("other", aware_datetime, duration=100))
+        store.flush()
+
+        stats = store.stats(name="node")
+
+        assert stats.count == 3
+        assert stats.duration_avg == 3
+        assert stats.duration_max == 5
+        assert stats.status_counts == {"finished": 2, "error": 1}
+
+
+class TestRunHistoryStateListener:
+    """Tests for appending runs completed in the State."""
+
+    def test_only_completed_runs_appended(
+        self,
+        store: RunHistoryStore,
+        sample_last_run_running: LastRun,
+        sample_last_run_finished: LastRun,
+    ) -> None:
+        """Test that running and repeated updates aren't stored."""
+        state = State()
+        store.attach(state)
+
+        state.last_run = sample_last_run_running
+        state.last_run = sample_last_run_finished
+        state.mark_changed()
+        store.flush()
+
+        assert len(store.query().items) == 1
+
+    def test_persisted_between_instances(
+        self, tmp_path: Path, aware_datetime: datetime
+    ) -> None:
+        """Test that runs are available after restart."""
+        path = tmp_path / "history.sqlite"
+        first = RunHistoryStore(path)
+        first.start()
+        first.append(_run("node", aware_datetime))
+        first.stop(timeout=1)
+
+        second = RunHistoryStore(path)
+
+        assert [r.name for r in second.query().items] == ["node"]
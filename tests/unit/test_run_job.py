@@ -155,6 +155,25 @@ class TestRunNodeHappyPath:
         assert last_run_during_execution.status == RunStatusEnum.RUNNING
         assert last_run_during_execution.name == "test_node"
 
+    def test_passes_validated_parameters(
+        self,
+        mock_node: Mock,
+        fresh_state: State,
+        sample_parameters_class: type[Any],
+    ) -> None:
+        """Test that values validated on submission are passed to node."""
+        mock_node.run = Mock(return_value=None)
+        passed = {"amplitude": "0.5", "frequency": "5e9"}
+        validated = validate_input_parameters(sample_parameters_class, passed)
+
+        run_node(mock_node, passed, fresh_state, validated)
+
+        mock_node.run.assert_called_once_with(
+            interactive=True, amplitude=0.5, frequency=5.0e9
+        )
+        assert fresh_state.last_run is not None
+        assert fresh_state.last_run.passed_parameters == passed
+
     def test_updates_state_with_finished_status(
         self, mock_node: Mock, fresh_state: State
     ) -> None:
@@ -398,6 +417,32 @@ class TestRunWorkflowHappyPath:
             **input_params
         )
 
+    @patch("qualibrate_runner.core.run_job.get_active_library_or_error")
+    def test_skips_validation_of_validated_parameters(
+        self,
+        mock_get_library: Mock,
+        mock_library: Mock,
+        mock_workflow: Mock,
+        fresh_state: State,
+    ) -> None:
+        """Test that parameters validated on submission are used as is."""
+        mock_get_library.return_value = mock_library
+
+        mock_workflow.run = Mock(return_value=None)
+        validated = Mock()
+        validated.nodes.model_dump.return_value = {}
+        validated.parameters.model_dump.return_value = {"frequency": 5.0e9}
+
+        run_workflow(
+            mock_workflow,
+            {"parameters": {"frequency": 5.0e9}},
+            fresh_state,
+            validated_parameters=validated,
+        )
+
+        mock_workflow.full_parameters_class.assert_not_called()
+        mock_workflow.run.assert_called_once_with(nodes={}, frequency=5.0e9)
+
     @patch("qualibrate_runner.core.run_job.get_active_library_or_error")
     def test_splits_parameters_into_nodes_and_params(
         self,
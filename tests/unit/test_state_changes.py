@@ -0,0 +1,113 @@
+"""
+Tests for State change notifications used by websocket status tasks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Hashable
+
+from qualibrate_runner.config.models import State
+from qualibrate_runner.core.app.state_changes import StateChanges
+from qualibrate_runner.core.models.last_run import LastRun
+
+
+def _no_progress(state: State) -> Hashable:
+    return None
+
+
+class TestStateVersion:
+    """Tests for State version and listeners."""
+
+    def test_field_assignment_notifies(
+        self, sample_last_run_finished: LastRun
+    ) -> None:
+        """Test that assigning a field bumps version and calls listeners."""
+        state = State()
+        calls: list[int] = []
+        state.add_listener(lambda: calls.append(state.version))
+
+        state.last_run = sample_last_run_finished
+        state.run_item = None
+
+        assert state.version == 2
+        assert calls == [1, 2]
+
+    def test_mark_changed(self) -> None:
+        """Test explicit change notification."""
+        state = State()
+        listener_calls: list[None] = []
+        listener = lambda: listener_calls.append(None)  # noqa: E731
+        state.add_listener(listener)
+
+        state.mark_changed()
+        state.remove_listener(listener)
+        state.mark_changed()
+
+        assert state.version == 2
+        assert len(listener_calls) == 1
+
+
+class TestStateChangeWaiter:
+    """Tests for waiting State changes in event loop."""
+
+    def test_first_wait_returns_immediately(self) -> None:
+        """Test that waiter doesn't block before the first push."""
+
+        async def scenario() -> None:
+            waiter = StateChanges(State(), _no_progress).waiter()
+            await asyncio.wait_for(waiter.wait(), 0.5)
+
+        asyncio.run(scenario())
+
+    def test_idle_waiter_sleeps_until_change(
+        self, sample_last_run_finished: LastRun
+    ) -> None:
+        """Test that waiter wakes up on change made in another thread."""
+        state = State()
+        woken: list[bool] = []
+
+        async def scenario() -> None:
+            changes = StateChanges(state, _no_progress, min_interval=0.01)
+            waiter = changes.waiter()
+            await waiter.wait()
+            task = asyncio.ensure_future(waiter.wait())
+            await asyncio.sleep(0.05)
+            woken.append(task.done())
+            thread = threading.Thread(
+                target=setattr,
+                args=(state, "last_run", sample_last_run_finished),
+            )
+            thread.start()
+            await asyncio.wait_for(task, 0.5)
+            thread.join()
+            woken.append(task.done())
+
+        asyncio.run(scenario())
+
+        assert woken == [False, True]
+
+    def test_running_progress_probed(
+        self, sample_last_run_running: LastRun
+    ) -> None:
+        """Test that progress change is detected without notification."""
+        state = State(last_run=sample_last_run_running)
+        progress = {"value": 0}
+
+        async def scenario() -> None:
+            changes = StateChanges(
+                state,
+                lambda _: progress["value"],
+                min_interval=0.01,
+                heartbeat_interval=10,
+            )
+            waiter = changes.waiter()
+            await waiter.wait()
+            task = asyncio.ensure_future(waiter.wait())
+            await asyncio.sleep(0.05)
+            assert not task.done()
+            progress["value"] = 1
+            await asyncio.wait_for(task, 0.5)
+
+        asyncio.run(scenario())
@@ -0,0 +1,137 @@
+"""
+Tests for single-flight status computations executed outside the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from qualibrate_runner.core.app.status_computer import (
+    ExecutionHistorySnapshot,
+    SharedComputation,
+)
+from qualibrate_runner.utils.json_encoder import encode_json
+
+
+@pytest.fixture
+def executor() -> Iterator[ThreadPoolExecutor]:
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Computation:
+    """Computation blocked until released, recording computed versions."""
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.computed: list[int] = []
+        self.running = 0
+        self.max_running = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> int:
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        version = self.version
+        self.release.wait(2)
+        with self._lock:
+            self.running -= 1
+            self.computed.append(version)
+        return version
+
+
+class TestSharedComputation:
+    """Tests for sharing in-flight computations."""
+
+    def test_consumers_of_same_version_share_result(
+        self, executor: ThreadPoolExecutor
+    ) -> None:
+        """Test that concurrent consumers trigger a single computation."""
+        computation = _Computation()
+        shared = SharedComputation(
+            computation, lambda: computation.version, executor
+        )
+
+        async def consume() -> list[int]:
+            tasks = [asyncio.ensure_future(shared.get()) for _ in range(5)]
+            await asyncio.sleep(0.01)
+            computation.release.set()
+            return list(await asyncio.gather(*tasks))
+
+        results = asyncio.run(consume())
+
+        assert results == [0] * 5
+        assert computation.computed == [0]
+
+    def test_changed_version_waits_for_inflight(
+        self, executor: ThreadPoolExecutor
+    ) -> None:
+        """Test that a newer version is computed after the in-flight one."""
+        computation = _Computation()
+        shared = SharedComputation(
+            computation, lambda: computation.version, executor
+        )
+
+        async def consume() -> list[int]:
+            first = asyncio.ensure_future(shared.get())
+            await asyncio.sleep(0.01)
+            computation.version = 1
+            second = asyncio.ensure_future(shared.get())
+            third = asyncio.ensure_future(shared.get())
+            await asyncio.sleep(0.01)
+            computation.release.set()
+            return list(await asyncio.gather(first, second, third))
+
+        results = asyncio.run(consume())
+
+        assert results == [0, 1, 1]
+        assert computation.computed == [0, 1]
+        assert computation.max_running == 1
+
+    def test_exception_raised_for_all_consumers(
+        self, executor: ThreadPoolExecutor
+    ) -> None:
+        """Test that the failed computation fails every consumer."""
+
+        def compute() -> int:
+            raise ValueError("Status failed")
+
+        shared = SharedComputation(compute, lambda: 0, executor)
+
+        async def consume() -> list[BaseException | int]:
+            tasks = [shared.get(), shared.get()]
+            return list(await asyncio.gather(*tasks, return_exceptions=True))
+
+        results = asyncio.run(consume())
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+
+class TestExecutionHistorySnapshot:
+    """Tests for history frames joined from encoded items."""
+
+    def test_frames_match_encoded_history(self) -> None:
+        """Test that both orderings are built from the same items."""
+        items = [{"id": 1, "name": "a"}, {"id": 2, "name": "µ"}]
+        snapshot = ExecutionHistorySnapshot(
+            items, [encode_json(item) for item in items]
+        )
+
+        assert snapshot.frame(False) == encode_json({"items": items})
+        assert snapshot.frame(True) == encode_json({"items": items[::-1]})
+        assert snapshot.frame(True) is snapshot.frame(True)
+
+    def test_no_history_frame(self) -> None:
+        """Test that missing history is encoded as null."""
+        snapshot = ExecutionHistorySnapshot(None, None)
+
+        assert snapshot.frame(False) == "null"
+        assert snapshot.frame(True) == "null"
@@ -0,0 +1,391 @@
+"""
+Tests for websocket connection managers delivering frames to subscribers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import cast
+
+import jsonpatch
+import pytest
+from fastapi import WebSocket
+
+from qualibrate_runner.core.app.ws_manager import (
+    AppendSocketConnectionManagerList,
+    DeltaSocketConnectionManagerList,
+    FilteredSocketConnectionManagerMapping,
+    SocketConnectionManagerList,
+    SocketConnectionManagerMapping,
+)
+
+
+class FakeWebSocket:
+    def __init__(self, fail: bool = False, delay: float = 0) -> None:
+        self.fail = fail
+        self.delay = delay
+        self.closed = False
+        self.sent: list[str] = []
+
+    async def accept(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def send_text(self, data: str) -> None:
+        if self.fail:
+            raise RuntimeError("Connection closed")
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+
+async def _flush() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestSocketConnectionManagerList:
+    """Tests for broadcasting to all subscribers."""
+
+    def test_same_frame_sent_to_all(self) -> None:
+        """Test that message is encoded once and sent to every connection."""
+        sockets = [FakeWebSocket(), FakeWebSocket()]
+
+        async def scenario() -> None:
+            manager = SocketConnectionManagerList()
+            for socket in sockets:
+                await manager.connect(cast(WebSocket, socket))
+            await manager.broadcast({"name": "node", "value": "µs"})
+            await _flush()
+
+        asyncio.run(scenario())
+
+        assert sockets[0].sent == sockets[1].sent
+        assert json.loads(sockets[0].sent[0]) == {"name": "node", "value": "µs"}
+
+    def test_failed_connection_evicted(self) -> None:
+        """Test that a failing connection doesn't affect others."""
+        broken, alive = FakeWebSocket(fail=True), FakeWebSocket()
+        manager = SocketConnectionManagerList()
+
+        async def scenario() -> None:
+            await manager.connect(cast(WebSocket, broken))
+            await manager.connect(cast(WebSocket, alive))
+            await manager.broadcast([1, 2])
+            await _flush()
+
+        asyncio.run(scenario())
+
+        assert alive.sent == ["[1,2]"]
+        assert manager.active_connections == [alive]
+        assert broken.closed
+        assert manager.stats.send_errors == 1
+        assert manager.stats.clients_evicted == 1
+
+    def test_slow_client_gets_latest_frames(self) -> None:
+        """Test that oldest frames are dropped for a slow subscriber."""
+        slow, fast = FakeWebSocket(delay=0.05), FakeWebSocket()
+        manager = SocketConnectionManagerList(queue_size=1)
+
+        async def scenario() -> None:
+            await manager.connect(cast(WebSocket, slow))
+            await manager.connect(cast(WebSocket, fast))
+            for i in range(4):
+                await manager.broadcast(i)
+                await _flush()
+            await asyncio.sleep(0.2)
+
+        asyncio.run(scenario())
+
+        assert fast.sent == ["0", "1", "2", "3"]
+        assert slow.sent[0] == "0"
+        assert slow.sent[-1] == "3"
+        assert manager.stats.frames_dropped == 4 - len(slow.sent)
+
+    def test_send_timeout_evicts_client(self) -> None:
+        """Test that subscriber is disconnected if send times out."""
+        stalled = FakeWebSocket(delay=1)
+        manager = SocketConnectionManagerList(send_timeout=0.01)
+
+        async def scenario() -> None:
+            await manager.connect(cast(WebSocket, stalled))
+            await manager.broadcast("status")
+            await asyncio.sleep(0.05)
+
+        asyncio.run(scenario())
+
+        assert not manager.any_subscriber
+        assert stalled.closed
+        assert manager.stats.send_timeouts == 1
+
+    def test_evicted_client_close_task_kept(self) -> None:
+        """Test that closing of an evicted subscriber is awaited to the end."""
+        broken = FakeWebSocket(fail=True)
+        manager = SocketConnectionManagerList()
+
+        async def scenario() -> asyncio.Task[None] | None:
+            await manager.connect(cast(WebSocket, broken))
+            subscriber = manager.subscribers[0]
+            await manager.broadcast("status")
+            await _flush()
+            return subscriber._close_task
+
+        close_task = asyncio.run(scenario())
+
+        assert close_task is not None and close_task.done()
+        assert close_task.exception() is None
+        assert broken.closed
+
+    def test_lagging_client_evicted(self) -> None:
+        """Test that subscriber is disconnected after many dropped frames."""
+        slow = FakeWebSocket(delay=1)
+        manager = SocketConnectionManagerList(
+            queue_size=1, max_dropped_frames=3
+        )
+
+        async def scenario() -> None:
+            await manager.connect(cast(WebSocket, slow))
+            await manager.broadcast(0)
+            await asyncio.sleep(0)
+            for i in range(1, 6):
+                await manager.broadcast(i)
+            await _flush()
+
+        asyncio.run(scenario())
+
+        assert not manager.any_subscriber
+        assert manager.stats.frames_dropped == 3
+        assert manager.stats.clients_evicted == 1
+
+
+class TestSocketConnectionManagerMapping:
+    """Tests for broadcasting to subscribers of a key."""
+
+    def test_broadcast_only_to_key_subscribers(self) -> None:
+        """Test that only subscribers of the key receive the frame."""
+        reversed_socket, direct_socket = FakeWebSocket(), FakeWebSocket()
+        manager = SocketConnectionManagerMapping[bool]()
+
+        async def scenario() -> None:
+            await manager.connect(True, cast(WebSocket, reversed_socket))
+            await manager.connect(False, cast(WebSocket, direct_socket))
+            await manager.broadcast(True, {"items": []})
+            await _flush()
+
+        asyncio.run(scenario())
+
+        assert reversed_socket.sent == ['{"items":[]}']
+        assert direct_socket.sent == []
+        assert manager.stats.connections == 2
+        assert manager.stats.frames_sent == 1
+
+
+class TestDeltaSocketConnectionManagerList:
+    """Tests for broadcasting JSON patches."""
+
+    def test_snapshot_then_patches(self) -> None:
+        """Test that patches applied to snapshot give the latest data."""
+        socket = FakeWebSocket()
+        states = [
+            {"status": "running", "percentage": 0},
+            {"status": "running", "percentage": 50},
+            {"status": "running", "percentage": 50},
+            {"status": "finished", "percentage": 100},
+        ]
+
+        async def scenario() -> None:
+            manager = DeltaSocketConnectionManagerList()
+            await manager.connect(cast(WebSocket, socket))
+            for state in states:
+                await manager.broadcast(state)
+                await _flush()
+
+        asyncio.run(scenario())
+
+        frames = [json.loads(frame) for frame in socket.sent]
+        assert [frame["type"] for frame in frames] == [
+            "snapshot",
+            "patch",
+            "patch",
+        ]
+        assert [frame["seq"] for frame in frames] == [1, 2, 3]
+        data = frames[0]["data"]
+        for frame in frames[1:]:
+            data = jsonpatch.apply_patch(data, frame["patch"])
+        assert data == states[-1]
+
+    def test_snapshot_on_connect_and_resync(self) -> None:
+        """Test that late subscriber gets the latest snapshot."""
+        socket = FakeWebSocket()
+
+        async def scenario() -> None:
+            manager = DeltaSocketConnectionManagerList()
+            await manager.connect(cast(WebSocket, FakeWebSocket()))
+            await manager.broadcast({"value": 1})
+            await manager.broadcast({"value": 2})
+            await manager.connect(cast(WebSocket, socket))
+            await _flush()
+            await manager.send_snapshot(cast(WebSocket, socket))
+            await _flush()
+
+        asyncio.run(scenario())
+
+        expected = {"type": "snapshot", "seq": 2, "data": {"value": 2}}
+        assert [json.loads(frame) for frame in socket.sent] == [
+            expected,
+            expected,
+        ]
+
+    def test_no_diff_without_subscribers(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that data is only stored while nobody is subscribed."""
+        socket = FakeWebSocket()
+        patches: list[object] = []
+        make_patch = jsonpatch.make_patch
+
+        def counting_make_patch(src: object, dst: object) -> object:
+            patches.append(dst)
+            return make_patch(src, dst)
+
+        monkeypatch.setattr(jsonpatch, "make_patch", counting_make_patch)
+
+        async def scenario() -> None:
+            manager = DeltaSocketConnectionManagerList()
+            for value in range(3):
+                await manager.broadcast({"value": value})
+            await manager.connect(cast(WebSocket, socket))
+            await _flush()
+            await manager.broadcast({"value": 3})
+            await _flush()
+
+        asyncio.run(scenario())
+
+        assert patches == [{"value": 3}]
+        frames = [json.loads(frame) for frame in socket.sent]
+        assert frames[0] == {"type": "snapshot", "seq": 3, "data": {"value": 2}}
+        assert frames[1]["seq"] == 4
+        data = jsonpatch.apply_patch(frames[0]["data"], frames[1]["patch"])
+        assert data == {"value": 3}
+
+
+class TestAppendSocketConnectionManagerList:
+    """Tests for broadcasting only appended items."""
+
+    def test_snapshot_then_appended_items(self) -> None:
+        """Test that only new items are sent after the snapshot."""
+        socket = FakeWebSocket()
+        first, second, third = {"id": 1}, {"id": 2}, {"id": 3}
+
+        async def scenario() -> None:
+            manager = AppendSocketConnectionManagerList()
+            await manager.connect(cast(WebSocket, socket))
+            for items in ([first], [first], [first, second, third]):
+                await manager.broadcast(items)
+                await _flush()
+
+        asyncio.run(scenario())
+
+        assert [json.loads(frame) for frame in socket.sent] == [
+            {"type": "snapshot", "seq": 1, "items": [first]},
+            {"type": "append", "seq": 2, "items": [second, third]},
+        ]
+
+    def test_replaced_list_sent_as_snapshot(self) -> None:
+        """Test that a list of another run is sent as a new snapshot."""
+        socket = FakeWebSocket()
+
+        async def scenario() -> None:
+            manager = AppendSocketConnectionManagerList()
+            await manager.connect(cast(WebSocket, socket))
+            await manager.broadcast([{"id": 1}, {"id": 2}])
+            await _flush()
+            await manager.broadcast([{"id": 5}])
+            await _flush()
+            await manager.broadcast(None)
+            await _flush()
+
+        asyncio.run(scenario())
+
+        assert [json.loads(frame) for frame in socket.sent][1:] == [
+            {"type": "snapshot", "seq": 2, "items": [{"id": 5}]},
+            {"type": "snapshot", "seq": 3, "items": None},
+        ]
+
+    def test_late_subscriber_gets_whole_list(self) -> None:
+        """Test that subscriber connected later gets all items."""
+        socket = FakeWebSocket()
+
+        async def scenario() -> None:
+            manager = AppendSocketConnectionManagerList()
+            await manager.connect(cast(WebSocket, FakeWebSocket()))
+            await manager.broadcast([{"id": 1}])
+            await manager.broadcast([{"id": 1}, {"id": 2}])
+            await manager.connect(cast(WebSocket, socket))
+            await _flush()
+
+        asyncio.run(scenario())
+
+        assert [json.loads(frame) for frame in socket.sent] == [
+            {"type": "snapshot", "seq": 2, "items": [{"id": 1}, {"id": 2}]}
+        ]
+
+
+class TestFilteredSocketConnectionManagerMapping:
+    """Tests for broadcasting items filtered per subscriber."""
+
+    def test_only_matching_items_sent(self) -> None:
+        """Test that every subscriber gets only items it selected."""
+        errors, everything, nothing = (
+            FakeWebSocket(),
+            FakeWebSocket(),
+            FakeWebSocket(),
+        )
+        manager = FilteredSocketConnectionManagerMapping[bool]()
+        items = [{"level": "INFO"}, {"level": "ERROR"}]
+
+        async def scenario() -> None:
+            await manager.connect(
+                False,
+                cast(WebSocket, errors),
+                lambda item: item["level"] == "ERROR",
+            )
+            await manager.connect(False, cast(WebSocket, everything))
+            await manager.connect(
+                False, cast(WebSocket, nothing), lambda item: False
+            )
+            await manager.broadcast(False, items)
+            await _flush()
+            manager.disconnect(False, cast(WebSocket, errors))
+
+        asyncio.run(scenario())
+
+        assert [json.loads(frame) for frame in errors.sent] == [[items[1]]]
+        assert [json.loads(frame) for frame in everything.sent] == [items]
+        assert nothing.sent == []
+        assert manager.stats.connections == 2
+
+    def test_lagging_subscriber_evicted_instead_of_dropping(self) -> None:
+        """Test that log batches are never dropped silently."""
+        slow, fast = FakeWebSocket(delay=0.05), FakeWebSocket()
+        manager = FilteredSocketConnectionManagerMapping[bool](queue_size=2)
+
+        async def scenario() -> None:
+            await manager.connect(False, cast(WebSocket, slow))
+            await manager.connect(False, cast(WebSocket, fast))
+            for i in range(4):
+                await manager.broadcast(False, [i])
+                await _flush()
+            await asyncio.sleep(0.2)
+
+        asyncio.run(scenario())
+
+        assert fast.sent == ["[0]", "[1]", "[2]", "[3]"]
+        # Every batch received by the slow subscriber is in order
+        assert slow.sent == fast.sent[: len(slow.sent)]
+        assert slow.closed
+        assert manager.active_connections[False] == [fast]
+        assert manager.stats.frames_dropped == 0
+        assert manager.stats.clients_evicted == 1